@@ -0,0 +1,318 @@
+"""
+Per-month analytics snapshots.
+
+The dashboard numbers are sums over candidates, so they are computed per
+calendar month ("YYYY-MM", from the record's 'Date') and added up for the
+requested year or for all time. Months before the current one are closed:
+their summary is written once to "<ANALYTICS_SNAPSHOT_DIR>/<YYYY-MM>.json"
+together with a fingerprint of that month's rows, and is only recomputed
+when a row dated in that month changes. The current month, later months
+and undated rows are the live part and are summarized on every rebuild.
+
+A rebuild (load_data() plus fingerprinting) only happens when the workbook
+changed since the last one; otherwise the summaries are served from memory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bump when summarize() changes so old snapshot files are recomputed
+SNAPSHOT_VERSION = 1
+
+# Fields of the response that are plain counts: name -> (record field, value)
+COUNT_FIELDS = {
+    'total_rejected': ('Application Status', 'Rejected'),
+    'no_response': ('Application Status', 'No Resp Call/Email'),
+    'not_interviewed': ('Interview Status', 'Not Interviewed'),
+    'total_round_2_completed': ('Round 2 Status', 'Completed'),
+    'did_not_join': ('Application Status', 'Did Not Join'),
+    'on_hold': ('Application Status', 'On Hold'),
+    'accepted_waiting_reference': ('Application Status', 'Accepted'),
+    'total_in_notice_yet_to_join': ('Application Status', 'In Notice'),
+    'total_joined': ('Application Status', 'Joined'),
+    'intern': ('Interested Position', 'Intern'),
+}
+MONTHLY_STATUSES = {'Accepted': 'accepted', 'Rejected': 'rejected', 'In Notice': 'in_notice', 'Joined': 'joined'}
+NO_OFFER_VALUES = {'no', 'nil', 'n/a', '0', '', 'none'}
+
+
+def parse_record_date(value):
+    """
+    Parse a candidate date as stored in Excel or sent by the API:
+    '2025-12-23T00:00:00.000Z', '12/23/2025', '2025-12-23' or '2025-12-23 00:00:00'.
+
+    Returns:
+        datetime or None
+    """
+    date_str = str(value or '').strip()
+    if not date_str:
+        return None
+    try:
+        if 'T' in date_str:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        if '/' in date_str:
+            return datetime.strptime(date_str.split(' ')[0], '%m/%d/%Y')
+        if '-' in date_str:
+            return datetime.strptime(date_str.split(' ')[0], '%Y-%m-%d')
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Date parsing error for '{date_str}': {e}")
+    return None
+
+
+def record_period(record):
+    """'YYYY-MM' of the record's application date, or None when it has no usable date"""
+    date_obj = parse_record_date(record.get('Date') or record.get('Date of Application'))
+    return date_obj.strftime('%Y-%m') if date_obj else None
+
+
+def _month_label(period):
+    return datetime.strptime(period, '%Y-%m').strftime('%b %Y')  # e.g. 'Nov 2025'
+
+
+def summarize(records, period, current_month):
+    """
+    Mergeable analytics summary of the records of one period.
+
+    Args:
+        records: candidate dicts, all dated in `period`
+        period: 'YYYY-MM', or None for undated records
+        current_month: label ('Jan 2026') that undated screenings are counted under
+    """
+    counts = dict.fromkeys(COUNT_FIELDS, 0)
+    counts['total_applicant'] = len(records)
+    monthly = {"applicants": 0, "accepted": 0, "rejected": 0, "in_notice": 0, "joined": 0}
+    roles = defaultdict(int)
+    positions = defaultdict(lambda: {"applied": 0, "joined": 0})
+    offers = []
+    screened = defaultdict(int)
+
+    for item in records:
+        for name, (field, value) in COUNT_FIELDS.items():
+            if item.get(field) == value:
+                counts[name] += 1
+
+        status = item.get('Application Status')
+        if period:
+            monthly["applicants"] += 1
+            if status in MONTHLY_STATUSES:
+                monthly[MONTHLY_STATUSES[status]] += 1
+
+        position = item.get('Interested Position')
+        if position:
+            roles[position] += 1
+            positions[position]["applied"] += 1
+            if status == 'Joined':
+                positions[position]["joined"] += 1
+
+        # Offer Details - candidates with offered CTC
+        offered_ctc = item.get('Offered CTC')
+        if offered_ctc and str(offered_ctc).lower() not in NO_OFFER_VALUES:
+            offers.append({
+                'name': item.get('Name', 'N/A'),
+                'offered_ctc': offered_ctc,
+                'joining_date': item.get('Joining Date', 'N/A')
+            })
+
+        # User Activity - users who have added screening/remarks
+        screened_by = item.get('Screened By')
+        if screened_by and screened_by.strip():
+            screened[screened_by] += 1
+
+    month = _month_label(period) if period else current_month
+    return {
+        "counts": counts,
+        "monthly": {month: monthly} if period and records else {},
+        "roles": dict(roles),
+        "positions": dict(positions),
+        "offers": offers,
+        "screened": {month: dict(screened)} if screened else {},
+    }
+
+
+def merge(summaries):
+    """Add up summaries (in the given order) into one"""
+    total = {"counts": defaultdict(int), "monthly": {}, "roles": defaultdict(int),
+             "positions": {}, "offers": [], "screened": {}}
+    for summary in summaries:
+        for name, count in summary["counts"].items():
+            total["counts"][name] += count
+        for month, stats in summary["monthly"].items():
+            bucket = total["monthly"].setdefault(month, dict.fromkeys(stats, 0))
+            for name, count in stats.items():
+                bucket[name] += count
+        for role, count in summary["roles"].items():
+            total["roles"][role] += count
+        for position, stats in summary["positions"].items():
+            bucket = total["positions"].setdefault(position, {"applied": 0, "joined": 0})
+            bucket["applied"] += stats["applied"]
+            bucket["joined"] += stats["joined"]
+        total["offers"].extend(summary["offers"])
+        for month, users in summary["screened"].items():
+            bucket = total["screened"].setdefault(month, defaultdict(int))
+            for username, count in users.items():
+                bucket[username] += count
+    return total
+
+
+def to_response(summary):
+    """Shape a merged summary like the /api/analytics response"""
+    def by_count(users):
+        return [
+            {"username": username, "candidates_screened": count}
+            for username, count in sorted(users.items(), key=lambda x: x[1], reverse=True)
+        ]
+
+    user_activity = defaultdict(int)
+    for users in summary["screened"].values():
+        for username, count in users.items():
+            user_activity[username] += count
+
+    response = {name: summary["counts"].get(name, 0) for name in ('total_applicant', *COUNT_FIELDS)}
+    response.update({
+        'monthly_statistics': [
+            {"month": month, **summary["monthly"][month]}
+            for month in sorted(summary["monthly"], key=lambda x: datetime.strptime(x, '%b %Y'))
+        ],
+        'hiring_funnel_by_role': [{"role": role, "count": count} for role, count in summary["roles"].items()],
+        'position_statistics': [
+            {"position": pos, "applied": stats["applied"], "joined": stats["joined"]}
+            for pos, stats in summary["positions"].items()
+        ],
+        'offer_details': summary["offers"],
+        'user_activity': by_count(user_activity),
+        'monthly_user_activity': {month: by_count(users) for month, users in summary["screened"].items()},
+    })
+    return response
+
+
+def fingerprint(records):
+    """Digest of a period's rows; any edit, addition or removal changes it"""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(json.dumps(dict(record), sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """Closed-period summaries, one JSON file per 'YYYY-MM'"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, period):
+        return os.path.join(self.directory, f"{period}.json")
+
+    def load(self, period, expected_fingerprint):
+        """The stored summary when it was built from rows with this fingerprint, else None"""
+        try:
+            with open(self._path(period), encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("fingerprint") != expected_fingerprint:
+            return None
+        return snapshot["summary"]
+
+    def save(self, period, snapshot_fingerprint, summary):
+        os.makedirs(self.directory, exist_ok=True)
+        body = json.dumps({"version": SNAPSHOT_VERSION, "period": period,
+                           "fingerprint": snapshot_fingerprint, "summary": summary})
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(temp_path, self._path(period))
+
+    def prune(self, keep):
+        """Remove snapshots of periods that no longer have any rows"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            period, extension = os.path.splitext(name)
+            if extension == ".json" and period not in keep:
+                os.remove(os.path.join(self.directory, name))
+
+
+class AnalyticsSnapshots:
+    """
+    Per-period summaries of the candidate workbook.
+
+    Args:
+        directory: where closed-period snapshot files live
+        load_records: callable returning the current candidate rows
+        source_stamp: callable returning a value that changes whenever the rows may have
+    """
+
+    def __init__(self, directory, load_records, source_stamp):
+        self.store = SnapshotStore(directory)
+        self.load_records = load_records
+        self.source_stamp = source_stamp
+        self._lock = threading.Lock()
+        self._key = None
+        self._summaries = {}
+
+    def summaries(self, now=None):
+        """{period or None: summary} for every period with rows, rebuilt only when the source changed"""
+        now = now or datetime.now()
+        key = (self.source_stamp(), now.strftime('%Y-%m'))
+        with self._lock:
+            if key[0] is not None and key == self._key:
+                metrics.record_cache("analytics", hit=True)
+                return self._summaries
+            metrics.record_cache("analytics", hit=False)
+            self._summaries = self._rebuild(now)
+            self._key = key
+            return self._summaries
+
+    def _rebuild(self, now):
+        current_period = now.strftime('%Y-%m')
+        current_month = now.strftime('%b %Y')
+        by_period = defaultdict(list)
+        for record in self.load_records():
+            by_period[record_period(record)].append(record)
+
+        summaries = {}
+        reused = 0
+        for period, records in by_period.items():
+            if period is None or period >= current_period:
+                # Live: the current month, future-dated and undated rows
+                summaries[period] = summarize(records, period, current_month)
+                continue
+            period_fingerprint = fingerprint(records)
+            summary = self.store.load(period, period_fingerprint)
+            metrics.record_cache("analytics_snapshot", hit=summary is not None)
+            if summary is None:
+                summary = summarize(records, period, current_month)
+                try:
+                    self.store.save(period, period_fingerprint, summary)
+                except OSError as e:
+                    logger.error(f"Could not write analytics snapshot {period}: {e}")
+            else:
+                reused += 1
+            summaries[period] = summary
+        try:
+            self.store.prune({p for p in by_period if p is not None and p < current_period})
+        except OSError as e:
+            logger.error(f"Could not prune analytics snapshots: {e}")
+        logger.info(f"Analytics rebuilt: {len(summaries)} periods, {reused} snapshots reused")
+        return summaries
+
+    def report(self, year=None, now=None):
+        """/api/analytics payload for one year ('2025') or, without a year, for all time"""
+        summaries = self.summaries(now)
+        if year:
+            selected = [p for p in summaries if p is not None and p.startswith(f"{year}-")]
+        else:
+            selected = list(summaries)
+        selected.sort(key=lambda p: (p is None, p or ''))
+        return to_response(merge(summaries[p] for p in selected))
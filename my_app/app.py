@@ -1,32 +1,58 @@
-from flask import Flask, jsonify, request, render_template, redirect, url_for, session, send_from_directory
+from flask import Flask, Request, Response, stream_with_context, jsonify, request, render_template, redirect, url_for, session, send_from_directory
 from flask_cors import CORS
-import os, re, tempfile, logging, time
-import openpyxl
-from openpyxl.cell.cell import MergedCell
+import os, tempfile, logging, time, threading
 from datetime import datetime
 import random
+from contextlib import contextmanager
 import json
 from collections import defaultdict, Counter
 import secrets
 import sqlite3
 import hashlib
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from pypdf import PdfReader
-import requests
+
+# openpyxl, pypdf, requests and smtplib are imported inside the functions that
+# use them so that booting the app (and serving login/static pages) does not
+# pay for loading them.
 
 from jinja2 import FileSystemLoader, ChoiceLoader
+from werkzeug.exceptions import RequestEntityTooLarge
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process migrates the workbook
+    fcntl = None
+
 from config import DevelopmentConfig, ProductionConfig
+import analytics_snapshots
+import applicant_codec
+import assets
+import bulk_import
+import candidate_table
+import candidates
+import compression
+import duplicates
+import export
+import log_pipeline
+import metrics
+import multipart
+import profiling
+import resume_index
+import resume_store
+import shared_cache
+import skills
+import status_events
+import upstream
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Guhatek request/response trail, written to API_DEBUG_LOG as JSON lines
+api_log = logging.getLogger(log_pipeline.API_LOGGER)
 
 env = os.getenv("APP_ENV", "development").lower()
 if env == "production":
     app_config = ProductionConfig()
 else:
     app_config = DevelopmentConfig()
+log_pipeline.configure(app_config)
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 templates_dir = os.path.join(base_dir, "templates")
@@ -36,7 +62,25 @@ static_dir = os.path.join(base_dir, "static")
 UPLOAD_FOLDER = os.path.join(base_dir, "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+
+
+class UploadRequest(Request):
+    """Spools uploaded files straight into the upload folder, hashing and size-checking each chunk"""
+
+    @property
+    def max_content_length(self):
+        # Bulk imports carry a sheet and a ZIP of resumes, not a single resume
+        if self.endpoint == 'import_candidates':
+            return app.config.get('IMPORT_MAX_BYTES')
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        max_bytes = app.config.get('IMPORT_MAX_BYTES' if self.endpoint == 'import_candidates' else 'MAX_RESUME_BYTES')
+        return resume_store.UploadSpool(app.config['UPLOAD_FOLDER'], max_bytes)
+
+
 app = Flask(__name__, static_folder=static_dir, template_folder=templates_dir)
+app.request_class = UploadRequest
 app.config.from_object(app_config)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.secret_key = app.config.get("SECRET_KEY") or None
@@ -65,6 +109,27 @@ app.jinja_env.loader = ChoiceLoader([
     FileSystemLoader(app.root_path)
 ])
 
+metrics.init_app(app)
+compression.init_app(app)
+# jsonify() serializes Candidate records as plain objects
+candidates.init_app(app)
+# Fingerprinted static files: templates use asset_url('js/app.js')
+assets.init_app(app)
+# Per-request time budget for Guhatek API calls
+upstream.init_app(app)
+
+
+@app.after_request
+def revalidate_api_responses(response):
+    # API data changes all the time: browsers must revalidate rather than rely on ?_t= cache busters
+    if request.path.startswith('/api/') and 'Cache-Control' not in response.headers:
+        response.cache_control.no_cache = True
+    return response
+
+
+# Same check as admin_required: profiling is only honoured for logged-in admins
+profiling.init_app(app, is_admin=lambda: bool(session.get('logged_in') and session.get('is_admin')))
+
 EXCEL_FILE = app.config["EXCEL_FILE"]
 SHEET_NAME = app.config["SHEET_NAME"]
 USER_DB = app.config["USER_DB"]
@@ -82,139 +147,127 @@ if env == "production":
         raise RuntimeError("Email sender credentials must be set in production")
 
 
+# ============================================
+# Cache shared by all workers (token, applicant list)
+# ============================================
+SHARED_CACHE = shared_cache.SharedCache(
+    shared_cache.create_backend(app.config['CACHE_BACKEND'], app.config['CACHE_URL'])
+)
+# {"fetched_at": unix time, "applicants": [portal dicts]}
+APPLICANTS_CACHE_KEY = "applicant_list"
+# fetched_at of the cached list alone, so a worker can tell its copy is current
+# without decoding the whole list
+APPLICANTS_STAMP_KEY = "applicant_list_stamp"
+
+
+def invalidate_applicants_cache():
+    """Drop the shared applicant list after a write so every worker refetches it"""
+    SHARED_CACHE.invalidate(APPLICANTS_CACHE_KEY)
+    SHARED_CACHE.delete(APPLICANTS_STAMP_KEY)
+
+
+# ============================================
+# Guhatek API guards: a circuit breaker per operation and the request budget
+# ============================================
+def is_upstream_failure(exc):
+    """Timeouts, connection errors and 5xx answers count against a circuit; anything else means the API answered"""
+    import requests
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return exc.response is None or exc.response.status_code >= 500
+    return isinstance(exc, requests.exceptions.RequestException)
+
+
+UPSTREAM_BREAKERS = {
+    operation: upstream.CircuitBreaker(
+        operation,
+        failure_threshold=app.config['UPSTREAM_FAILURE_THRESHOLD'],
+        reset_timeout=app.config['UPSTREAM_RESET_SECONDS'],
+        is_failure=is_upstream_failure,
+    )
+    for operation in ("token", "list", "patch", "create")
+}
+
+
+@contextmanager
+def upstream_call(operation):
+    """One Guhatek API call: fails fast while its circuit is open, timed and recorded either way"""
+    with UPSTREAM_BREAKERS[operation].guard() as attempt, metrics.track_upstream(operation):
+        yield attempt
+
+
+def upstream_timeout(operation, read_timeout, shorten=True):
+    """requests timeout for a call, within what is left of the request's budget (see upstream.timeout)"""
+    return upstream.timeout(operation, read_timeout, app.config['UPSTREAM_CONNECT_TIMEOUT'], shorten)
+
+
 # ============================================
 # Token Manager for Guhatek API Integration
 # ============================================
 class TokenManager:
     """Manages API token with automatic refresh every 10 minutes"""
     
-    def __init__(self):
+    TOKEN_LIFETIME = 600
+    REFRESH_MARGIN = 30
+    
+    def __init__(self, cache=None):
         self.token = None
         self.token_expiry = None
-        self.api_base_url = "https://api-dev.guhatek.org"
-        self.api_key = "guhatek-job-applicant"
+        self.cache = cache
+        self.api_base_url = app.config["GUHATEK_API_URL"].rstrip("/")
+        self.api_key = app.config["GUHATEK_API_KEY"]
     
     def get_token(self):
         """Get current token or fetch new one if expired"""
         current_time = time.time()
         
         # Check if token exists and is still valid (refresh 30 seconds before expiry)
-        if self.token and self.token_expiry and current_time < (self.token_expiry - 30):
+        if self.token and self.token_expiry and current_time < (self.token_expiry - self.REFRESH_MARGIN):
             logger.info("Using cached token")
+            metrics.record_cache("token", hit=True)
             return self.token
         
-        # Fetch new token
+        metrics.record_cache("token", hit=False)
+        if self.cache is None:
+            entry = self._fetch_token()
+        else:
+            # Another worker may hold a fresh token; only one worker fetches a new one
+            entry = self.cache.get_or_compute(
+                "guhatek_token", self.TOKEN_LIFETIME - self.REFRESH_MARGIN, self._fetch_token
+            )
+            if entry["expires"] - self.REFRESH_MARGIN <= current_time:
+                entry = self._fetch_token()
+                self.cache.set("guhatek_token", entry, self.TOKEN_LIFETIME - self.REFRESH_MARGIN)
+        self.token = entry["token"]
+        self.token_expiry = entry["expires"]
+        return self.token
+    
+    def _fetch_token(self):
+        import requests
         logger.info("Fetching new token from Guhatek API")
         try:
-            response = requests.get(
-                f"{self.api_base_url}/api/token",
-                headers={"x-api-key": self.api_key},
-                timeout=10
-            )
-            response.raise_for_status()
+            timeout = upstream_timeout("token", 10)
+            with upstream_call("token"):
+                response = requests.get(
+                    f"{self.api_base_url}/api/token",
+                    headers={"x-api-key": self.api_key},
+                    timeout=timeout
+                )
+                response.raise_for_status()
             
             data = response.json()
-            self.token = data.get("token")
             
             # Set expiry to 10 minutes from now (600 seconds)
-            self.token_expiry = current_time + 600
-            
             logger.info(f"New token fetched, expires in 10 minutes")
-            return self.token
+            return {"token": data.get("token"), "expires": time.time() + self.TOKEN_LIFETIME}
             
+        except upstream.UpstreamUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Error fetching token: {str(e)}")
             raise
 
 # Initialize global token manager
-token_manager = TokenManager()
-
-
-# ============================================
-# Field Mapping: Portal -> API (camelCase)
-# ============================================
-PORTAL_TO_API_FIELD_MAP = {
-    # Screening and Interview fields (editable by portal users)
-    "Initial Screening": "initialScreening",
-    "Round 1 D and T": "round1Dt",
-    "Round 1 Remarks": "round1Feedback",
-    "Round 2 D and T": "round2Dt",
-    "Round 2 Remarks": "round2Feedback",
-    "Offered Position": "offeredPosition",
-    "Joining Date": "joiningDate",
-    "Reject Mail Sent": "rejectMailSent",
-    "Screened By": "screenedBy",
-    "Interview Status": "interviewStatus",
-    "Application Status": "applicationStatus",
-    "Remarks": "additionalInfo",
-    # Basic fields (usually not edited via portal, but mapped for completeness)
-    "Name": "fullName",
-    "Email ID": "email",
-    "Contact Number": "contactNumber",
-    "LinkedIn Profile": "linkedinProfile",
-    "Interested Position": "interestedPosition",
-    "Current Role": "currentRole",
-    "Current Organization": "currentOrganization",
-    "Total Years of Experience": "totalExperience",
-    "Current Location": "currentLocation",
-    "Location Preference": "locationPreference",
-    "Current CTC per Annum": "currentCTC",
-    "Expected CTC per Annum": "expectedCTC",
-    "Notice Period": "noticePeriod",
-    "In Notice": "currentlyInNotice",
-    "Immediate Joiner": "immediateJoiner",
-    "Offers in Hand": "otherOffersInHand",
-    "Offered CTC": "offeredCTC",
-    "Certifications": "certifications",
-    "Referred By": "referredBy",
-}
-
-
-def convert_portal_to_api_payload(portal_data):
-    """
-    Convert portal field names to API camelCase format.
-    Also handles value conversions (e.g., Yes/No -> boolean).
-    """
-    api_payload = {}
-    
-    # Characters that should be treated as None/empty
-    placeholders = ["—", "-", "", "None", "null"]
-    
-    for portal_key, value in portal_data.items():
-        # Skip non-mappable fields
-        if portal_key not in PORTAL_TO_API_FIELD_MAP:
-            continue
-        
-        api_key = PORTAL_TO_API_FIELD_MAP[portal_key]
-        
-        # Clean value
-        cleaned_value = value
-        if isinstance(value, str):
-            cleaned_value = value.strip()
-            if cleaned_value in placeholders:
-                cleaned_value = None
-        
-        # Handle boolean conversions
-        if portal_key in ["In Notice", "Immediate Joiner", "Offers in Hand"]:
-            api_payload[api_key] = str(cleaned_value).lower() == "yes" if cleaned_value else False
-        elif portal_key == "Reject Mail Sent":
-            api_payload[api_key] = str(cleaned_value).lower() == "yes" if cleaned_value else False
-        # Handle numeric conversions
-        elif portal_key in ["Current CTC per Annum", "Expected CTC per Annum", "Offered CTC", "Total Years of Experience"]:
-            if cleaned_value:
-                try:
-                    # Remove any non-numeric chars (like currency symbols if any)
-                    numeric_val = "".join(filter(str.isdigit, str(cleaned_value)))
-                    api_payload[api_key] = int(numeric_val) if numeric_val else None
-                except (ValueError, TypeError):
-                    api_payload[api_key] = None
-            else:
-                api_payload[api_key] = None
-        else:
-            # String fields
-            api_payload[api_key] = cleaned_value if cleaned_value else None
-    
-    return api_payload
+token_manager = TokenManager(SHARED_CACHE)
 
 
 def update_applicant_via_api(applicant_id, portal_data):
@@ -228,59 +281,70 @@ def update_applicant_via_api(applicant_id, portal_data):
     Returns:
         tuple: (success: bool, message: str, updated_data: dict or None)
     """
+    import requests
     try:
         if not applicant_id:
             logger.warning("No applicant ID provided for API update")
             return False, "No applicant ID available for API update", None
         
         # Convert portal fields to API format
-        api_payload = convert_portal_to_api_payload(portal_data)
+        api_payload = applicant_codec.APPLICANT.encode_update(portal_data)
         
         if not api_payload:
             logger.info("No mappable fields to update via API")
             return True, "No API-mappable fields to update", None
         
-        debug_info = f"\n🔄 SENDING TO API:\nURL: {token_manager.api_base_url}/api/applications/{applicant_id}\nPayload: {api_payload}\n"
-        logger.info(debug_info)
-        with open("api_debug.log", "a", encoding="utf-8") as f:
-            f.write(debug_info)
+        logger.info(f"Updating applicant {applicant_id} via API ({len(api_payload)} fields)")
+        api_log.info("Sending applicant update", extra={
+            "event": "update_request", "applicant_id": applicant_id,
+            "url": f"{token_manager.api_base_url}/api/applications/{applicant_id}", "payload": api_payload,
+        })
         
         # Get token
         token = token_manager.get_token()
         
         # Call PATCH endpoint
-        response = requests.patch(
-            f"{token_manager.api_base_url}/api/applications/{applicant_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
-            json=api_payload,
-            timeout=15
-        )
-        
-        response.raise_for_status()
+        timeout = upstream_timeout("patch", 15)
+        with upstream_call("patch"):
+            response = requests.patch(
+                f"{token_manager.api_base_url}/api/applications/{applicant_id}",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json"
+                },
+                json=api_payload,
+                timeout=timeout
+            )
+            
+            response.raise_for_status()
         result = response.json()
         
         if result.get("success"):
             logger.info(f"Successfully updated applicant {applicant_id} via API")
+            api_log.info("Applicant updated", extra={
+                "event": "update_response", "applicant_id": applicant_id,
+                "status_code": response.status_code, "response": result,
+            })
+            invalidate_applicants_cache()
             return True, "Applicant updated via API", result.get("updated")
         else:
             logger.warning(f"API returned success=false for applicant {applicant_id}")
             return False, "API update failed", None
             
+    except upstream.UpstreamUnavailable as e:
+        logger.warning(f"API update of applicant {applicant_id} not attempted: {e}")
+        return False, str(e), None
     except requests.exceptions.Timeout:
         logger.error(f"API timeout while updating applicant {applicant_id}")
         return False, "API request timed out", None
     except requests.exceptions.RequestException as e:
-        error_body = ""
-        if hasattr(e, 'response') and e.response is not None:
-            error_body = e.response.text
-        
-        debug_err = f"\n❌ API UPDATE ERROR\nApplicant ID: {applicant_id}\nError: {str(e)}\nStatus Code: {e.response.status_code if hasattr(e, 'response') and e.response is not None else 'N/A'}\nResponse Body:\n{error_body}\n"
-        logger.error(debug_err)
-        with open("api_debug.log", "a", encoding="utf-8") as f:
-            f.write(debug_err)
+        error_response = getattr(e, 'response', None)
+        logger.error(f"API error while updating applicant {applicant_id}: {e}")
+        api_log.error("Applicant update failed", extra={
+            "event": "update_error", "applicant_id": applicant_id, "error": str(e),
+            "status_code": error_response.status_code if error_response is not None else None,
+            "response": error_response.text if error_response is not None else None,
+        })
         
         return False, f"API error: {str(e)}", None
     except Exception as e:
@@ -288,158 +352,76 @@ def update_applicant_via_api(applicant_id, portal_data):
         return False, f"Unexpected error: {str(e)}", None
 
 
-def create_applicant_via_api(portal_data, resume_file=None):
+def create_applicant_via_api(portal_data, resume_path=None, resume_filename=None):
     """
     Create a new applicant via the Guhatek POST API.
     
     Args:
         portal_data: Dictionary of portal field names and values
-        resume_file: Optional file object for resume upload
+        resume_path: Optional path of the stored resume, streamed from disk
+        resume_filename: Filename reported to the API (defaults to the stored name)
     
     Returns:
         tuple: (success: bool, message: str, applicant_id: str or None)
     """
+    import requests
     try:
         logger.info("Creating new applicant via Guhatek API")
         
-        # Helper to get non-empty value, checking both with-space and no-space versions
-        def get_val(key, default=None):
-            # Try with spaces first
-            val = portal_data.get(key, "")
-            if not val:
-                # Try without spaces (frontend form uses IDs without spaces)
-                no_space_key = key.replace(" ", "")
-                val = portal_data.get(no_space_key, "")
-            return val.strip() if val and str(val).strip() else default
-        
-        # Build the applicationData payload (camelCase for API)
-        # Only include fields that have actual values
-        application_data = {}
-        
-        # Required fields - must be present
-        full_name = get_val("Name")
-        email = get_val("Email ID")  # Also checks EmailID
-        contact = get_val("Contact Number")  # Also checks ContactNumber
-        
-        if not full_name or not email or not contact:
+        # applicationData (camelCase), with only the fields that have values
+        application_data = applicant_codec.APPLICANT.encode_create(portal_data)
+        if not all(application_data.get(key) for key in ("fullName", "email", "contactNumber")):
             logger.warning("Missing required fields for API: Name, Email ID, or Contact Number")
             return False, "Missing required fields: Name, Email, or Contact Number", None
         
-        application_data["fullName"] = full_name
-        application_data["email"] = email
-        application_data["contactNumber"] = contact
-        
-        # Optional string fields - only add if non-empty
-        optional_fields = {
-            "LinkedIn Profile": "linkedinProfile",
-            "Interested Position": "interestedPosition",
-            "Current Role": "currentRole",
-            "Current Organization": "currentOrganization",
-            "Current Location": "currentLocation",
-            "Location Preference": "locationPreference",
-            "Certifications": "certifications",
-            "Referred By": "referredBy",
-            "Remarks": "additionalInfo",
-            "Notice Period": "noticePeriod",
-        }
-        
-        for portal_key, api_key in optional_fields.items():
-            val = get_val(portal_key)
-            if val:
-                application_data[api_key] = val
-        
-        # Handle numeric fields
-        total_exp = get_val("Total Years of Experience")
-        if total_exp:
-            try:
-                # Extract number from experience string (e.g., "2-3 years" -> 2)
-                exp_num = re.search(r'\d+', str(total_exp))
-                if exp_num:
-                    application_data["totalExperience"] = int(exp_num.group())
-            except:
-                pass
-        
-        current_ctc = get_val("Current CTC per Annum")
-        if current_ctc:
-            try:
-                # Remove commas and convert to int
-                ctc_num = re.sub(r'[^\d]', '', str(current_ctc))
-                if ctc_num:
-                    application_data["currentCTC"] = int(ctc_num)
-            except:
-                pass
-        
-        expected_ctc = get_val("Expected CTC per Annum")
-        if expected_ctc:
-            try:
-                ctc_num = re.sub(r'[^\d]', '', str(expected_ctc))
-                if ctc_num:
-                    application_data["expectedCTC"] = int(ctc_num)
-            except:
-                pass
-        
-        # Handle boolean fields - only add if explicitly set
-        in_notice = get_val("In Notice")
-        if in_notice:
-            application_data["currentlyInNotice"] = in_notice.lower() in ["yes", "true", "1"]
-        
-        immediate_joiner = get_val("Immediate Joiner")
-        if immediate_joiner:
-            application_data["immediateJoiner"] = immediate_joiner.lower() in ["yes", "true", "1"]
-        
-        offers_in_hand = get_val("Offers in Hand")
-        if offers_in_hand:
-            application_data["otherOffersInHand"] = offers_in_hand.lower() in ["yes", "true", "1"]
-        
         # Add timestamp in proper ISO format
         application_data["submittedAt"] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.000Z")
         
-        # Screening fields (if provided during add)
-        if portal_data.get("Initial Screening"):
-            application_data["initialScreening"] = portal_data.get("Initial Screening")
-        if portal_data.get("Interview Status"):
-            application_data["interviewStatus"] = portal_data.get("Interview Status")
-        if portal_data.get("Application Status"):
-            application_data["applicationStatus"] = portal_data.get("Application Status")
-        
-        logger.info(f"Application data payload: {json.dumps(application_data, indent=2)}")
+        api_log.info("Creating applicant", extra={"event": "create_request", "payload": application_data})
         
         # Get token
         token = token_manager.get_token()
         
-        # Prepare multipart form data
-        # The API expects applicationData as a JSON string in form data
-        form_data = {
-            'applicationData': json.dumps(application_data)
-        }
-        
-        # Prepare files dict - only include if resume provided
-        files = None
-        if resume_file and hasattr(resume_file, 'filename') and resume_file.filename:
-            # Reset file position before reading
-            resume_file.seek(0)
-            files = {'file': (resume_file.filename, resume_file.stream, 'application/pdf')}
-            logger.info(f"Uploading resume: {resume_file.filename}")
-        else:
+        if not resume_path or not os.path.isfile(resume_path):
             # Guhatek API requires a resume file for new applications
             logger.warning("No resume file provided - Guhatek API requires resume for new applications")
             return False, "Resume required for API sync (save locally succeeded)", None
         
+        # Multipart body: applicationData as a JSON string plus the resume,
+        # streamed from disk in blocks rather than built in memory
+        resume_filename = resume_filename or os.path.basename(resume_path)
+        body = multipart.MultipartBody(
+            {'applicationData': json.dumps(application_data)},
+            {'file': (resume_filename, resume_path, 'application/pdf')}
+        )
+        logger.info(f"Uploading resume: {resume_filename} ({len(body)} bytes)")
+        
         # Call POST endpoint
         logger.info(f"Calling POST {token_manager.api_base_url}/api/applications")
         
-        response = requests.post(
-            f"{token_manager.api_base_url}/api/applications",
-            headers={
-                "Authorization": f"Bearer {token}"
-            },
-            data=form_data,
-            files=files,
-            timeout=30  # Longer timeout for file upload
-        )
+        try:
+            # Longer timeout for file upload; never cut short, since a create
+            # abandoned mid-flight may still land and its retry would be a duplicate
+            timeout = upstream_timeout("create", 30, shorten=False)
+            with upstream_call("create") as attempt:
+                response = requests.post(
+                    f"{token_manager.api_base_url}/api/applications",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Content-Type": body.content_type
+                    },
+                    data=body,
+                    timeout=timeout
+                )
+                if response.status_code >= 500:
+                    attempt.fail()
+        finally:
+            body.close()
         
         # Log response details for debugging
         logger.info(f"API Response status: {response.status_code}")
+        if response.status_code >= 400:
+            metrics.UPSTREAM_ERRORS.inc(operation="create")
         
         try:
             result = response.json()
@@ -450,45 +432,67 @@ def create_applicant_via_api(portal_data, resume_file=None):
             # Success!
             applicant_id = result.get("data", {}).get("id") or result.get("id")
             logger.info(f"Successfully created applicant via API with ID: {applicant_id}")
+            api_log.info("Applicant created", extra={
+                "event": "create_response", "applicant_id": applicant_id,
+                "status_code": response.status_code, "response": result,
+            })
+            invalidate_applicants_cache()
             return True, "Successfully created applicant", applicant_id
         else:
             # API Error
             error_msg = result.get("message") or result.get("error") or "Unknown error"
             logger.warning(f"API failure ({response.status_code}): {error_msg}")
             
-            # Log to debug file
-            debug_err = f"\n❌ API CREATE FAILURE\nURL: {token_manager.api_base_url}/api/applications\nStatus: {response.status_code}\nResponse: {response.text}\n"
-            with open("api_debug.log", "a", encoding="utf-8") as f:
-                f.write(debug_err)
+            api_log.warning("Applicant create rejected", extra={
+                "event": "create_failure", "url": f"{token_manager.api_base_url}/api/applications",
+                "status_code": response.status_code, "response": response.text,
+            })
                 
             return False, f"API error: {error_msg}", None
             
+    except upstream.UpstreamUnavailable as e:
+        logger.warning(f"API create not attempted: {e}")
+        return False, str(e), None
     except requests.exceptions.RequestException as e:
-        error_body = ""
-        if hasattr(e, 'response') and e.response is not None:
-            error_body = e.response.text
-            
-        debug_err = f"\n❌ API CREATE CONNECTION ERROR\nError: {str(e)}\nStatus Code: {e.response.status_code if hasattr(e, 'response') and e.response is not None else 'N/A'}\nResponse Body:\n{error_body}\n"
-        logger.error(debug_err)
-        with open("api_debug.log", "a", encoding="utf-8") as f:
-            f.write(debug_err)
+        error_response = getattr(e, 'response', None)
+        logger.error(f"API connection error while creating applicant: {e}")
+        api_log.error("Applicant create connection error", extra={
+            "event": "create_error", "error": str(e),
+            "status_code": error_response.status_code if error_response is not None else None,
+            "response": error_response.text if error_response is not None else None,
+        })
             
         return False, f"API connection error: {str(e)}", None
     except Exception as e:
-        import traceback
-        debug_err = f"\n❌ API CREATE CRASH\nError: {str(e)}\nTraceback:\n{traceback.format_exc()}\n"
-        logger.error(debug_err)
-        with open("api_debug.log", "a", encoding="utf-8") as f:
-            f.write(debug_err)
+        logger.error(f"Unexpected error creating applicant: {e}")
+        api_log.exception("Applicant create crashed", extra={"event": "create_crash", "error": str(e)})
         return False, f"Internal error during API call: {str(e)}", None
 
 
+def has_required_api_fields(applicant):
+    """Check that an API record has name, email and contact number (others are incomplete)"""
+    has_name = applicant.get("full_name") and str(applicant.get("full_name")).strip()
+    has_email = applicant.get("email") and str(applicant.get("email")).strip()
+    has_contact = applicant.get("contact_number") and str(applicant.get("contact_number")).strip()
+    return bool(has_name and has_email and has_contact)
+
+
+def api_applicant_to_portal(applicant):
+    """
+    Transform one Guhatek API record into the portal (Excel column) format.
+    IMPORTANT: Includes the API 'id' as '_api_id' for PATCH updates.
+    """
+    return candidates.Candidate(applicant_codec.APPLICANT.decode(applicant))
+
+
 @app.context_processor
 def inject_app_config():
     return {"APP_CONFIG": app.config}
 
 # Create sample Excel file if it doesn't exist
 def create_sample_excel():
+    import openpyxl
+    from openpyxl.cell.cell import MergedCell
     if os.path.exists(EXCEL_FILE):
         os.remove(EXCEL_FILE)
 
@@ -579,7 +583,7 @@ def create_sample_excel():
                 'Application Status': 'Offer Made',
                 'Remarks': 'Top candidate',
                 'Reject Mail Sent': 'No',
-                'Initial Remarks': '',
+                'Initial Screening': '',
                 'Round 1 Remarks': '',
                 'Round 2 Remarks': '',
                 
@@ -611,7 +615,7 @@ def create_sample_excel():
                 'Application Status': 'Rejected',
                 'Remarks': 'Not enough experience',
                 'Reject Mail Sent': 'Yes',
-                'Initial Remarks': '',
+                'Initial Screening': '',
                 'Round 1 Remarks': '',
                 'Round 2 Remarks': '',
                 
@@ -631,75 +635,199 @@ def create_sample_excel():
         # Save the workbook
         wb.save(EXCEL_FILE)
         wb.close()
-        print(f"Created sample Excel file: {EXCEL_FILE}")
+        logger.info(f"Created sample Excel file: {EXCEL_FILE}")
+
+# ============================================
+# Excel schema
+# ============================================
+# Bump EXCEL_SCHEMA_VERSION whenever EXCEL_HEADERS or EXCEL_RENAMED_COLUMNS
+# change; the next boot rewrites the workbook once and records the version.
+EXCEL_SCHEMA_VERSION = 1
+EXCEL_META_SHEET = "_meta"
+
+# Desired column order ('Date' always first); the list lives with the
+# record layout in candidates.py
+EXCEL_HEADERS = list(candidates.FIELDS)
+
+# Old header -> current header
+EXCEL_RENAMED_COLUMNS = {
+    'Initial Remarks': 'Initial Screening',
+}
+
+_schema_lock = threading.Lock()
+_schema_checked = False
+
+
+def order_headers(headers):
+    """Return EXCEL_HEADERS first, then any extra headers (e.g. 'Reference') in their current order"""
+    ordered = list(EXCEL_HEADERS)
+    ordered.extend([h for h in headers if h and h not in ordered])
+    return ordered
+
+
+def read_schema_version(wb):
+    """Read the schema version stamped in the workbook's meta sheet (0 if unstamped)"""
+    if EXCEL_META_SHEET not in wb.sheetnames:
+        return 0
+    for key, value in wb[EXCEL_META_SHEET].iter_rows(min_row=1, max_col=2, values_only=True):
+        if key == "schema_version":
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return 0
+    return 0
+
+
+def write_schema_version(wb, version):
+    """Stamp the schema version into a hidden meta sheet"""
+    if EXCEL_META_SHEET in wb.sheetnames:
+        meta = wb[EXCEL_META_SHEET]
+    else:
+        meta = wb.create_sheet(EXCEL_META_SHEET)
+        meta.sheet_state = "hidden"
+    meta["A1"] = "schema_version"
+    meta["B1"] = version
+
+
+@contextmanager
+def excel_migration_lock():
+    """Exclusive lock on EXCEL_FILE + '.lock' across worker processes (no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(EXCEL_FILE + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _workbook_schema_version():
+    import openpyxl
+    wb = openpyxl.load_workbook(EXCEL_FILE, read_only=True)
+    try:
+        return read_schema_version(wb)
+    finally:
+        wb.close()
+
+
+def migrate_excel_schema():
+    """
+    Apply pending header migrations (renames + column order) to the workbook.
+
+    Runs at most once per process. The version check only opens the workbook
+    in read-only mode; the full rewrite happens only when the stamped version
+    is older than EXCEL_SCHEMA_VERSION. The rewrite holds a lock file shared
+    by every worker and checks the version again once it has it, so only one
+    worker migrates and the others see the stamped result.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+    with _schema_lock:
+        if _schema_checked or not os.path.exists(EXCEL_FILE):
+            return
+
+        if _workbook_schema_version() >= EXCEL_SCHEMA_VERSION:
+            _schema_checked = True
+            return
+
+        with excel_migration_lock():
+            version = _workbook_schema_version()
+            if version >= EXCEL_SCHEMA_VERSION:
+                # Another worker migrated it while this one waited
+                _schema_checked = True
+                return
+
+            import openpyxl
+
+            logger.info("Migrating Excel schema from version %s to %s", version, EXCEL_SCHEMA_VERSION)
+            wb = openpyxl.load_workbook(EXCEL_FILE)
+            sheet = wb[SHEET_NAME]
+
+            rows = list(sheet.iter_rows(values_only=True))
+            old_headers = list(rows[0]) if rows else []
+            records = []
+            for row in rows[1:]:
+                record = {}
+                for header, value in zip(old_headers, row):
+                    if not header:
+                        continue
+                    new_header = EXCEL_RENAMED_COLUMNS.get(header, header)
+                    # When old and new columns both exist, keep whichever has a value
+                    if new_header in record and (value in (None, '') or record[new_header] not in (None, '')):
+                        continue
+                    record[new_header] = value
+                records.append(record)
+
+            headers = order_headers([EXCEL_RENAMED_COLUMNS.get(h, h) for h in old_headers])
+
+            sheet.delete_rows(1, sheet.max_row)
+            sheet.append(headers)
+            for record in records:
+                sheet.append([record.get(h) for h in headers])
+
+            write_schema_version(wb, EXCEL_SCHEMA_VERSION)
+            wb.save(EXCEL_FILE)
+            wb.close()
+        _schema_checked = True
+        logger.info("Excel schema migrated: %s records", len(records))
+
 
 # Load data from Excel
 def load_data():
+    import openpyxl
+    start = time.perf_counter()
     try:
         if not os.path.exists(EXCEL_FILE):
             create_sample_excel()
+        migrate_excel_schema()
         
-        wb = openpyxl.load_workbook(EXCEL_FILE)
+        wb = openpyxl.load_workbook(EXCEL_FILE, read_only=True)
         sheet = wb[SHEET_NAME]
+        rows = sheet.iter_rows(values_only=True)
         
         # Get headers from the first row
-        headers = [cell.value for cell in sheet[1] if cell is not None]
+        headers = list(next(rows, ()))
         
-        # Get data from the remaining rows
+        # Get data from the remaining rows (compact Candidate records, see candidates.py)
+        build_candidate = candidates.row_builder(headers)
         data = []
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            row_data = {}
-            for i, value in enumerate(row):
+        for row in rows:
+            values = []
+            for value in row:
                 # Convert datetime objects to string
                 if isinstance(value, datetime):
                     value = value.strftime('%Y-%m-%d %H:%M:%S')
-                header = headers[i]
-                # Migrate old "Initial Remarks" to "Initial Screening"
-                if header == 'Initial Remarks':
-                    header = 'Initial Screening'
-                row_data[header] = str(value) if value is not None else ''
-            data.append(row_data)
+                values.append(str(value) if value is not None else '')
+            data.append(build_candidate(values))
+        wb.close()
         
+        metrics.EXCEL_DURATION.observe(time.perf_counter() - start, operation="load")
+        metrics.EXCEL_ROWS.set(len(data), operation="load")
         return data
     except Exception as e:
-        print(f"Error loading data from Excel: {e}")
+        logger.error(f"Error loading data from Excel: {e}")
         # Optionally, re-raise the exception or return an empty list/error indicator
         return []
 
 # Save data to Excel
 def save_data(data):
+    import openpyxl
+    from openpyxl.cell.cell import MergedCell
+    start = time.perf_counter()
     try:
         if not os.path.exists(EXCEL_FILE):
             create_sample_excel()
+        migrate_excel_schema()
 
         wb = openpyxl.load_workbook(EXCEL_FILE)
         sheet = wb[SHEET_NAME]
 
-        # Get current headers
+        # Get current headers (already in EXCEL_HEADERS order after migration)
         headers = [cell.value for cell in sheet[1] if cell is not None and cell.value]
-        
-        # Desired field order (keep 'Date' at the beginning)
-        desired_fields = [
-            'Name', 'Email ID', 'Contact Number', 'LinkedIn Profile', 'Resume',
-            'Interested Position', 'Current Role', 'Current Organization', 'Total Years of Experience',
-            'Current Location', 'Location Preference', 'Current CTC per Annum', 'Expected CTC per Annum',
-            'Notice Period', 'In Notice', 'Immediate Joiner', 'Offers in Hand', 'Offered CTC',
-            'Certifications', 'Referred By',
-            'Interview Status', 'Application Status','Remarks',
-            'Initial Screening', 'Round 1 D and T', 'Round 1 Remarks', 'Round 2 D and T', 'Round 2 Remarks',
-            'Offered Position', 'Joining Date', 'Reject Mail Sent', 'Screened By',
-        ]
-        
-        # Build ordered headers: Date + desired fields present + any remaining headers
-        ordered_headers = []
-        if 'Date' in headers:
-            ordered_headers.append('Date')
-        ordered_headers.extend([h for h in desired_fields if h in headers])
-        # Include any headers not in desired list (e.g., 'Reference')
-        ordered_headers.extend([h for h in headers if h not in ordered_headers])
-        
-        # If there are desired fields missing from headers, append them so they are created
-        ordered_headers.extend([h for h in desired_fields if h not in ordered_headers])
+        ordered_headers = order_headers(headers)
         
         # Rewrite headers in desired order
         for col_num, header in enumerate(ordered_headers, 1):
@@ -708,18 +836,15 @@ def save_data(data):
                 if cell is not None and not isinstance(cell, MergedCell):
                     cell.value = header
         
-        # Clear existing data (except headers)
-        for row in range(sheet.max_row, 1, -1):
-            sheet.delete_rows(row)
+        # Clear existing data (except headers) in one call; deleting row by
+        # row shifts every remaining cell each time and is quadratic
+        if sheet.max_row > 1:
+            sheet.delete_rows(2, sheet.max_row - 1)
         
         # Add updated data
         for row_num, row_data in enumerate(data, 2):
             for col_num, header in enumerate(ordered_headers, 1):
-                # Migrate old "Initial Remarks" to "Initial Screening"
-                if header == 'Initial Screening':
-                    value = row_data.get('Initial Screening') or row_data.get('Initial Remarks', '')
-                else:
-                    value = row_data.get(header, '')
+                value = row_data.get(header, '')
                 # Convert value to string, handle None
                 if value is None:
                     value = ''
@@ -733,13 +858,203 @@ def save_data(data):
         # Save and close the workbook
         wb.save(EXCEL_FILE)
         wb.close()
-        print(f"Data saved to Excel: {len(data)} records")
+        metrics.EXCEL_DURATION.observe(time.perf_counter() - start, operation="save")
+        metrics.EXCEL_ROWS.set(len(data), operation="save")
+        logger.info(f"Data saved to Excel: {len(data)} records")
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        print(f"Error in save_data: {error_trace}")
+        logger.error(f"Error in save_data: {error_trace}")
         raise
 
+# ============================================
+# Duplicate detection
+# ============================================
+# DuplicateIndex over the workbook rows. It is rebuilt only when the workbook
+# changed on disk since it was built and is extended in place when add_data
+# appends a row, so checking a new candidate is a couple of dict lookups.
+_duplicate_index = None
+_duplicate_index_stamp = None
+_duplicate_index_lock = threading.Lock()
+
+
+def _excel_stamp():
+    try:
+        stat = os.stat(EXCEL_FILE)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_duplicate_index(data):
+    """DuplicateIndex for `data` (the current load_data() rows), reused while the workbook is unchanged"""
+    global _duplicate_index, _duplicate_index_stamp
+    stamp = _excel_stamp()
+    with _duplicate_index_lock:
+        if (_duplicate_index is not None and stamp == _duplicate_index_stamp
+                and _duplicate_index.size == len(data)):
+            metrics.record_cache("duplicate_index", hit=True)
+            return _duplicate_index
+        metrics.record_cache("duplicate_index", hit=False)
+        _duplicate_index = duplicates.DuplicateIndex(data, app.config.get("DEFAULT_PHONE_COUNTRY_CODE", "91"))
+        _duplicate_index_stamp = stamp
+        return _duplicate_index
+
+
+def index_saved_candidate(index, record):
+    """Keep the duplicate index and candidate table current after save_data() wrote `record` at row `index`"""
+    global _duplicate_index_stamp, _candidate_table_stamp, _listed_duplicates
+    with _duplicate_index_lock:
+        if _duplicate_index is not None:
+            if index == _duplicate_index.size:
+                _duplicate_index.add(index, record)
+                _duplicate_index_stamp = _excel_stamp()
+            else:
+                # An existing row changed: its old keys are unknown here, so rebuild on next use
+                _duplicate_index_stamp = None
+    with _candidate_table_lock:
+        # A table over the API list is rebuilt once the write drops the shared list
+        if (_candidate_table is not None and _candidate_table_stamp and _candidate_table_stamp[0] == 'excel'
+                and index <= _candidate_table.size):
+            if index == _candidate_table.size:
+                _candidate_table.append(record)
+            else:
+                _candidate_table.update_row(index, record)
+            _candidate_table_stamp = ('excel', _excel_stamp())
+            _listed_duplicates = (None, None)
+
+
+# Bitmap-indexed candidate rows (see candidate_table.py) over the list /api/data serves.
+# The stamp is ('api', fetched_at) of the shared applicant list or ('excel', workbook stamp).
+_candidate_table = None
+_candidate_table_stamp = None
+_candidate_table_lock = threading.Lock()
+
+
+def get_candidate_table():
+    """
+    CandidateTable over the same rows as /api/data, so filter, export and
+    row indexes agree with the list the UI shows: the shared Guhatek
+    applicant list, or the workbook when the API is unavailable. Rebuilt
+    only when that list is refetched or the workbook changes; while the
+    table is current only the small APPLICANTS_STAMP_KEY entry is read.
+    """
+    global _candidate_table, _candidate_table_stamp
+    with _candidate_table_lock:
+        current = SHARED_CACHE.get(APPLICANTS_STAMP_KEY)
+        if _candidate_table is not None and current is not None and _candidate_table_stamp == ('api', current):
+            metrics.record_cache("candidate_table", hit=True)
+            return _candidate_table
+
+    generation = SHARED_CACHE.generation(APPLICANTS_CACHE_KEY)
+    entry = api_applicant_list()
+    stamp = ('api', entry['fetched_at']) if entry is not None else ('excel', _excel_stamp())
+    with _candidate_table_lock:
+        if _candidate_table is not None and stamp[1] is not None and stamp == _candidate_table_stamp:
+            metrics.record_cache("candidate_table", hit=True)
+            return _candidate_table
+        metrics.record_cache("candidate_table", hit=False)
+        if entry is not None:
+            rows = [candidates.Candidate(applicant) for applicant in entry['applicants']]
+        else:
+            rows = load_data()
+        _candidate_table = candidate_table.CandidateTable(rows)
+        _candidate_table_stamp = stamp
+    if entry is not None:
+        # Publish the stamp until the list itself expires, unless a write dropped it meanwhile
+        remaining = entry['fetched_at'] + app.config['APPLICANT_CACHE_TTL'] - time.time()
+        if remaining > 0 and SHARED_CACHE.generation(APPLICANTS_CACHE_KEY) == generation:
+            SHARED_CACHE.set(APPLICANTS_STAMP_KEY, entry['fetched_at'], remaining)
+    return _candidate_table
+
+
+# DuplicateIndex over the candidate table's rows: (table, index)
+_listed_duplicates = (None, None)
+
+
+def get_listed_duplicate_index(table):
+    """DuplicateIndex over `table.rows` (the /api/data list), built once per candidate table"""
+    global _listed_duplicates
+    with _candidate_table_lock:
+        if _listed_duplicates[0] is not table:
+            _listed_duplicates = (table, duplicates.DuplicateIndex(
+                table.rows, app.config.get("DEFAULT_PHONE_COUNTRY_CODE", "91")))
+        return _listed_duplicates[1]
+
+
+def describe_duplicates(data, matches):
+    """Summaries of the rows a DuplicateIndex lookup matched"""
+    return [{
+        'index': index,
+        'name': data[index].get('Name', ''),
+        'email': data[index].get('Email ID', ''),
+        'contact': data[index].get('Contact Number', ''),
+        'date': data[index].get('Date', ''),
+        'matched_on': matched_on
+    } for index, matched_on in matches.items()]
+
+
+def merge_candidate(existing, incoming):
+    """Copy the non-empty fields of a repeat application onto the existing row"""
+    for key, value in incoming.items():
+        if key.startswith('_') or value is None or not str(value).strip():
+            continue
+        existing[key] = value
+    return existing
+
+
+# Every status/screening change is appended here (see status_events.py)
+STATUS_EVENTS = status_events.StatusEventLog(app.config['STATUS_EVENTS_DB'])
+
+
+def cached_applicant(api_id):
+    """The applicant with this API id from the shared applicant list, if it is cached (never fetches)"""
+    for applicant in (SHARED_CACHE.get(APPLICANTS_CACHE_KEY) or {}).get('applicants', ()):
+        if applicant.get('_api_id') == api_id:
+            return applicant
+    return None
+
+
+def status_event_key(record=None, api_id=None, index=None, link=True):
+    """
+    Event log key of a candidate: its normalized email. Edits that only carry
+    the API id are resolved through the log's API id links, then the cached
+    applicant list; the id is linked to the key for next time unless `link`
+    is False (read-only lookups).
+    """
+    api_id = api_id or (record or {}).get('_api_id')
+    key = status_events.email_key(record)
+    if key is None and api_id:
+        key = STATUS_EVENTS.resolve(api_id) or status_events.email_key(cached_applicant(api_id))
+    if key and api_id and link:
+        STATUS_EVENTS.link(api_id, key)
+    return key or status_events.candidate_key(api_id=api_id, index=index)
+
+
+def record_status_changes(previous, updated, api_id=None, index=None, known=None):
+    """
+    Log the tracked fields of `updated` that differ from `previous`.
+
+    `previous` is the row before the save ({} for a new candidate). None
+    means it is not known; then the last logged values are used, or, for
+    fields never logged, those of `known` (the candidate's record as last
+    seen, which also identifies it). Failures are logged and never fail the
+    save itself.
+    """
+    try:
+        key = status_event_key(previous or known or updated, api_id=api_id, index=index)
+        if previous is None:
+            previous = {}
+            for field in status_events.STATUS_FIELDS:
+                logged = STATUS_EVENTS.last_value(key, field)
+                previous[field] = logged if logged is not None else (known or {}).get(field)
+        changes = status_events.status_changes(previous, updated)
+        if changes:
+            STATUS_EVENTS.record(key, changes, user=session.get('username'))
+    except Exception as e:
+        logger.error(f"Could not record status changes: {e}")
+
+
 # Initialize user database
 def init_user_db():
     """Initialize the user database with admin user"""
@@ -790,6 +1105,9 @@ def is_admin():
 # Send rejection email
 def send_rejection_email(candidate_name, candidate_email, position):
     """Send a professional rejection email to the candidate"""
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
     try:
         # Create message
         msg = MIMEMultipart('alternative')
@@ -845,16 +1163,18 @@ Best regards,
         msg.attach(part2)
         
         # Send email
-        with smtplib.SMTP(EMAIL_CONFIG['SMTP_SERVER'], EMAIL_CONFIG['SMTP_PORT']) as server:
-            server.starttls()
-            server.login(EMAIL_CONFIG['SENDER_EMAIL'], EMAIL_CONFIG['SENDER_PASSWORD'])
-            server.send_message(msg)
+        with metrics.SMTP_SEND_DURATION.time():
+            with smtplib.SMTP(EMAIL_CONFIG['SMTP_SERVER'], EMAIL_CONFIG['SMTP_PORT']) as server:
+                server.starttls()
+                server.login(EMAIL_CONFIG['SENDER_EMAIL'], EMAIL_CONFIG['SENDER_PASSWORD'])
+                server.send_message(msg)
         
-        print(f"✅ Rejection email sent to {candidate_email}")
+        logger.info(f"Rejection email sent to {candidate_email}")
         return True, "Email sent successfully"
     
     except Exception as e:
-        print(f"❌ Error sending email: {str(e)}")
+        metrics.SMTP_ERRORS.inc()
+        logger.error(f"Error sending email: {str(e)}")
         return False, str(e)
 
 # Login route
@@ -913,106 +1233,300 @@ def admin_required(f):
     decorated_function.__name__ = f.__name__
     return decorated_function
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint (Bearer METRICS_TOKEN required when configured)"""
+    metrics_token = app.config.get("METRICS_TOKEN")
+    if metrics_token and request.headers.get("Authorization") != f"Bearer {metrics_token}":
+        return jsonify({"status": "error", "message": "Invalid metrics token"}), 401
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
 @app.route('/')
 @login_required
 def index():
     return render_template('index.html', is_admin=session.get('is_admin', False))
 
+# (path) -> (mtime, size, sha256 hex); uploads are rarely rewritten, so the
+# hash is computed once per file version instead of on every preview.
+# Content-addressed uploads carry their hash in the name and skip this.
+_file_hash_cache = {}
+_file_hash_lock = threading.Lock()
+
+
+def file_content_hash(path):
+    """Return the SHA-256 hex digest of a file, cached by (mtime, size)"""
+    digest = resume_store.blob_digest(path)
+    if digest:
+        return digest
+
+    stat = os.stat(path)
+    with _file_hash_lock:
+        cached = _file_hash_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        metrics.record_cache("file_hash", hit=True)
+        return cached[2]
+
+    metrics.record_cache("file_hash", hit=False)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _file_hash_lock:
+        _file_hash_cache[path] = (stat.st_mtime_ns, stat.st_size, value)
+    return value
+
+
 @app.route('/uploads/<path:filename>')
 @login_required
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """
+    Serve an uploaded resume after the login check.
 
-@app.route('/api/data', methods=['GET'])
-@login_required
-def get_data():
-    """Fetch data from Guhatek API (replaces Excel as primary source)"""
-    try:
-        logger.info("=== Fetching applicants from Guhatek API ===")
-        
-        # Get token from token manager
-        token = token_manager.get_token()
-        
-        # Call applications API
+    Responses carry a content-hash ETag and a private max-age, and answer
+    If-None-Match / Range requests (304 / 206) so the PDF viewer can fetch
+    pages incrementally. With UPLOAD_OFFLOAD set to 'x-accel-redirect'
+    (nginx) or 'x-sendfile' (Apache/lighttpd), Flask only authorizes and
+    the reverse proxy streams the file bytes.
+    """
+    from werkzeug.security import safe_join
+    from urllib.parse import quote
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    file_path = safe_join(upload_folder, filename)
+    if file_path is None or not os.path.isfile(file_path):
+        return jsonify({"status": "error", "message": "File not found"}), 404
+
+    etag = file_content_hash(file_path)
+    max_age = app.config.get("UPLOAD_CACHE_MAX_AGE", 86400)
+    offload = (app.config.get("UPLOAD_OFFLOAD") or "").lower()
+
+    if offload in ("x-accel-redirect", "x-sendfile"):
+        response = app.response_class(status=200)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.max_age = max_age
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+        mimetype = "application/pdf" if filename.lower().endswith(".pdf") else "application/octet-stream"
+        response.headers["Content-Type"] = mimetype
+        if offload == "x-accel-redirect":
+            prefix = app.config.get("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+            response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(filename)
+        else:
+            response.headers["X-Sendfile"] = os.path.abspath(file_path)
+        return response
+
+    response = send_from_directory(upload_folder, filename, etag=etag, conditional=True, max_age=max_age)
+    # The route requires a login, so shared caches must not store the file
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+def _fetch_applicants_from_api():
+    """Valid applicants from the Guhatek API as plain portal-format dicts"""
+    import requests
+    logger.info("=== Fetching applicants from Guhatek API ===")
+    
+    # Get token from token manager
+    token = token_manager.get_token()
+    
+    # Call applications API
+    timeout = upstream_timeout("list", 15)
+    with upstream_call("list"):
         response = requests.get(
             f"{token_manager.api_base_url}/api/applications",
             headers={
                 "Authorization": f"Bearer {token}",
                 "Content-Type": "application/json"
             },
-            timeout=15
+            timeout=timeout
         )
         response.raise_for_status()
-        
-        api_data = response.json()
-        raw_applicants = api_data.get("data", [])
-        
-        logger.info(f"Received {len(raw_applicants)} applicants from API")
-        
-        # Filter and transform data - only include complete records
-        valid_applicants = []
-        for applicant in raw_applicants:
-            # Check if critical fields have values
-            has_name = applicant.get("full_name") and str(applicant.get("full_name")).strip()
-            has_email = applicant.get("email") and str(applicant.get("email")).strip()
-            has_contact = applicant.get("contact_number") and str(applicant.get("contact_number")).strip()
-            
-            if has_name and has_email and has_contact:
-                # Transform API response to match frontend format
-                # IMPORTANT: Include the API 'id' for PATCH updates
-                transformed = {
-                    "_api_id": applicant.get("id", ""),  # Store API ID for updates
-                    "Date": applicant.get("submitted_at", ""),
-                    "Name": applicant.get("full_name", ""),
-                    "Email ID": applicant.get("email", ""),
-                    "Contact Number": applicant.get("contact_number", ""),
-                    "LinkedIn Profile": applicant.get("linkedin_profile", ""),
-                    "Resume": applicant.get("resume_url", ""),
-                    "Interested Position": applicant.get("interested_position", ""),
-                    "Current Role": applicant.get("currentrole", ""),
-                    "Current Organization": applicant.get("current_organisation", ""),
-                    "Total Years of Experience": str(applicant.get("total_experience", "")) if applicant.get("total_experience") else "",
-                    "Current Location": applicant.get("current_location", ""),
-                    "Location Preference": applicant.get("location_preference", ""),
-                    "Current CTC per Annum": str(applicant.get("current_ctc", "")) if applicant.get("current_ctc") else "",
-                    "Expected CTC per Annum": str(applicant.get("expected_ctc", "")) if applicant.get("expected_ctc") else "",
-                    "Notice Period": str(applicant.get("notice_period", "")) if applicant.get("notice_period") else "",
-                    "In Notice": "Yes" if applicant.get("currently_noticeperiod") else "No",
-                    "Immediate Joiner": "Yes" if applicant.get("immediate_joiner") else "No",
-                    "Offers in Hand": "Yes" if applicant.get("other_offer_in_hand") else "No",
-                    "Offered CTC": str(applicant.get("offered_ctc", "")) if applicant.get("offered_ctc") else "",
-                    "Certifications": applicant.get("certifications", "") or "",
-                    "Referred By": applicant.get("referred_by", "") or "",
-                    "Interview Status": applicant.get("interview_status", "") or "",
-                    "Application Status": applicant.get("application_status", "") or "",
-                    "Initial Screening": applicant.get("initial_screening", "") or "",
-                    "Round 1 D and T": applicant.get("round1_dt", "") or "",
-                    "Round 1 Remarks": applicant.get("round1_feedback", "") or "",
-                    "Round 2 D and T": applicant.get("round2_dt", "") or "",
-                    "Round 2 Remarks": applicant.get("round2_feedback", "") or "",
-                    "Offered Position": applicant.get("offered_position", "") or "",
-                    "Joining Date": applicant.get("joining_date", "") or "",
-                    "Reject Mail Sent": "Yes" if applicant.get("reject_mail_sent") else "No",
-                    "Remarks": applicant.get("additional_info", "") or "",
-                    "Screened By": applicant.get("screened_by", "") or ""
-                }
-                valid_applicants.append(transformed)
-        
-        logger.info(f"Returning {len(valid_applicants)} valid applicants")
-        
-        is_admin_user = is_admin()
-        return jsonify({"data": valid_applicants, "is_admin": is_admin_user})
-        
+    
+    api_data = response.json()
+    raw_applicants = api_data.get("data", [])
+    
+    logger.info(f"Received {len(raw_applicants)} applicants from API")
+    
+    # Filter and transform data - only include complete records
+    decode = applicant_codec.APPLICANT.decode
+    valid_applicants = [
+        decode(applicant)
+        for applicant in raw_applicants
+        if has_required_api_fields(applicant)
+    ]
+    
+    logger.info(f"Returning {len(valid_applicants)} valid applicants")
+    return valid_applicants
+
+
+def _fetch_applicant_list():
+    applicants = _fetch_applicants_from_api()
+    link_stray_status_events(applicants)
+    return {"fetched_at": time.time(), "applicants": applicants}
+
+
+def link_stray_status_events(applicants):
+    """
+    Move status events still logged under a bare API id to the applicant's
+    email key, so every reader (portal stale, ?index=) finds them there
+    """
+    try:
+        stray = STATUS_EVENTS.stray_api_ids()
+        for applicant in applicants if stray else ():
+            key = status_events.email_key(applicant)
+            if key and applicant.get('_api_id') in stray:
+                STATUS_EVENTS.link(applicant['_api_id'], key)
+    except Exception as e:
+        logger.warning(f"Could not link status events to applicants: {e}")
+
+
+def api_applicant_list():
+    """
+    The shared applicant list entry ({"fetched_at", "applicants"}), or None
+    when the Guhatek API failed and callers should fall back to Excel.
+    The API result is shared by all workers for APPLICANT_CACHE_TTL seconds.
+    """
+    import requests
+    ttl = app.config['APPLICANT_CACHE_TTL']
+    try:
+        if ttl > 0:
+            return SHARED_CACHE.get_or_compute(APPLICANTS_CACHE_KEY, ttl, _fetch_applicant_list)
+        return _fetch_applicant_list()
+    except upstream.UpstreamUnavailable as e:
+        logger.warning(f"{e} - falling back to Excel")
     except requests.exceptions.Timeout:
         logger.error("Guhatek API timeout - falling back to Excel")
-        # Fallback to Excel if API fails
-        data = load_data()
-        return jsonify({"data": data, "is_admin": is_admin()})
     except Exception as e:
         logger.error(f"Error fetching from API: {str(e)} - falling back to Excel")
-        # Fallback to Excel if API fails
-        data = load_data()
-        return jsonify({"data": data, "is_admin": is_admin()})
+    return None
+
+
+def fetch_candidate_list():
+    """
+    (version, candidates): fetch_candidates() plus a version string that
+    changes whenever the list is refetched or the Excel fallback changes.
+    """
+    entry = api_applicant_list()
+    if entry is None:
+        stamp = _excel_stamp()
+        return f"excel:{stamp[0]}:{stamp[1]}" if stamp else "excel", load_data()
+    return f"api:{entry['fetched_at']!r}", [candidates.Candidate(applicant) for applicant in entry['applicants']]
+
+
+def fetch_candidates():
+    """
+    Candidates from the Guhatek API in portal format, falling back to Excel when the API fails.
+    The Excel fallback is not cached.
+    """
+    return fetch_candidate_list()[1]
+
+@app.route('/api/data', methods=['GET'])
+@login_required
+def get_data():
+    """
+    Fetch data from Guhatek API (replaces Excel as primary source)
+
+    Query params:
+        offset, version: return only the candidates from `offset` on when the
+            list is still the `version` an earlier response (e.g. /api/bootstrap)
+            came from. If the list changed since, the whole list is returned
+            with offset 0.
+    """
+    version, candidates_list = fetch_candidate_list()
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({"status": "error", "message": "offset must be an integer"}), 400
+    if offset and request.args.get('version') != version:
+        offset = 0
+    return jsonify({
+        "data": candidates_list[offset:] if offset else candidates_list,
+        "offset": offset,
+        "total": len(candidates_list),
+        "version": version,
+        "is_admin": is_admin()
+    })
+
+@app.route('/api/bootstrap', methods=['GET'])
+@login_required
+def get_bootstrap():
+    """
+    Everything the main page needs for its first render in one response:
+    dropdown options, the user's role and the first page of candidates.
+
+    Query params:
+        limit: number of candidates to include (default BOOTSTRAP_PAGE_SIZE)
+
+    When 'total' is larger than the page, the client fetches the rest with
+    /api/data?offset=<page length>&version=<version>, so no candidate is
+    downloaded twice.
+    """
+    try:
+        limit = int(request.args.get('limit', app.config.get('BOOTSTRAP_PAGE_SIZE', 50)))
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be an integer"}), 400
+    limit = max(0, limit)
+
+    version, candidates_list = fetch_candidate_list()
+    return jsonify({
+        "dropdowns": DROPDOWN_OPTIONS,
+        "dropdowns_etag": DROPDOWN_OPTIONS_ETAG,
+        "is_admin": is_admin(),
+        "username": session.get('username'),
+        "data": candidates_list[:limit],
+        "total": len(candidates_list),
+        "version": version
+    })
+
+def merge_into_applicant(listed, target, new_data, duplicate_rows):
+    """
+    Fold a repeat application into the existing candidate `listed[target]`:
+    PATCH the Guhatek applicant first, then update its Excel backup row.
+    Nothing is written when the applicant cannot be updated upstream.
+    """
+    existing = listed[target]
+    api_id = existing.get('_api_id')
+    if not api_id:
+        return jsonify({
+            "status": "error",
+            "message": "Cannot merge while the Guhatek API is unavailable; retry later or add with on_duplicate=flag",
+            "duplicates": duplicate_rows
+        }), 503
+    
+    changes = merge_candidate({}, new_data)
+    api_success, api_message, _ = update_applicant_via_api(api_id, changes)
+    if not api_success:
+        return jsonify({
+            "status": "error",
+            "message": f"Could not merge into the existing applicant: {api_message}",
+            "duplicates": duplicate_rows
+        }), 502
+    merged = merge_candidate(dict(existing), changes)
+    
+    # The workbook copy of the applicant, found by email/phone
+    data = load_data()
+    rows = get_duplicate_index(data).find(existing)
+    if rows:
+        row = max(rows)
+        merge_candidate(data[row], changes)
+        save_data(data)
+        index_saved_candidate(row, data[row])
+    else:
+        logger.info(f"Applicant {api_id} has no Excel backup row; merged upstream only")
+    record_status_changes(existing, merged, api_id=api_id)
+    return jsonify({
+        "status": "success",
+        "message": f"Merged into existing candidate {merged.get('Name', '')}".strip(),
+        "merged_into": target,
+        "duplicates": duplicate_rows,
+        "api_synced": True,
+        "api_id": api_id,
+        "api_message": api_message
+    })
+
 
 @app.route('/api/data', methods=['POST'])
 @login_required
@@ -1023,7 +1537,7 @@ def add_data():
     Secondary: Save to local Excel as backup.
     """
     try:
-        resume_file = None
+        resume_filename = None
         local_filename = None
         
         # Handle multipart/form-data (for file uploads) or application/json
@@ -1034,13 +1548,39 @@ def add_data():
             if 'Resume' in request.files:
                 file = request.files['Resume']
                 if file and file.filename:
-                    # Store file reference for API upload
-                    resume_file = file
-                    # Also save locally as backup
-                    local_filename = f"{int(time.time())}_{file.filename}"
-                    # We need to save the file position for later local save
-                    file_content = file.read()
-                    file.seek(0)  # Reset for API upload
+                    # The upload was spooled to disk while it was received; keep
+                    # it (once per distinct file) and send the API that copy
+                    resume_filename = file.filename
+                    local_filename, _ = resume_store.save_upload(
+                        file.stream, file.filename, app.config['UPLOAD_FOLDER']
+                    )
+                    index_uploaded_resume(local_filename)
+        
+        # What to do when the email or phone is already on file:
+        # 'flag' (default) adds the candidate and reports the matches,
+        # 'merge' folds the new details into the most recent matching row
+        on_duplicate = str(new_data.pop('on_duplicate', '') or request.args.get('on_duplicate') or 'flag').lower()
+        if on_duplicate not in ('flag', 'merge'):
+            return jsonify({
+                "status": "error",
+                "message": "on_duplicate must be 'flag' or 'merge'"
+            }), 400
+        if local_filename:
+            new_data['Resume'] = local_filename
+        
+        # Duplicates are looked up in the list /api/data serves: the Guhatek
+        # applicants, or the Excel backup while the API is unavailable
+        table = get_candidate_table()
+        listed = table.rows
+        matches = get_listed_duplicate_index(table).find(new_data)
+        duplicate_rows = describe_duplicates(listed, matches)
+        if matches:
+            logger.info(f"Candidate matches existing candidates {list(matches)} on email/phone")
+        
+        if matches and on_duplicate == 'merge':
+            return merge_into_applicant(listed, max(matches), new_data, duplicate_rows)
+        
+        data = load_data()
         
         # Add timestamp if not present
         if 'Date' not in new_data or not new_data['Date']:
@@ -1056,7 +1596,8 @@ def add_data():
         api_id = None
         
         try:
-            api_success, api_message, api_id = create_applicant_via_api(new_data, resume_file)
+            resume_path = os.path.join(app.config['UPLOAD_FOLDER'], local_filename) if local_filename else None
+            api_success, api_message, api_id = create_applicant_via_api(new_data, resume_path, resume_filename)
             if api_success:
                 logger.info(f"API creation successful, ID: {api_id}")
                 new_data['_api_id'] = api_id  # Store API ID for future updates
@@ -1069,19 +1610,10 @@ def add_data():
         # ==========================================
         # SECONDARY: Save to local Excel (backup)
         # ==========================================
-        # Save resume file locally if we have it
-        if resume_file and local_filename:
-            try:
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], local_filename)
-                with open(file_path, 'wb') as f:
-                    f.write(file_content)
-                new_data['Resume'] = local_filename
-            except Exception as file_error:
-                logger.error(f"Error saving resume locally: {str(file_error)}")
-        
-        data = load_data()
         data.append(new_data)
         save_data(data)
+        index_saved_candidate(len(data) - 1, new_data)
+        record_status_changes({}, new_data, api_id=api_id, index=len(data) - 1)
         
         # ==========================================
         # Return response
@@ -1092,22 +1624,260 @@ def add_data():
                 "message": "Candidate added and synced to API",
                 "api_synced": True,
                 "api_id": api_id,
-                "api_message": api_message
+                "api_message": api_message,
+                "duplicates": duplicate_rows
             })
         else:
             return jsonify({
                 "status": "success",
                 "message": "Candidate added locally (API sync pending)",
                 "api_synced": False,
-                "api_message": api_message
+                "api_message": api_message,
+                "duplicates": duplicate_rows
             })
             
+    except RequestEntityTooLarge as e:
+        return jsonify({"status": "error", "message": e.description}), 413
     except Exception as e:
         import traceback
         logger.error(f"Error adding data: {traceback.format_exc()}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+# ============================================
+# Bulk import jobs: upstream creates for rows already saved
+# ============================================
+# Seconds an import job's status stays readable
+IMPORT_JOB_TTL = 24 * 3600
+# Least seconds between progress writes to the shared cache
+IMPORT_JOB_PUBLISH_SECONDS = 1.0
+
+
+def _import_job_key(job_id):
+    return f"import_job:{job_id}"
+
+
+def start_import_job(uploads, results, username):
+    """
+    Create the imported rows' applicants upstream on a background thread.
+
+    `uploads` are create_applicant_via_api() arguments and `results` the rows'
+    result dicts, updated as each create finishes. The job's progress is kept
+    in the shared cache so any worker can answer GET /api/data/import/<job_id>,
+    and each new API id is linked to the candidate's status history. A job cut
+    short (worker restart) leaves its remaining rows in the workbook, pending
+    sync, like a single add while the API is down.
+    """
+    job = {
+        "job_id": secrets.token_hex(8),
+        "state": "running",
+        "user": username,
+        "total": len(uploads),
+        "done": 0,
+        "api_synced": 0,
+        "started_at": time.time(),
+        "finished_at": None,
+        "results": results,
+    }
+    key = _import_job_key(job["job_id"])
+    lock = threading.Lock()
+    last_publish = [0.0]
+
+    def publish(force=False):
+        # Called with `lock` held
+        if force or time.monotonic() - last_publish[0] >= IMPORT_JOB_PUBLISH_SECONDS:
+            SHARED_CACHE.set(key, job, IMPORT_JOB_TTL)
+            last_publish[0] = time.monotonic()
+
+    def finished(position, outcome):
+        if isinstance(outcome, Exception):
+            api_success, api_message, api_id = False, str(outcome), None
+        else:
+            api_success, api_message, api_id = outcome
+        with lock:
+            results[position].update({
+                "status": "created" if api_success else "sync_failed",
+                "api_synced": bool(api_success),
+                "api_id": api_id,
+                "api_message": api_message,
+            })
+            job["done"] += 1
+            job["api_synced"] += bool(api_success)
+            publish()
+        if api_success:
+            try:
+                status_event_key(uploads[position][0], api_id=api_id)
+            except Exception as e:
+                logger.warning(f"Could not link applicant {api_id} to its status history: {e}")
+
+    def run():
+        try:
+            bulk_import.create_all(
+                uploads,
+                lambda upload: create_applicant_via_api(*upload),
+                max_workers=app.config['IMPORT_API_WORKERS'],
+                rate=app.config['IMPORT_API_RATE'],
+                on_result=finished
+            )
+        except Exception:
+            logger.exception(f"Import job {job['job_id']} failed")
+        finally:
+            with lock:
+                job["state"] = "finished"
+                job["finished_at"] = time.time()
+                publish(force=True)
+            logger.info(f"Import job {job['job_id']}: {job['api_synced']} of {job['total']} created upstream")
+
+    with lock:
+        publish(force=True)
+    threading.Thread(target=run, name=f"import-{job['job_id']}", daemon=True).start()
+    return job
+
+
+@app.route('/api/data/import', methods=['POST'])
+@login_required
+def import_candidates():
+    """
+    Add many candidates from a sheet, with their resumes.
+
+    multipart/form-data:
+        file          .csv or .xlsx, one candidate per row, workbook column names as headers
+        resumes       optional .zip with the PDFs named in the sheet's 'Resume' column
+        on_duplicate  'flag' (default: import and report matches) or 'skip' rows whose email
+                      or phone is already on file or appears earlier in the sheet
+        dry_run       1 to validate only
+
+    Every row is validated first; if any row is invalid nothing is stored and the
+    per-row errors are returned with 400. Otherwise the resumes are stored and all
+    rows are appended to the workbook in one save, and the response (202) names a
+    background job that creates the applicants upstream (IMPORT_API_WORKERS
+    threads, at most IMPORT_API_RATE calls per second). Its progress is at
+    GET /api/data/import/<job_id>.
+    """
+    archive = None
+    try:
+        sheet = request.files.get('file')
+        if not sheet or not sheet.filename:
+            return jsonify({"status": "error", "message": "Upload the candidate sheet as 'file'"}), 400
+        on_duplicate = (request.form.get('on_duplicate') or 'flag').lower()
+        if on_duplicate not in ('flag', 'skip'):
+            return jsonify({"status": "error", "message": "on_duplicate must be 'flag' or 'skip'"}), 400
+        dry_run = str(request.form.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+
+        try:
+            rows, ignored_headers = bulk_import.read_rows(
+                sheet.stream, sheet.filename, app.config['IMPORT_MAX_ROWS']
+            )
+            resumes = request.files.get('resumes')
+            if resumes and resumes.filename:
+                archive = bulk_import.ResumeArchive(resumes.stream, app.config.get('MAX_RESUME_BYTES'))
+        except bulk_import.ImportFileError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if not rows:
+            return jsonify({"status": "error", "message": "The candidate sheet has no rows"}), 400
+
+        data = load_data()
+        report = bulk_import.validate_rows(
+            rows, get_duplicate_index(data), archive, app.config.get("DEFAULT_PHONE_COUNTRY_CODE", "91")
+        )
+        results = [{
+            "row": row_number,
+            "name": record.get('Name', ''),
+            "errors": report[row_number]["errors"],
+            "duplicates": describe_duplicates(data, report[row_number]["duplicates"]),
+            "duplicate_rows": report[row_number]["duplicate_rows"],
+        } for row_number, record in rows]
+        invalid = sum(1 for result in results if result["errors"])
+        if invalid:
+            return jsonify({
+                "status": "error",
+                "message": f"{invalid} of {len(rows)} rows are invalid; nothing was imported",
+                "ignored_columns": ignored_headers,
+                "results": results
+            }), 400
+
+        selected = []
+        for (row_number, record), result in zip(rows, results):
+            if on_duplicate == 'skip' and (result["duplicates"] or result["duplicate_rows"]):
+                result["status"] = "skipped"
+            else:
+                result["status"] = "valid"
+                selected.append((record, result))
+        if dry_run:
+            return jsonify({
+                "status": "success",
+                "dry_run": True,
+                "to_import": len(selected),
+                "skipped": len(rows) - len(selected),
+                "ignored_columns": ignored_headers,
+                "results": results
+            })
+
+        # Store the resumes and save every row before anything is created upstream:
+        # an import cut short leaves rows pending sync, never applicants the workbook lacks
+        upload_folder = app.config['UPLOAD_FOLDER']
+        uploads = []
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for record, result in selected:
+            resume_name = record.get('Resume')
+            resume_path = None
+            if resume_name:
+                with archive.open(resume_name) as member:
+                    record['Resume'], _ = resume_store.save_upload(member, resume_name, upload_folder)
+                index_uploaded_resume(record['Resume'])
+                resume_path = os.path.join(upload_folder, record['Resume'])
+            if not record.get('Date'):
+                record['Date'] = now
+            uploads.append((record, resume_path, os.path.basename(resume_name) if resume_name else None))
+
+        # One workbook write for the whole batch
+        data = load_data()
+        first_index = len(data)
+        for record, result in selected:
+            result.update({"status": "saved", "index": len(data), "api_synced": False})
+            data.append(record)
+        save_data(data)
+        for index in range(first_index, len(data)):
+            index_saved_candidate(index, data[index])
+            record_status_changes({}, data[index], index=index)
+
+        logger.info(f"Imported {len(selected)} candidates for {session.get('username')}; creating them upstream")
+        job = start_import_job(uploads, [result for record, result in selected], session.get('username'))
+        return jsonify({
+            "status": "success",
+            "message": f"Imported {len(selected)} candidates; creating them in the API in the background",
+            "imported": len(selected),
+            "skipped": len(rows) - len(selected),
+            "job_id": job["job_id"],
+            "job_url": url_for('get_import_job', job_id=job["job_id"]),
+            "ignored_columns": ignored_headers,
+            "results": results
+        }), 202
+    except RequestEntityTooLarge as e:
+        return jsonify({"status": "error", "message": e.description}), 413
+    except Exception as e:
+        import traceback
+        logger.error(f"Error importing candidates: {traceback.format_exc()}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+@app.route('/api/data/import/<job_id>', methods=['GET'])
+@login_required
+def get_import_job(job_id):
+    """
+    Progress of a bulk import's upstream creates: state (running/finished),
+    done and api_synced out of total, and each row's result (status created
+    or sync_failed, api_id, api_message) once its create has finished.
+    """
+    job = SHARED_CACHE.get(_import_job_key(job_id))
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown or expired import job"}), 404
+    return jsonify({"status": "success", **job})
+
+
 @app.route('/api/data/<int:index>', methods=['PUT'])
 @login_required
 def update_data(index):
@@ -1125,9 +1895,10 @@ def update_data(index):
             if 'Resume' in request.files:
                 file = request.files['Resume']
                 if file and file.filename:
-                    # Create a safe, timestamped filename
-                    filename = f"{int(time.time())}_{file.filename}"
-                    file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+                    filename, _ = resume_store.save_upload(
+                        file.stream, file.filename, app.config['UPLOAD_FOLDER']
+                    )
+                    index_uploaded_resume(filename)
                     update_payload['Resume'] = filename
         
         # Extract the API ID if provided (for PATCH updates)
@@ -1153,6 +1924,8 @@ def update_data(index):
         # ==========================================
         api_update_success = False
         api_message = ""
+        # The candidate as the shared applicant list last saw it (before this edit)
+        upstream = cached_applicant(api_id) if api_id else None
         
         if api_id:
             api_success, api_msg, updated_data = update_applicant_via_api(api_id, update_payload)
@@ -1161,6 +1934,9 @@ def update_data(index):
             
             if api_success:
                 logger.info(f"API update successful for applicant {api_id}")
+                if upstream is None and updated_data:
+                    # Only the identity: the returned statuses are already the new ones
+                    upstream = {'Email ID': updated_data.get('email')}
             else:
                 logger.warning(f"API update failed for applicant {api_id}: {api_msg}")
         else:
@@ -1172,27 +1948,39 @@ def update_data(index):
         # ==========================================
         excel_update_success = False
         excel_skip_reason = None
+        previous = None
         
         try:
             data = load_data()
+            # `index` is the row of the list the client shows: the API list when the
+            # candidate has an API id (found in the workbook by email), else the workbook
+            row = index
+            if api_id:
+                email = (upstream or {}).get('Email ID')
+                matches = get_duplicate_index(data).find({'Email ID': email}) if email else {}
+                row = max(matches) if matches else -1
             
             # Check if index is valid for Excel
-            if 0 <= index < len(data):
+            if 0 <= row < len(data):
+                previous = dict(data[row])
                 # Update the data at the specified index
                 for key, value in update_payload.items():
                     # Convert specific fields to appropriate types if necessary
                     if key in ['Current CTC per Annum', 'Expected CTC per Annum', 'Offered CTC']:
                         try:
-                            data[index][key] = int(value) if value else ''
+                            data[row][key] = int(value) if value else ''
                         except (ValueError, TypeError):
-                            data[index][key] = value  # Keep original if conversion fails
+                            data[row][key] = value  # Keep original if conversion fails
                     else:
                         # Ensure all values are strings or None
-                        data[index][key] = str(value) if value is not None else ''
+                        data[row][key] = str(value) if value is not None else ''
                 
                 save_data(data)
                 excel_update_success = True
-                logger.info(f"Excel update successful for index {index}")
+                logger.info(f"Excel update successful for row {row}")
+            elif api_id:
+                excel_skip_reason = "Candidate not found in the Excel backup"
+                logger.info(f"Skipping Excel update: {excel_skip_reason}")
             else:
                 excel_skip_reason = f"Index {index} out of range (Excel has {len(data)} records)"
                 logger.warning(f"Skipping Excel update: {excel_skip_reason}")
@@ -1200,6 +1988,13 @@ def update_data(index):
             excel_skip_reason = f"Excel error: {str(excel_error)}"
             logger.warning(f"Skipping Excel update: {excel_skip_reason}")
         
+        if api_update_success or excel_update_success:
+            if api_id:
+                # The workbook copy may lag the API; the log holds the last known statuses
+                record_status_changes(None, update_payload, api_id=api_id, known=upstream)
+            else:
+                record_status_changes(previous, update_payload, index=row)
+        
         # ==========================================
         # Return response based on update status
         # ==========================================
@@ -1245,6 +2040,8 @@ def update_data(index):
                     "excel_skip_reason": excel_skip_reason
                 }), 500
             
+    except RequestEntityTooLarge as e:
+        return jsonify({"status": "error", "message": e.description}), 413
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
@@ -1272,10 +2069,226 @@ def delete_data(index):
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/duplicates', methods=['GET'])
+@login_required
+def find_duplicates():
+    """
+    Report candidates that appear more than once in the sheet.
+
+    Rows are grouped when they share a normalized email or phone number
+    (transitively), largest groups first.
+    """
+    try:
+        data = load_data()
+        duplicate_index = get_duplicate_index(data)
+        groups = duplicate_index.groups()
+
+        def matched_on(row, group):
+            row_keys = set(duplicates.record_keys(data[row], duplicate_index.default_country_code))
+            return [field for field, value in group["keys"] if (field, value) in row_keys]
+
+        return jsonify({
+            "status": "success",
+            "total_records": len(data),
+            "duplicate_groups": len(groups),
+            "duplicate_records": sum(len(g["rows"]) for g in groups),
+            "groups": [{
+                "matched_on": [{"field": field, "value": value} for field, value in group["keys"]],
+                "candidates": describe_duplicates(data, {row: matched_on(row, group) for row in group["rows"]})
+            } for group in groups]
+        })
+    except Exception as e:
+        logger.error(f"Error building duplicate report: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+def candidate_filter_from_request():
+    """Filter expression of a candidate list request: the POST body's 'where', or the GET filter parameters"""
+    if request.method == 'POST':
+        return (request.get_json(silent=True) or {}).get('where') or {}
+    return {
+        param: request.args.getlist(param)
+        for param in candidate_table.FILTER_PARAMS
+        if request.args.getlist(param)
+    }
+
+@app.route('/api/candidates/filter', methods=['GET', 'POST'])
+@login_required
+def filter_candidates():
+    """
+    Filter candidates on the categorical columns through bitmap indexes.
+
+    GET query parameters (repeatable; OR within a parameter, AND across):
+        status, interview_status, position, location, notice_period, screened_by
+        offset, limit   page of rows to return (default 0, 50; limit=0 for counts only)
+
+    POST takes any AND/OR/NOT combination as JSON:
+        {"where": {"or": [{"status": ["On Hold"]},
+                          {"and": [{"position": "DevOps Engineer"}, {"location": "Chennai"}]}]},
+         "offset": 0, "limit": 50}
+
+    Rows are those /api/data serves (the Guhatek list, or the workbook when
+    the API is unavailable); 'indexes' are positions in that list. 'total'
+    and the facet counts cover every matching row, not just the page.
+    """
+    try:
+        where = candidate_filter_from_request()
+        if request.method == 'POST':
+            body = request.get_json(silent=True) or {}
+            offset, limit = body.get('offset', 0), body.get('limit', 50)
+        else:
+            offset, limit = request.args.get('offset', 0), request.args.get('limit', 50)
+        try:
+            offset, limit = max(0, int(offset)), max(0, int(limit))
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "offset and limit must be integers"}), 400
+
+        table = get_candidate_table()
+        try:
+            selection = table.match(where)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        indexes = table.indexes(selection, offset, limit)
+        facets = table.facets(selection)
+        return jsonify({
+            "status": "success",
+            "total": table.count(selection),
+            "offset": offset,
+            "limit": limit,
+            "indexes": indexes,
+            "data": [table.rows[index] for index in indexes],
+            "facets": {
+                param: [{"value": value, "count": count}
+                        for value, count in sorted(facets[field].items(), key=lambda item: (-item[1], item[0]))]
+                for param, field in candidate_table.FILTER_PARAMS.items()
+            },
+            "is_admin": is_admin()
+        })
+    except Exception as e:
+        logger.error(f"Error filtering candidates: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/candidates/export', methods=['GET', 'POST'])
+@login_required
+def export_candidates():
+    """
+    Download the candidates matching a filter as CSV or XLSX.
+
+    Takes the same filters as /api/candidates/filter (GET parameters or a
+    POST body with "where"), plus format=csv (default) or xlsx, over the
+    same rows as /api/data. The file is streamed as it is written; columns
+    follow the workbook.
+    """
+    if request.method == 'POST':
+        export_format = (request.get_json(silent=True) or {}).get('format', 'csv')
+    else:
+        export_format = request.args.get('format', 'csv')
+    if export_format not in export.FORMATS:
+        return jsonify({"status": "error", "message": "format must be csv or xlsx"}), 400
+
+    table = get_candidate_table()
+    try:
+        selection = table.match(candidate_filter_from_request())
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    rows = table.rows
+    records = (rows[index] for index in candidate_table.iter_rows(selection))
+    write, mimetype = export.FORMATS[export_format]
+    filename = f"candidates-{datetime.now().strftime('%Y%m%d-%H%M')}.{export_format}"
+    logger.info(f"Exporting {table.count(selection)} candidates as {export_format} for {session.get('username')}")
+    return Response(
+        stream_with_context(write(records, EXCEL_HEADERS)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+def _event_time(value):
+    """Unix time from a query parameter: seconds, or a date such as 2025-06-01"""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        parsed = analytics_snapshots.parse_record_date(value)
+        if parsed is None:
+            raise ValueError(f"Invalid time: {value}")
+        return int(parsed.timestamp())
+
+
+@app.route('/api/status-events', methods=['GET'])
+@login_required
+def get_status_events():
+    """
+    Status/screening change history from the append-only event log.
+
+    Query parameters (all optional, combined with AND):
+        index / api_id / candidate   one candidate (row of the /api/data list, API id or log key)
+        field                        e.g. Application Status
+        user                         who made the change
+        since / until                unix seconds or dates (until is exclusive)
+        after, limit                 page through the log (default limit 100, max 1000)
+    """
+    try:
+        candidate = request.args.get('candidate')
+        if request.args.get('api_id'):
+            candidate = status_event_key(api_id=request.args['api_id'], link=False)
+        elif request.args.get('index') is not None:
+            index = int(request.args['index'])
+            rows = get_candidate_table().rows
+            if not 0 <= index < len(rows):
+                return jsonify({"status": "error", "message": "Index out of range"}), 404
+            # Rows from the API carry their _api_id; a sheet row number only identifies workbook rows
+            candidate = status_event_key(rows[index], index=None if rows[index].get('_api_id') else index,
+                                         link=False)
+        limit = min(max(1, int(request.args.get('limit', 100))), 1000)
+        events = STATUS_EVENTS.events(
+            candidate=candidate,
+            field=request.args.get('field'),
+            user=request.args.get('user'),
+            since=_event_time(request.args.get('since')),
+            until=_event_time(request.args.get('until')),
+            after_id=int(request.args.get('after', 0)),
+            limit=limit
+        )
+        return jsonify({
+            "status": "success",
+            "candidate": candidate,
+            "events": events,
+            "next_after": events[-1]['id'] if len(events) == limit else None
+        })
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error reading status events: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@app.route('/api/status-metrics', methods=['GET'])
+@login_required
+def get_status_metrics():
+    """
+    Funnel conversion and time-in-stage for ?field=Application Status (default)
+    or Interview Status, in pipeline order, from the event log's aggregates.
+    """
+    field = request.args.get('field', 'Application Status')
+    if field not in status_events.STATUS_FIELDS:
+        return jsonify({
+            "status": "error",
+            "message": f"field must be one of: {', '.join(status_events.STATUS_FIELDS)}"
+        }), 400
+    try:
+        metrics_data = STATUS_EVENTS.stage_metrics(field, stages=DROPDOWN_OPTIONS.get(field, ()))
+        return jsonify({"status": "success", "field": field, **metrics_data})
+    except Exception as e:
+        logger.error(f"Error computing status metrics: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 @app.route('/api/applicants', methods=['GET'])
 @login_required
 def get_applicants_from_api():
     """Fetch applicants from Guhatek API and filter out null records"""
+    import requests
     try:
         logger.info("=== Starting API applicants fetch ===")
         
@@ -1286,70 +2299,27 @@ def get_applicants_from_api():
         
         # Call applications API
         logger.info("Fetching applicants from Guhatek API")
-        response = requests.get(
-            f"{token_manager.api_base_url}/api/applications",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
-            timeout=15  # Increased timeout for slower dev cluster
-        )
-        logger.info(f"API response status: {response.status_code}")
-        response.raise_for_status()
+        timeout = upstream_timeout("list", 15)  # Increased timeout for slower dev cluster
+        with upstream_call("list"):
+            response = requests.get(
+                f"{token_manager.api_base_url}/api/applications",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json"
+                },
+                timeout=timeout
+            )
+            logger.info(f"API response status: {response.status_code}")
+            response.raise_for_status()
         
         data = response.json()
         raw_applicants = data.get("data", [])
         
         logger.info(f"Received {len(raw_applicants)} applicants from API")
         
-        # Filter out records with null values for critical fields
-        # Only include records that have AT LEAST: full_name, email, and contact_number
-        valid_applicants = []
-        for applicant in raw_applicants:
-            # Check if critical fields have values (not null and not empty string)
-            has_name = applicant.get("full_name") and str(applicant.get("full_name")).strip()
-            has_email = applicant.get("email") and str(applicant.get("email")).strip()
-            has_contact = applicant.get("contact_number") and str(applicant.get("contact_number")).strip()
-            
-            # Only include if all critical fields have values
-            if has_name and has_email and has_contact:
-                # Transform API response to match our Excel format
-                transformed_applicant = {
-                    "Date": applicant.get("submitted_at", ""),
-                    "Name": applicant.get("full_name", ""),
-                    "Email ID": applicant.get("email", ""),
-                    "Contact Number": applicant.get("contact_number", ""),
-                    "LinkedIn Profile": applicant.get("linkedin_profile", ""),
-                    "Resume": applicant.get("resume_url", ""),
-                    "Interested Position": applicant.get("interested_position", ""),
-                    "Current Role": applicant.get("currentrole", ""),
-                    "Current Organization": applicant.get("current_organisation", ""),
-                    "Total Years of Experience": str(applicant.get("total_experience", "")) if applicant.get("total_experience") else "",
-                    "Current Location": applicant.get("current_location", ""),
-                    "Location Preference": applicant.get("location_preference", ""),
-                    "Current CTC per Annum": str(applicant.get("current_ctc", "")) if applicant.get("current_ctc") else "",
-                    "Expected CTC per Annum": str(applicant.get("expected_ctc", "")) if applicant.get("expected_ctc") else "",
-                    "Notice Period": str(applicant.get("notice_period", "")) if applicant.get("notice_period") else "",
-                    "In Notice": "Yes" if applicant.get("currently_noticeperiod") else "No",
-                    "Immediate Joiner": "Yes" if applicant.get("immediate_joiner") else "No",
-                    "Offers in Hand": "Yes" if applicant.get("other_offer_in_hand") else "No",
-                    "Offered CTC": str(applicant.get("offered_ctc", "")) if applicant.get("offered_ctc") else "",
-                    "Certifications": applicant.get("certifications", ""),
-                    "Referred By": applicant.get("referred_by", ""),
-                    "Interview Status": "",
-                    "Application Status": "",
-                    "Initial Screening": "",
-                    "Round 1 D and T": "",
-                    "Round 1 Remarks": "",
-                    "Round 2 D and T": "",
-                    "Round 2 Remarks": "",
-                    "Offered Position": "",
-                    "Joining Date": "",
-                    "Reject Mail Sent": "No",
-                    "Remarks": applicant.get("additional_info", ""),
-                    "Screened By": ""
-                }
-                valid_applicants.append(transformed_applicant)
+        # Only records with a name, email and contact number, in the same format as /api/data
+        decode = applicant_codec.APPLICANT.decode
+        valid_applicants = [decode(applicant) for applicant in raw_applicants if has_required_api_fields(applicant)]
         
         logger.info(f"Filtered to {len(valid_applicants)} valid applicants (excluding null records)")
         logger.info("=== API fetch completed successfully ===")
@@ -1362,6 +2332,12 @@ def get_applicants_from_api():
             "is_admin": is_admin()
         })
         
+    except upstream.UpstreamUnavailable as e:
+        logger.warning(f"Applicants not fetched: {e}")
+        response = jsonify({"status": "error", "message": str(e)})
+        if isinstance(e, upstream.CircuitOpenError):
+            response.headers['Retry-After'] = str(max(1, round(e.retry_after)))
+        return response, 503
     except requests.exceptions.Timeout:
         logger.error("API request timed out")
         return jsonify({
@@ -1390,293 +2366,127 @@ def get_applicants_from_api():
 def analytics():
     return render_template('analytics.html', is_admin=True)
 
+# Closed months are summarized once into ANALYTICS_SNAPSHOT_DIR (see
+# analytics_snapshots.py); requests add them up with the live current month.
+ANALYTICS = analytics_snapshots.AnalyticsSnapshots(
+    app.config.get('ANALYTICS_SNAPSHOT_DIR', os.path.join('database', 'analytics')),
+    load_records=load_data,
+    source_stamp=_excel_stamp,
+)
+
+
 @app.route('/api/analytics', methods=['GET'])
 @login_required
 def get_analytics_data():
-    """Return analytics data for the dashboard"""
+    """Return analytics data for the dashboard (optionally for one year: ?year=2025)"""
     try:
-        # Get year parameter from query string
         year_filter = request.args.get('year')
-        
-        # Load data from Excel file
-        data = load_data()
-        
-        # Filter data by year if specified
-        if year_filter:
-            filtered_data = []
-            for item in data:
-                date_str = item.get('Date of Application')
-                if date_str:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        if str(date_obj.year) == year_filter:
-                            filtered_data.append(item)
-                    except ValueError:
-                        pass
-            data = filtered_data
-            print(f"Filtered data for year {year_filter}: {len(data)} records")
-        else:
-            print(f"No year filter applied, returning all {len(data)} records")
-        
-        # Calculate metrics
-        total_applicant = len(data)
-        total_rejected = sum(1 for item in data if item.get('Application Status') == 'Rejected')
-        no_response = sum(1 for item in data if item.get('Application Status') == 'No Resp Call/Email')
-        not_interviewed = sum(1 for item in data if item.get('Interview Status') == 'Not Interviewed')
-        total_round_2_completed = sum(1 for item in data if item.get('Round 2 Status') == 'Completed')
-        did_not_join = sum(1 for item in data if item.get('Application Status') == 'Did Not Join')
-        on_hold = sum(1 for item in data if item.get('Application Status') == 'On Hold')
-        accepted_waiting_reference = sum(1 for item in data if item.get('Application Status') == 'Accepted')
-        total_in_notice_yet_to_join = sum(1 for item in data if item.get('Application Status') == 'In Notice')
-        total_joined = sum(1 for item in data if item.get('Application Status') == 'Joined')
-        intern = sum(1 for item in data if item.get('Interested Position') == 'Intern') # Assuming 'Intern' is a position
-
-        # Monthly Statistics
-        monthly_stats = defaultdict(lambda: {"applicants": 0, "accepted": 0, "rejected": 0, "in_notice": 0, "joined": 0})
-        for item in data:
-            date_str = item.get('Date of Application')
-            if date_str:
-                try:
-                    # Assuming date format is 'YYYY-MM-DD' or similar
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    month_year = date_obj.strftime('%b %Y') # e.g., 'Nov 2025'
-                    monthly_stats[month_year]["applicants"] += 1
-                    if item.get('Application Status') == 'Accepted':
-                        monthly_stats[month_year]["accepted"] += 1
-                    elif item.get('Application Status') == 'Rejected':
-                        monthly_stats[month_year]["rejected"] += 1
-                    elif item.get('Application Status') == 'In Notice':
-                        monthly_stats[month_year]["in_notice"] += 1
-                    elif item.get('Application Status') == 'Joined':
-                        monthly_stats[month_year]["joined"] += 1
-                except ValueError:
-                    # Handle cases where date_str might be in a different format or invalid
-                    pass
-        
-        # Sort monthly statistics by date
-        sorted_monthly_stats = []
-        for month_year in sorted(monthly_stats.keys(), key=lambda x: datetime.strptime(x, '%b %Y')):
-            stats = monthly_stats[month_year]
-            sorted_monthly_stats.append({
-                "month": month_year,
-                "applicants": stats["applicants"],
-                "accepted": stats["accepted"],
-                "rejected": stats["rejected"],
-                "in_notice": stats["in_notice"],
-                "joined": stats["joined"]
-            })
-
-        # Hiring Funnel Status by Role
-        hiring_funnel_by_role = defaultdict(lambda: {"count": 0})
-        for item in data:
-            role = item.get('Interested Position')
-            if role:
-                hiring_funnel_by_role[role]["count"] += 1
-        
-        sorted_hiring_funnel_by_role = [{"role": role, "count": stats["count"]} for role, stats in hiring_funnel_by_role.items()]
-
-        # Position Statistics
-        position_stats = defaultdict(lambda: {"applied": 0, "joined": 0})
-        for item in data:
-            position = item.get('Interested Position')
-            if position:
-                position_stats[position]["applied"] += 1
-                if item.get('Application Status') == 'Joined':
-                    position_stats[position]["joined"] += 1
-        
-        sorted_position_stats = [{"position": pos, "applied": stats["applied"], "joined": stats["joined"]} for pos, stats in position_stats.items()]
-        
-        # Offer Details - candidates with offered CTC
-        offer_details = []
-        for item in data:
-            offered_ctc = item.get('Offered CTC')
-            # Filter out invalid or non-offer values
-            if offered_ctc and str(offered_ctc).lower() not in ['no', 'nil', 'n/a', '0', '', 'none']:
-                offer_details.append({
-                    'name': item.get('Name', 'N/A'),
-                    'offered_ctc': offered_ctc,
-                    'joining_date': item.get('Joining Date', 'N/A')
-                })
-        
-        # User Activity - track users who have added screening/remarks (with monthly breakdown)
-        user_activity = defaultdict(lambda: {"candidates_screened": 0})
-        user_activity_by_month = defaultdict(lambda: defaultdict(lambda: {"candidates_screened": 0}))
-        
-        # Get current month for new screenings
-        current_month = datetime.now().strftime('%b %Y')  # e.g., 'Jan 2026'
-        
-        for item in data:
-            screened_by = item.get('Screened By')
-            if screened_by and screened_by.strip():
-                user_activity[screened_by]["candidates_screened"] += 1
-                
-                # Get date for monthly breakdown - use screening date if available, otherwise use application date
-                # Priority: Screening Date > Initial Screening date parsing > Date > Date of Application
-                date_str = None
-                
-                # Check for screening-related date fields
-                initial_screening = item.get('Initial Screening')
-                if initial_screening and initial_screening.strip():
-                    # If there's initial screening content, try to extract date or use application date
-                    date_str = item.get('Date') or item.get('Date of Application')
-                else:
-                    date_str = item.get('Date') or item.get('Date of Application')
-                
-                month_year = current_month  # Default to current month
-                
-                if date_str:
-                    try:
-                        date_str = str(date_str).strip()
-                        # Try multiple date formats
-                        if 'T' in date_str:
-                            # ISO format from API: 2025-12-23T00:00:00.000Z
-                            date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        elif '/' in date_str:
-                            # Excel format: M/D/YYYY or MM/DD/YYYY
-                            date_obj = datetime.strptime(date_str.split(' ')[0], '%m/%d/%Y')
-                        elif '-' in date_str:
-                            # ISO date: YYYY-MM-DD
-                            if ' ' in date_str:
-                                date_obj = datetime.strptime(date_str.split(' ')[0], '%Y-%m-%d')
-                            else:
-                                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        else:
-                            date_obj = None
-                        
-                        if date_obj:
-                            month_year = date_obj.strftime('%b %Y')
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Date parsing error for '{date_str}': {e}")
-                        month_year = current_month  # Fallback to current month
-                
-                user_activity_by_month[month_year][screened_by]["candidates_screened"] += 1
-        
-        sorted_user_activity = [
-            {"username": username, "candidates_screened": stats["candidates_screened"]} 
-            for username, stats in sorted(user_activity.items(), key=lambda x: x[1]["candidates_screened"], reverse=True)
-        ]
-        
-        # Format monthly user activity
-        monthly_user_activity = {}
-        for month_year, users in user_activity_by_month.items():
-            monthly_user_activity[month_year] = [
-                {"username": username, "candidates_screened": stats["candidates_screened"]}
-                for username, stats in sorted(users.items(), key=lambda x: x[1]["candidates_screened"], reverse=True)
-            ]
-        
-        return jsonify({
-            'total_applicant': total_applicant,
-            'total_rejected': total_rejected,
-            'no_response': no_response,
-            'not_interviewed': not_interviewed,
-            'total_round_2_completed': total_round_2_completed,
-            'did_not_join': did_not_join,
-            'on_hold': on_hold,
-            'accepted_waiting_reference': accepted_waiting_reference,
-            'total_in_notice_yet_to_join': total_in_notice_yet_to_join,
-            'total_joined': total_joined,
-            'intern': intern,
-            'monthly_statistics': sorted_monthly_stats,
-            'hiring_funnel_by_role': sorted_hiring_funnel_by_role,
-            'position_statistics': sorted_position_stats,
-            'offer_details': offer_details,
-            'user_activity': sorted_user_activity,
-            'monthly_user_activity': monthly_user_activity
-        })
+        result = ANALYTICS.report(year=year_filter)
+        logger.info(f"Analytics for {year_filter or 'all years'}: {result['total_applicant']} records")
+        return jsonify(result)
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# Form dropdown options. They only change with a deploy, so the JSON body and
+# its ETag are built once at import instead of on every request.
+DROPDOWN_OPTIONS = {
+    'Interested Position': [
+        'Site Reliability Engineer',
+        'Senior Site Reliability Engineer',
+        'Lead Site Reliability Engineer',
+        'Application Site Reliability Engineer',
+        'Security Operations Centre Engineer',
+        'Performance Engineer',
+        'QA Automation Engineer (Playwright & Selenium)',
+        'DevOps Engineer',
+        'Lead SAP Engineer',
+        'AI/ML Engineer',
+        'AI/ML Intern',
+        'Internship',
+        'Fresher'
+    ],
+    'Current Role': [
+        'Software Engineer',
+        'Senior Software Engineer',
+        'Lead Engineer',
+        'Engineering Manager',
+        'Architect',
+        'QA Engineer',
+        'DevOps Engineer',
+        'Data Engineer',
+        'Data Scientist',
+        'Product Manager',
+        'UI/UX Designer'
+    ],
+    'Current Location': [
+        'Bangalore', 
+        'Chennai', 
+        'Coimbatore', 
+        'Others'
+    ],
+    'Location Preference': [
+        'Bangalore', 
+        'Chennai', 
+        'Coimbatore', 
+        'Others'
+    ],
+    'Total Years of Experience': [
+        '0-1 years',
+        '1-2 years',
+        '2-3 years',
+    ],
+    'Notice Period': [
+        'Immediate',
+        '15 days',
+        '30 days',
+        '60 days',
+        '90 days'
+    ],
+    'In Notice': ['Yes', 'No'],
+    'Immediate Joiner': ['Yes', 'No'],
+    'Offers in Hand': ['Yes', 'No'],
+    'Interview Status': [
+        'Applied',
+        'Profile Screening Comp',
+        'Voice Screening Comp',
+        'Tech Inter Sched',
+        'Tech Inter Comp',
+        'Code Inter Sched',
+        'Code Inter Comp',
+        'HR Inter Sched',
+        'HR Inter Comp',
+        'Offer',
+        'Pending Final Noti',
+        'References',
+        'All Completed'
+    ],
+    'Application Status': [
+        'Proceed Further',
+        'On Hold',
+        'No Resp Call/Email',
+        'Did Not Join',
+        'Sent',
+        'Recieved',
+        'In Notice',
+        'Accepted',
+        'Rejected',
+        'Joined'
+    ],
+    'Reject Mail Sent': ['Yes', 'No']
+}
+# Rows loaded later share these strings instead of holding their own copies
+candidates.intern_vocabulary(DROPDOWN_OPTIONS)
+_DROPDOWN_OPTIONS_BODY = json.dumps(DROPDOWN_OPTIONS)
+DROPDOWN_OPTIONS_ETAG = hashlib.sha256(_DROPDOWN_OPTIONS_BODY.encode('utf-8')).hexdigest()[:16]
+
+
 @app.route('/api/dropdown-options', methods=['GET'])
 @login_required
 def get_dropdown_options():
     """Return all dropdown options for form fields"""
-    dropdown_options = {
-        'Interested Position': [
-            'Site Reliability Engineer',
-            'Senior Site Reliability Engineer',
-            'Lead Site Reliability Engineer',
-            'Application Site Reliability Engineer',
-            'Security Operations Centre Engineer',
-            'Performance Engineer',
-            'QA Automation Engineer (Playwright & Selenium)',
-            'DevOps Engineer',
-            'Lead SAP Engineer',
-            'AI/ML Engineer',
-            'AI/ML Intern',
-            'Internship',
-            'Fresher'
-        ],
-        'Current Role': [
-            'Software Engineer',
-            'Senior Software Engineer',
-            'Lead Engineer',
-            'Engineering Manager',
-            'Architect',
-            'QA Engineer',
-            'DevOps Engineer',
-            'Data Engineer',
-            'Data Scientist',
-            'Product Manager',
-            'UI/UX Designer'
-        ],
-        'Current Location': [
-            'Bangalore', 
-            'Chennai', 
-            'Coimbatore', 
-            'Others'
-        ],
-        'Location Preference': [
-            'Bangalore', 
-            'Chennai', 
-            'Coimbatore', 
-            'Others'
-        ],
-        'Total Years of Experience': [
-            '0-1 years',
-            '1-2 years',
-            '2-3 years',
-        ],
-        'Notice Period': [
-            'Immediate',
-            '15 days',
-            '30 days',
-            '60 days',
-            '90 days'
-        ],
-        'In Notice': ['Yes', 'No'],
-        'Immediate Joiner': ['Yes', 'No'],
-        'Offers in Hand': ['Yes', 'No'],
-        'Interview Status': [
-            'Applied',
-            'Profile Screening Comp',
-            'Voice Screening Comp',
-            'Tech Inter Sched',
-            'Tech Inter Comp',
-            'Code Inter Sched',
-            'Code Inter Comp',
-            'HR Inter Sched',
-            'HR Inter Comp',
-            'Offer',
-            'Pending Final Noti',
-            'References',
-            'All Completed'
-        ],
-        'Application Status': [
-            'Proceed Further',
-            'On Hold',
-            'No Resp Call/Email',
-            'Did Not Join',
-            'Sent',
-            'Recieved',
-            'In Notice',
-            'Accepted',
-            'Rejected',
-            'Joined'
-        ],
-        'Reject Mail Sent': ['Yes', 'No']
-    }
-    
-    return jsonify(dropdown_options)
+    response = app.response_class(_DROPDOWN_OPTIONS_BODY, mimetype='application/json')
+    response.set_etag(DROPDOWN_OPTIONS_ETAG)
+    return response.make_conditional(request)
 
 # User Management Routes (Admin Only)
 @app.route('/users')
@@ -1816,6 +2626,135 @@ def send_rejection_email_api():
         }), 500
 
 # Resume Filter Routes (Admin Only)
+RESUME_INDEX = resume_index.ResumeIndex(
+    app.config["RESUME_INDEX_DB"], tagger=skills.extract_skills, tagger_version=skills.SKILL_TAXONOMY_VERSION
+)
+# Snippets are only built for the best-ranked hits
+RESUME_SNIPPET_LIMIT = 100
+# Query parameter -> candidate column for the resume skill facets
+SKILL_FACET_FIELDS = {
+    'position': 'Interested Position',
+    'experience': 'Total Years of Experience',
+    'location': 'Current Location',
+}
+
+
+def collect_resume_files(candidates):
+    """
+    Map each distinct resume (by content hash) to the candidates that reference it.
+
+    Identical files share one index entry, so they are extracted and ranked
+    once even if they were uploaded under different names.
+
+    Returns:
+        (resume_files, resume_owners): {digest: path}, {digest: [candidate index, ...]}
+    """
+    resume_owners = defaultdict(list)
+    resume_files = {}
+    digests = {}
+    for index, candidate in enumerate(candidates):
+        resume_filename = candidate.get('Resume', '')
+
+        # Skip if no resume file
+        if not resume_filename or resume_filename.startswith('http'):
+            continue
+
+        if resume_filename not in digests:
+            resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
+            # Skip if file doesn't exist
+            if not os.path.isfile(resume_path):
+                digests[resume_filename] = None
+                continue
+            digests[resume_filename] = file_content_hash(resume_path)
+            resume_files.setdefault(digests[resume_filename], resume_path)
+        digest = digests[resume_filename]
+        if digest:
+            resume_owners[digest].append(index)
+    return resume_files, resume_owners
+
+
+# Candidates, resume files and owners behind the resume routes: (workbook stamp, catalog)
+_resume_catalog = (None, None)
+_resume_catalog_lock = threading.Lock()
+
+
+def get_resume_catalog():
+    """
+    (candidates, resume_files, resume_owners) for the current workbook, built
+    once per workbook change. Uploads are indexed when they are saved (see
+    index_uploaded_resume), so the sync here only picks up files that reached
+    the upload folder some other way.
+    """
+    global _resume_catalog
+    stamp = _excel_stamp()
+    with _resume_catalog_lock:
+        if stamp is not None and _resume_catalog[0] == stamp:
+            metrics.record_cache("resume_catalog", hit=True)
+            return _resume_catalog[1]
+        metrics.record_cache("resume_catalog", hit=False)
+        candidates = load_data()
+        resume_files, resume_owners = collect_resume_files(candidates)
+        RESUME_INDEX.sync(resume_files.items())
+        _resume_catalog = (stamp, (candidates, resume_files, resume_owners))
+        return _resume_catalog[1]
+
+
+def index_uploaded_resume(filename):
+    """Extract and index a just-saved upload so the resume routes never do it per query"""
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    try:
+        RESUME_INDEX.sync([(file_content_hash(path), path)])
+    except Exception as e:
+        # The next catalog rebuild retries it
+        logger.warning(f"Could not index resume {filename}: {e}")
+
+
+def migrate_resume_uploads():
+    """
+    Fold timestamped uploads referenced by the workbook into content-addressed
+    blobs and point the 'Resume' column at them. The blobs are written and the
+    workbook saved before the original files are removed, so an interrupted
+    run loses nothing and can simply be repeated. Files no candidate
+    references are left alone.
+
+    Returns:
+        number of candidate rows rewritten
+    """
+    upload_folder = app.config['UPLOAD_FOLDER']
+    data = load_data()
+    adopted = {}
+    changed = 0
+    for candidate in data:
+        resume_filename = candidate.get('Resume', '')
+        if not resume_filename or resume_filename.startswith('http') or resume_store.blob_digest(resume_filename):
+            continue
+        if resume_filename not in adopted:
+            if not os.path.isfile(os.path.join(upload_folder, resume_filename)):
+                continue
+            adopted[resume_filename] = resume_store.adopt_file(resume_filename, upload_folder)
+        candidate['Resume'] = adopted[resume_filename]
+        changed += 1
+    if changed:
+        save_data(data)
+        # Every reference now names a blob; the originals can go
+        for resume_filename in adopted:
+            try:
+                os.remove(os.path.join(upload_folder, resume_filename))
+            except OSError as e:
+                logger.warning(f"Could not remove {resume_filename} after moving it into the blob store: {e}")
+        # Index entries keyed by the old filenames are superseded by content hashes
+        RESUME_INDEX.forget(list(adopted))
+        logger.info(f"Moved {len(adopted)} resume files into the blob store ({changed} candidates updated)")
+    return changed
+
+
+@app.cli.command('migrate-resumes')
+def migrate_resumes_command():
+    """Move timestamped resume uploads into the content-addressed blob store."""
+    changed = migrate_resume_uploads()
+    print(f"{changed} candidate rows now point at resume blobs")
+
+
 @app.route('/resume-filter')
 @admin_required
 def resume_filter_page():
@@ -1826,10 +2765,16 @@ def resume_filter_page():
 @app.route('/api/resume-filter', methods=['POST'])
 @admin_required
 def filter_resumes():
-    """API endpoint to filter resumes by keyword"""
+    """
+    API endpoint to search resumes.
+
+    Supports AND / OR / NOT, parentheses and "quoted phrases" (plain space or
+    comma separated terms are OR'ed as before). Hits are ranked by BM25 over
+    the precomputed resume index and include highlighted snippets.
+    """
     try:
         data = request.json
-        keyword = data.get('keyword', '').strip().lower()
+        keyword = data.get('keyword', '').strip()
         
         if not keyword:
             return jsonify({
@@ -1837,69 +2782,38 @@ def filter_resumes():
                 "message": "Keyword is required"
             }), 400
         
-        # Split keywords by space or comma and filter out empty strings
-        import re
-        keyword_terms = [t.strip().lower() for t in re.split(r'[,\s]+', keyword) if t.strip()]
-        
-        if not keyword_terms:
+        try:
+            query = resume_index.parse_query(keyword)
+        except ValueError:
             return jsonify({
                 "status": "error",
                 "message": "Valid keywords are required"
             }), 400
         
-        # Load candidate data
-        candidates = load_data()
-        results = []
-        
-        for index, candidate in enumerate(candidates):
-            resume_filename = candidate.get('Resume', '')
-            
-            # Skip if no resume file
-            if not resume_filename or resume_filename.startswith('http'):
-                continue
-            
-            # Build full path to resume
-            resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-            
-            # Skip if file doesn't exist
-            if not os.path.exists(resume_path):
-                continue
-            
-            # Extract text from PDF
-            try:
-                reader = PdfReader(resume_path)
-                resume_text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        resume_text += page_text.lower()
-                
-                # Count occurrences for each term and sum them up
-                total_matches = 0
-                term_matches = {}
-                for term in keyword_terms:
-                    count = resume_text.count(term)
-                    if count > 0:
-                        total_matches += count
-                        term_matches[term] = count
-                
-                if total_matches > 0:
-                    results.append({
-                        'index': index,
-                        'name': candidate.get('Name', 'N/A'),
-                        'email': candidate.get('Email ID', 'N/A'),
-                        'position': candidate.get('Interested Position', 'N/A'),
-                        'experience': candidate.get('Total Years of Experience', 'N/A'),
-                        'match_score': total_matches,
-                        'term_matches': term_matches,
-                        'resume': resume_filename
-                    })
-            except Exception as pdf_error:
-                logger.warning(f"Error reading PDF {resume_filename}: {pdf_error}")
-                continue
+        candidates, resume_files, resume_owners = get_resume_catalog()
+        hits = RESUME_INDEX.search(query, doc_keys=resume_files.keys())
+        snippets = RESUME_INDEX.snippets([hit['doc_key'] for hit in hits[:RESUME_SNIPPET_LIMIT]], query)
         
-        # Sort by match score (highest first)
-        results.sort(key=lambda x: x['match_score'], reverse=True)
+        # One hit per distinct resume: the latest candidate that uploaded it,
+        # with earlier rows for the same file listed as duplicates
+        results = []
+        for hit in hits:
+            owners = resume_owners[hit['doc_key']]
+            index = owners[-1]
+            candidate = candidates[index]
+            results.append({
+                'index': index,
+                'name': candidate.get('Name', 'N/A'),
+                'email': candidate.get('Email ID', 'N/A'),
+                'position': candidate.get('Interested Position', 'N/A'),
+                'experience': candidate.get('Total Years of Experience', 'N/A'),
+                'match_score': round(hit['score'], 2),
+                'term_matches': hit['term_matches'],
+                'snippets': snippets.get(hit['doc_key'], []),
+                'skills': sorted(RESUME_INDEX.tags(hit['doc_key'])),
+                'duplicate_indexes': owners[:-1],
+                'resume': candidate.get('Resume', '')
+            })
         
         return jsonify({
             "status": "success",
@@ -1916,12 +2830,96 @@ def filter_resumes():
         }), 500
 
 
+@app.route('/api/resume-skills', methods=['GET'])
+@admin_required
+def resume_skill_facets():
+    """
+    Skill facets over candidates with a resume on file.
+
+    Skills come from the taxonomy tags stored when each resume was indexed, so
+    filtering never re-reads a PDF. Query parameters (repeatable):
+        skill       candidate must have every selected skill (synonyms accepted, e.g. k8s)
+        position    Interested Position is any of the values
+        experience  Total Years of Experience is any of the values
+        location    Current Location is any of the values
+
+    Facet counts are computed over the filtered candidates.
+    """
+    try:
+        selected_skills = []
+        for name in request.args.getlist('skill'):
+            canonical = skills.canonical_skill(name)
+            if canonical is None:
+                return jsonify({
+                    "status": "error",
+                    "message": f"Unknown skill: {name}"
+                }), 400
+            selected_skills.append(canonical)
+        required_skills = frozenset(selected_skills)
+        field_filters = {
+            field: set(request.args.getlist(param))
+            for param, field in SKILL_FACET_FIELDS.items()
+            if request.args.getlist(param)
+        }
+
+        candidates, _, resume_owners = get_resume_catalog()
+
+        skill_counts = Counter()
+        field_counts = {param: Counter() for param in SKILL_FACET_FIELDS}
+        results = []
+        for digest, indexes in resume_owners.items():
+            resume_skills = RESUME_INDEX.tags(digest)
+            if not required_skills <= resume_skills:
+                continue
+            for index in indexes:
+                candidate = candidates[index]
+                if any(str(candidate.get(field, '')) not in values for field, values in field_filters.items()):
+                    continue
+                skill_counts.update(resume_skills)
+                for param, field in SKILL_FACET_FIELDS.items():
+                    value = str(candidate.get(field, '') or '')
+                    if value:
+                        field_counts[param][value] += 1
+                results.append({
+                    'index': index,
+                    'name': candidate.get('Name', 'N/A'),
+                    'email': candidate.get('Email ID', 'N/A'),
+                    'position': candidate.get('Interested Position', 'N/A'),
+                    'experience': candidate.get('Total Years of Experience', 'N/A'),
+                    'location': candidate.get('Current Location', 'N/A'),
+                    'skills': sorted(resume_skills),
+                    'resume': candidate.get('Resume', '')
+                })
+        results.sort(key=lambda r: r['index'])
+
+        def facet(counter):
+            return [{"value": value, "count": count}
+                    for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))]
+
+        return jsonify({
+            "status": "success",
+            "selected_skills": sorted(required_skills),
+            "total_matches": len(results),
+            "facets": {
+                "skills": facet(skill_counts),
+                **{param: facet(counts) for param, counts in field_counts.items()}
+            },
+            "results": results
+        })
+
+    except Exception as e:
+        logger.error(f"Error computing resume skill facets: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
 if __name__ == '__main__':
     init_user_db()
-    # Apply header ordering to existing Excel data on startup
+    # Apply pending header migrations once (no-op when the workbook is current)
     try:
-        data = load_data()
-        save_data(data)
+        migrate_excel_schema()
     except Exception as e:
-        print(f"Error applying header ordering on startup: {e}")
+        logger.error(f"Error migrating Excel schema on startup: {e}")
     app.run(debug=app.config.get("DEBUG", False), port=app.config.get("PORT", 5000))
@@ -0,0 +1,191 @@
+"""
+Applicant records between the portal and the Guhatek API.
+
+The portal keeps a candidate under its workbook columns ('Email ID',
+'In Notice': 'Yes'). The API takes camelCase request fields (email,
+currentlyInNotice: true) and answers with snake_case ones (email,
+currently_noticeperiod: true). APPLICANT_SCHEMA lists every column once,
+with its two API names, its kind and whether it is sent when an applicant
+is created. Codec compiles a schema into three functions whose per-field
+work is written out as straight-line Python, so converting a record does
+no schema lookups, loops or kind dispatch:
+
+- decode(API record) -> portal dict with every column: numbers as text,
+  booleans as 'Yes'/'No', missing values as ''
+- encode_update(portal dict) -> PATCH payload for the mapped columns
+  present. Blanks and placeholders ('-', 'None', ...) become null, or
+  false for booleans
+- encode_create(portal dict) -> POST applicationData for the create
+  columns, leaving blanks out. Form field ids without spaces ('EmailID')
+  are read too
+
+Kinds: TEXT is sent as is. DIGITS is an int made of the value's digits
+("12,00,000" -> 1200000). LEADING_INT is the first number in the value
+("2-3 years" -> 2). BOOL maps 'Yes'/'true'/'1' to true.
+"""
+
+import re
+from collections import namedtuple
+
+TEXT, DIGITS, LEADING_INT, BOOL = "text", "digits", "leading_int", "bool"
+
+# column: portal (workbook) name; request/response: API field names (None: not sent/read)
+Field = namedtuple("Field", "column request response kind create", defaults=(TEXT, False))
+
+APPLICANT_SCHEMA = (
+    Field("Date", None, "submitted_at"),
+    Field("Name", "fullName", "full_name", create=True),
+    Field("Email ID", "email", "email", create=True),
+    Field("Contact Number", "contactNumber", "contact_number", create=True),
+    Field("LinkedIn Profile", "linkedinProfile", "linkedin_profile", create=True),
+    Field("Resume", None, "resume_url"),
+    Field("Interested Position", "interestedPosition", "interested_position", create=True),
+    Field("Current Role", "currentRole", "currentrole", create=True),
+    Field("Current Organization", "currentOrganization", "current_organisation", create=True),
+    Field("Total Years of Experience", "totalExperience", "total_experience", LEADING_INT, create=True),
+    Field("Current Location", "currentLocation", "current_location", create=True),
+    Field("Location Preference", "locationPreference", "location_preference", create=True),
+    Field("Current CTC per Annum", "currentCTC", "current_ctc", DIGITS, create=True),
+    Field("Expected CTC per Annum", "expectedCTC", "expected_ctc", DIGITS, create=True),
+    Field("Notice Period", "noticePeriod", "notice_period", create=True),
+    Field("In Notice", "currentlyInNotice", "currently_noticeperiod", BOOL, create=True),
+    Field("Immediate Joiner", "immediateJoiner", "immediate_joiner", BOOL, create=True),
+    Field("Offers in Hand", "otherOffersInHand", "other_offer_in_hand", BOOL, create=True),
+    Field("Offered CTC", "offeredCTC", "offered_ctc", DIGITS),
+    Field("Certifications", "certifications", "certifications", create=True),
+    Field("Referred By", "referredBy", "referred_by", create=True),
+    Field("Interview Status", "interviewStatus", "interview_status", create=True),
+    Field("Application Status", "applicationStatus", "application_status", create=True),
+    Field("Remarks", "additionalInfo", "additional_info", create=True),
+    Field("Initial Screening", "initialScreening", "initial_screening", create=True),
+    Field("Round 1 D and T", "round1Dt", "round1_dt"),
+    Field("Round 1 Remarks", "round1Feedback", "round1_feedback"),
+    Field("Round 2 D and T", "round2Dt", "round2_dt"),
+    Field("Round 2 Remarks", "round2Feedback", "round2_feedback"),
+    Field("Offered Position", "offeredPosition", "offered_position"),
+    Field("Joining Date", "joiningDate", "joining_date"),
+    Field("Reject Mail Sent", "rejectMailSent", "reject_mail_sent", BOOL),
+    Field("Screened By", "screenedBy", "screened_by"),
+    # API id, kept on portal records for PATCH updates
+    Field("_api_id", None, "id"),
+)
+
+# Cell values that mean "no value"
+PLACEHOLDERS = frozenset({"—", "-", "", "None", "null"})
+TRUE_VALUES = frozenset({"yes", "true", "1"})
+
+_NON_DIGITS = re.compile(r"\D+")
+_NUMBER = re.compile(r"\d+")
+
+
+def to_digits(value):
+    """int of the digits in `value`, or None"""
+    if not value:
+        return None
+    if value.__class__ is int:
+        return value
+    digits = _NON_DIGITS.sub("", str(value))
+    return int(digits) if digits else None
+
+
+def to_leading_int(value):
+    """First whole number in `value`, or None"""
+    if not value:
+        return None
+    if value.__class__ is int:
+        return value
+    number = _NUMBER.search(str(value))
+    return int(number.group()) if number else None
+
+
+def to_flag(value):
+    return value is True or (bool(value) and str(value).strip().lower() in TRUE_VALUES)
+
+
+_CONVERTERS = {DIGITS: "to_digits", LEADING_INT: "to_leading_int", BOOL: "to_flag"}
+
+
+def _clean_lines(indent):
+    """Strip text in `v`; blanks and placeholders become None"""
+    return [
+        f"{indent}if v.__class__ is str:",
+        f"{indent}    v = v.strip()",
+        f"{indent}    if v in PLACEHOLDERS:",
+        f"{indent}        v = None",
+    ]
+
+
+def _decode_source(schema):
+    lines = ["def decode(record):", "    get = record.get", "    return {"]
+    for field in schema:
+        if field.response is None:
+            continue
+        if field.kind == BOOL:
+            value = f"'Yes' if get({field.response!r}) else 'No'"
+        else:
+            value = f"v if (v := get({field.response!r})).__class__ is str else (str(v) if v else '')"
+        lines.append(f"        {field.column!r}: ({value}),")
+    lines.append("    }")
+    return lines
+
+
+def _encode_update_source(schema):
+    lines = ["def encode_update(data):", "    payload = {}", "    get = data.get"]
+    for field in schema:
+        if field.request is None:
+            continue
+        lines.append(f"    v = get({field.column!r}, MISSING)")
+        lines.append("    if v is not MISSING:")
+        lines.extend(_clean_lines("        "))
+        converter = _CONVERTERS.get(field.kind)
+        value = f"{converter}(v)" if converter else "v if v else None"
+        lines.append(f"        payload[{field.request!r}] = {value}")
+    lines.append("    return payload")
+    return lines
+
+
+def _encode_create_source(schema):
+    lines = ["def encode_create(data):", "    payload = {}", "    get = data.get"]
+    for field in schema:
+        if field.request is None or not field.create:
+            continue
+        compact = field.column.replace(" ", "")
+        read = f"get({field.column!r})"
+        if compact != field.column:
+            read += f" or get({compact!r})"
+        lines.append(f"    v = {read}")
+        lines.extend(_clean_lines("    "))
+        lines.append("    if v:")
+        converter = _CONVERTERS.get(field.kind)
+        if field.kind in (DIGITS, LEADING_INT):
+            lines.append(f"        v = {converter}(v)")
+            lines.append("        if v is not None:")
+            lines.append(f"            payload[{field.request!r}] = v")
+        else:
+            lines.append(f"        payload[{field.request!r}] = {converter + '(v)' if converter else 'v'}")
+    lines.append("    return payload")
+    return lines
+
+
+class Codec:
+    """decode / encode_update / encode_create compiled from a schema; `sources` holds the generated code"""
+
+    def __init__(self, schema):
+        self.schema = tuple(schema)
+        self.sources = {
+            "decode": "\n".join(_decode_source(self.schema)),
+            "encode_update": "\n".join(_encode_update_source(self.schema)),
+            "encode_create": "\n".join(_encode_create_source(self.schema)),
+        }
+        namespace = {
+            "MISSING": object(), "PLACEHOLDERS": PLACEHOLDERS,
+            "to_digits": to_digits, "to_leading_int": to_leading_int, "to_flag": to_flag,
+        }
+        for name, source in self.sources.items():
+            exec(compile(source, f"<{name} codec>", "exec"), namespace)
+        self.decode = namespace["decode"]
+        self.encode_update = namespace["encode_update"]
+        self.encode_create = namespace["encode_create"]
+
+
+APPLICANT = Codec(APPLICANT_SCHEMA)
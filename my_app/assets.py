@@ -0,0 +1,380 @@
+"""
+Static asset pipeline.
+
+build() copies every file under static/ into static/dist/ under a
+content-hashed name (js/app.js -> js/app.3f9c2e71d0.js), minifying JS and
+CSS and writing precompressed .gz (and .br when the optional `brotli`
+package is installed) variants of text assets. manifest.json maps the
+logical paths to the hashed ones.
+
+Templates reference assets through the asset_url() helper; the hashed
+files are served from /assets/ with `Cache-Control: immutable` and the
+best precompressed variant the browser accepts. A missing or stale build
+is rebuilt at startup when ASSETS_AUTO_BUILD is on (the default). Builds
+hold an exclusive lock on static/dist/.build.lock, so when several
+gunicorn workers start together one of them builds and the others wait
+and then load its manifest.
+
+Usage (from my_app/):
+    python assets.py            # rebuild static/dist/
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
+from flask import request, send_from_directory, url_for
+
+import compression
+
+logger = logging.getLogger(__name__)
+
+BUILD_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".build.lock"
+HASH_LENGTH = 10
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+COMPRESSIBLE_EXTENSIONS = {".js", ".css", ".svg", ".json", ".html", ".txt", ".map"}
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+# ============================================
+# Minification
+# ============================================
+# Whitespace next to these characters can go without changing meaning.
+# '+', '-', '/' and '.' are excluded ("a - -b", "a / /re/", "1 .toString()").
+_JS_TIGHT = set("{}()[];,:=<>?!&|*%^~")
+# A '/' after one of these starts a regex literal rather than a division
+_JS_REGEX_PREFIX = set("(,=:[!&|?{};+-*%~^<>")
+_JS_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+                      "void", "throw", "instanceof", "yield", "await"}
+_WORD_RE = re.compile(r"[A-Za-z_$][\w$]*$")
+
+
+def _skip_string(src, i):
+    """Index just past the string literal starting at src[i]"""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        if src[i] == "\\":
+            i += 2
+            continue
+        if src[i] == quote or src[i] == "\n":
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_template(src, i):
+    """Index just past the template literal starting at src[i], including ${...} parts"""
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+        elif ch == "`":
+            return i + 1
+        elif src.startswith("${", i):
+            i = _skip_code_block(src, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _skip_code_block(src, i):
+    """Index just past the '}' closing a ${ substitution that starts at src[i]"""
+    depth = 1
+    while i < len(src):
+        ch = src[i]
+        if ch in "'\"":
+            i = _skip_string(src, i)
+        elif ch == "`":
+            i = _skip_template(src, i)
+        elif src.startswith("//", i):
+            i = src.find("\n", i)
+            i = len(src) if i < 0 else i
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = len(src) if end < 0 else end + 2
+        else:
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    """Index just past the regex literal (and flags) starting at src[i]"""
+    i += 1
+    in_class = False
+    while i < len(src):
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "\n":
+            return i
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            i += 1
+            while i < len(src) and (src[i].isalnum() or src[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def minify_js(src):
+    """
+    Conservative JavaScript minifier: drops comments, indentation, blank
+    lines and spaces around punctuation. Line breaks are kept wherever
+    automatic semicolon insertion could depend on them, and string,
+    template and regex literals are copied verbatim.
+    """
+    out = []
+    pending = None  # separator seen since the last token: " " or "\n"
+    i = 0
+    n = len(src)
+
+    def emit(token):
+        nonlocal pending
+        if pending and out:
+            prev, first = out[-1][-1], token[0]
+            if pending == "\n":
+                if prev not in "{;,([" and first not in "})]":
+                    out.append("\n")
+            elif prev not in _JS_TIGHT and first not in _JS_TIGHT:
+                out.append(" ")
+        pending = None
+        out.append(token)
+
+    def separate(text):
+        nonlocal pending
+        pending = "\n" if pending == "\n" or "\n" in text else " "
+
+    while i < n:
+        ch = src[i]
+        if ch.isspace():
+            end = i
+            while end < n and src[end].isspace():
+                end += 1
+        elif src.startswith("//", i):
+            end = src.find("\n", i)
+            end = n if end < 0 else end
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+        else:
+            if ch in "'\"":
+                end = _skip_string(src, i)
+            elif ch == "`":
+                end = _skip_template(src, i)
+            elif ch == "/":
+                text = "".join(out[-8:])
+                word = _WORD_RE.search(text)
+                regex = not text or text[-1] in _JS_REGEX_PREFIX or (word and word.group() in _JS_REGEX_KEYWORDS)
+                end = _skip_regex(src, i) if regex else i + 1
+            else:
+                end = i + 1
+            emit(src[i:end])
+            i = end
+            continue
+        # Whitespace or a comment: both only separate tokens
+        separate(src[i:end])
+        i = end
+    return "".join(out) + "\n"
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_STRING_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+
+
+def minify_css(src):
+    """Drop comments, collapse whitespace and tighten around { } ; , > (strings untouched)"""
+    parts = _CSS_STRING_RE.split(src)
+    for index in range(0, len(parts), 2):
+        text = _CSS_COMMENT_RE.sub("", parts[index])
+        text = re.sub(r"\s+", " ", text)
+        text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+        parts[index] = text.replace(";}", "}")
+    return "".join(parts).strip() + "\n"
+
+
+MINIFIERS = {".js": minify_js, ".css": minify_css}
+
+
+# ============================================
+# Build
+# ============================================
+def _source_files(static_dir, build_dir):
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != build_dir)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, static_dir).replace(os.sep, "/"), path
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _stamps(static_dir, build_dir):
+    stamps = {}
+    for logical, path in _source_files(static_dir, build_dir):
+        stat = os.stat(path)
+        stamps[logical] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def build(static_dir, build_dir=None):
+    """
+    Fingerprint, minify and precompress every asset under static_dir.
+
+    Returns:
+        the manifest dict: {"assets": {logical path: hashed path}, "sources": {...}}
+    """
+    build_dir = build_dir or os.path.join(static_dir, BUILD_DIRNAME)
+    assets = {}
+    written = set()
+    for logical, path in _source_files(static_dir, build_dir):
+        with open(path, "rb") as f:
+            data = f.read()
+        stem, extension = os.path.splitext(logical)
+        minifier = MINIFIERS.get(extension.lower())
+        if minifier:
+            data = minifier(data.decode("utf-8")).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        hashed = f"{stem}.{digest}{extension}"
+        target = os.path.join(build_dir, hashed)
+        if not os.path.exists(target):
+            _write_atomic(target, data)
+        written.add(hashed)
+        if extension.lower() in COMPRESSIBLE_EXTENSIONS:
+            for encoding in compression.available_encodings():
+                variant = target + PRECOMPRESSED_SUFFIXES[encoding]
+                if not os.path.exists(variant):
+                    level = 11 if encoding == "br" else 9
+                    _write_atomic(variant, compression.compress(data, encoding, level))
+                written.add(hashed + PRECOMPRESSED_SUFFIXES[encoding])
+        assets[logical] = hashed
+
+    # Remove outputs of earlier builds
+    for root, _dirs, files in os.walk(build_dir):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), build_dir).replace(os.sep, "/")
+            if relative not in (MANIFEST_NAME, LOCK_NAME) and relative not in written:
+                os.remove(os.path.join(root, name))
+
+    manifest = {"assets": assets, "sources": _stamps(static_dir, build_dir)}
+    _write_atomic(os.path.join(build_dir, MANIFEST_NAME), json.dumps(manifest, indent=2).encode("utf-8"))
+    logger.info(f"Built {len(assets)} static assets into {build_dir}")
+    return manifest
+
+
+@contextmanager
+def build_lock(build_dir):
+    """Exclusive lock for building into build_dir, shared by every process"""
+    os.makedirs(build_dir, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(build_dir, LOCK_NAME), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_built(static_dir, build_dir):
+    """The manifest of a current build, building first (under the build lock) if it is missing or stale"""
+    with build_lock(build_dir):
+        # Another worker may have built while this one waited for the lock
+        manifest = load_manifest(build_dir)
+        if manifest is None or manifest.get("sources") != _stamps(static_dir, build_dir):
+            manifest = build(static_dir, build_dir)
+        return manifest
+
+
+def load_manifest(build_dir):
+    try:
+        with open(os.path.join(build_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================
+# Flask integration
+# ============================================
+def init_app(app):
+    """Load (or build) the manifest, register /assets/ and the asset_url() template helper"""
+    static_dir = app.static_folder
+    build_dir = os.path.join(static_dir, BUILD_DIRNAME)
+    manifest = load_manifest(build_dir)
+    if app.config.get("ASSETS_AUTO_BUILD", True):
+        if manifest is None or manifest.get("sources") != _stamps(static_dir, build_dir):
+            try:
+                manifest = ensure_built(static_dir, build_dir)
+            except OSError as e:
+                logger.error(f"Static asset build failed, serving unversioned files: {e}")
+    hashed_paths = (manifest or {}).get("assets", {})
+
+    def asset_url(path):
+        """URL of a static asset: the fingerprinted build if there is one, else /static/"""
+        hashed = hashed_paths.get(path)
+        if hashed:
+            return url_for("serve_asset", filename=hashed)
+        return url_for("static", filename=path)
+
+    app.jinja_env.globals["asset_url"] = asset_url
+
+    @app.route("/assets/<path:filename>", endpoint="serve_asset")
+    def serve_asset(filename):
+        variants = [e for e, suffix in PRECOMPRESSED_SUFFIXES.items()
+                    if os.path.isfile(os.path.join(build_dir, filename + suffix))]
+        encoding = compression.choose_encoding(request.accept_encodings, variants) if variants else None
+        served = filename + PRECOMPRESSED_SUFFIXES[encoding] if encoding else filename
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_from_directory(build_dir, served, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if variants:
+            response.vary.add("Accept-Encoding")
+        # The name changes whenever the content does
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    return asset_url
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+    build_dir = os.path.join(static_dir, BUILD_DIRNAME)
+    with build_lock(build_dir):
+        result = build(static_dir, build_dir)
+    for logical, hashed in sorted(result["assets"].items()):
+        print(f"{logical} -> {hashed}")
@@ -0,0 +1,143 @@
+"""
+Micro-benchmark of the portal<->API applicant codec (applicant_codec.py).
+
+Converts large synthetic batches of applicants with the compiled codec
+functions and, as a baseline, with a loop that interprets the same schema
+field by field. Checks that both give the same records and reports
+throughput (records per second).
+
+Usage (from my_app/):
+    python -m benchmarks.codec_bench --sizes 10000,100000 --repeat 5 --output codec.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import applicant_codec  # noqa: E402
+from applicant_codec import BOOL, DIGITS, LEADING_INT, PLACEHOLDERS  # noqa: E402
+from benchmarks import synth  # noqa: E402
+
+_CONVERT = {DIGITS: applicant_codec.to_digits, LEADING_INT: applicant_codec.to_leading_int,
+            BOOL: applicant_codec.to_flag}
+
+
+def _clean(value):
+    if value.__class__ is str:
+        value = value.strip()
+        return None if value in PLACEHOLDERS else value
+    return value
+
+
+def interpreted(schema):
+    """decode/encode_update/encode_create that walk the schema for every record"""
+    schema = tuple(schema)
+
+    def decode(record):
+        result = {}
+        for field in schema:
+            if field.response is None:
+                continue
+            value = record.get(field.response)
+            if field.kind == BOOL:
+                result[field.column] = 'Yes' if value else 'No'
+            else:
+                result[field.column] = value if value.__class__ is str else (str(value) if value else '')
+        return result
+
+    def encode_update(data):
+        payload = {}
+        for field in schema:
+            if field.request is None or field.column not in data:
+                continue
+            value = _clean(data[field.column])
+            convert = _CONVERT.get(field.kind)
+            payload[field.request] = convert(value) if convert else (value if value else None)
+        return payload
+
+    def encode_create(data):
+        payload = {}
+        for field in schema:
+            if field.request is None or not field.create:
+                continue
+            value = _clean(data.get(field.column) or data.get(field.column.replace(' ', '')))
+            if not value:
+                continue
+            convert = _CONVERT.get(field.kind)
+            if convert:
+                value = convert(value)
+            if value is not None:
+                payload[field.request] = value
+        return payload
+
+    return {'decode': decode, 'encode_update': encode_update, 'encode_create': encode_create}
+
+
+def best_rate(func, records, repeat):
+    """(records per second of the fastest run, median run seconds)"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            func(record)
+        runs.append(time.perf_counter() - start)
+    return len(records) / min(runs), statistics.median(runs)
+
+
+def run_size(size, repeat):
+    applicants = synth.generate_api_applicants(size)
+    rows = synth.generate_candidates(size)
+    compiled = applicant_codec.APPLICANT
+    baseline = interpreted(applicant_codec.APPLICANT_SCHEMA)
+    inputs = {'decode': applicants, 'encode_update': rows, 'encode_create': rows}
+
+    results = []
+    for name, records in inputs.items():
+        fast, slow = getattr(compiled, name), baseline[name]
+        assert all(fast(r) == slow(r) for r in records[:1000]), f"{name}: compiled and interpreted results differ"
+        rate, median = best_rate(fast, records, repeat)
+        base_rate, base_median = best_rate(slow, records, repeat)
+        results.append({
+            "name": name, "size": size,
+            "records_per_s": round(rate), "median_s": round(median, 6),
+            "interpreted_records_per_s": round(base_rate), "interpreted_median_s": round(base_median, 6),
+            "speedup": round(rate / base_rate, 2),
+        })
+        print(f"  {name:<14} n={size:<8} {rate:>12,.0f} rec/s   interpreted {base_rate:>12,.0f} rec/s"
+              f"   x{rate / base_rate:.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the applicant codec on synthetic batches")
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated batch sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per function (the best is reported)")
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"Converting {size} applicants")
+        report["results"].extend(run_size(size, args.repeat))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
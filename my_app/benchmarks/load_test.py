@@ -0,0 +1,194 @@
+"""
+Load-test driver that simulates concurrent recruiters using the portal.
+
+Each simulated recruiter logs in, then loops over weighted actions until the
+test duration is over:
+    browse  - GET /api/bootstrap, then GET /api/data?offset=...&version=... for the
+              rest of the list (what the main page loads)
+    edit    - PUT /api/data/<index> with a status change
+    filter  - POST /api/resume-filter (admins) or GET /api/analytics
+Reports throughput and p50/p95/p99 latency per operation.
+
+Usage (from my_app/, with the portal running against benchmarks.stub_api):
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --users 20 --duration 60 \\
+        --username admin --password secret --output load.json
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+SCENARIO_WEIGHTS = {"browse": 6, "edit": 2, "filter": 2}
+STATUS_CHOICES = ["Proceed Further", "On Hold", "Accepted", "Rejected", "In Notice"]
+FILTER_KEYWORDS = ["kubernetes", "terraform aws", "python", "selenium playwright", "sre prometheus"]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, operation, seconds, ok):
+        with self._lock:
+            self.latencies[operation].append(seconds)
+            if not ok:
+                self.errors[operation] += 1
+
+    def report(self, elapsed):
+        operations = {}
+        total = 0
+        for operation, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            total += len(values)
+            operations[operation] = {
+                "requests": len(values),
+                "errors": self.errors[operation],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            }
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "total_requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "operations": operations,
+        }
+
+
+class Recruiter(threading.Thread):
+    def __init__(self, number, args, recorder, deadline):
+        super().__init__(name=f"recruiter-{number}", daemon=True)
+        self.args = args
+        self.recorder = recorder
+        self.deadline = deadline
+        self.rng = random.Random(args.seed + number)
+        self.session = requests.Session()
+        self.candidates = []
+        self.is_admin = False
+
+    def timed(self, operation, method, path, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        response = None
+        try:
+            response = self.session.request(method, self.args.url + path, timeout=self.args.timeout, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            pass
+        self.recorder.record(operation, time.perf_counter() - start, ok)
+        return response
+
+    def login(self):
+        response = self.timed("login", "POST", "/login",
+                              data={"username": self.args.username, "password": self.args.password},
+                              allow_redirects=False)
+        return response is not None and response.status_code in (302, 303)
+
+    def browse(self):
+        response = self.timed("bootstrap", "GET", "/api/bootstrap")
+        if response is None or not response.ok:
+            return
+        body = response.json()
+        candidates = body.get("data", [])
+        self.is_admin = bool(body.get("is_admin"))
+        if body.get("total", 0) > len(candidates):
+            response = self.timed("get_data_rest", "GET", "/api/data",
+                                  params={"offset": len(candidates), "version": body.get("version")})
+            if response is None or not response.ok:
+                return
+            rest = response.json()
+            # A changed list comes back whole (offset 0)
+            candidates = candidates + rest.get("data", []) if rest.get("offset") else rest.get("data", [])
+        self.candidates = candidates
+
+    def edit(self):
+        if not self.candidates:
+            self.browse()
+            if not self.candidates:
+                return
+        index = self.rng.randrange(len(self.candidates))
+        payload = {
+            "Application Status": self.rng.choice(STATUS_CHOICES),
+            "_api_id": self.candidates[index].get("_api_id", ""),
+        }
+        self.timed("update_data", "PUT", f"/api/data/{index}", json=payload)
+
+    def filter(self):
+        if self.is_admin:
+            self.timed("resume_filter", "POST", "/api/resume-filter",
+                       json={"keyword": self.rng.choice(FILTER_KEYWORDS)})
+        else:
+            self.timed("analytics", "GET", "/api/analytics")
+
+    def run(self):
+        if not self.login():
+            return
+        self.browse()
+        actions = list(SCENARIO_WEIGHTS)
+        weights = [SCENARIO_WEIGHTS[a] for a in actions]
+        while time.time() < self.deadline:
+            getattr(self, self.rng.choices(actions, weights)[0])()
+            if self.args.think_ms:
+                time.sleep(self.rng.uniform(0, self.args.think_ms) / 1000.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent recruiters against the portal")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="portal base URL")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated recruiters")
+    parser.add_argument("--duration", type=float, default=30.0, help="test length in seconds")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which users are started")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="max random pause between actions")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args()
+    args.url = args.url.rstrip("/")
+
+    recorder = Recorder()
+    start = time.time()
+    deadline = start + args.ramp_up + args.duration
+    recruiters = [Recruiter(i, args, recorder, deadline) for i in range(args.users)]
+    for recruiter in recruiters:
+        recruiter.start()
+        if args.ramp_up:
+            time.sleep(args.ramp_up / args.users)
+    for recruiter in recruiters:
+        recruiter.join()
+
+    report = recorder.report(time.time() - start)
+    report["users"] = args.users
+    report["url"] = args.url
+
+    print(f"{report['total_requests']} requests in {report['elapsed_s']} s "
+          f"({report['throughput_rps']} req/s) with {args.users} users")
+    print(f"  {'operation':<18}{'reqs':>7}{'errs':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["operations"].items():
+        print(f"  {name:<18}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput_rps']:>9}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Smoke test of shared_cache.RedisBackend against a real Redis server.
+
+Checks GET/SET/DEL, SET NX (add), integer replies (INCR), PX expiry,
+reconnecting after the connection drops and SharedCache on top of the
+backend. Every key lives under a random prefix and is deleted afterwards.
+When no server answers at the URL the run is skipped (exit status 0).
+
+Usage (from my_app/):
+    python -m benchmarks.redis_smoke
+    python -m benchmarks.redis_smoke --url redis://:secret@127.0.0.1:6379/15
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+import shared_cache  # noqa: E402
+
+
+def server_available(backend):
+    try:
+        socket.create_connection((backend.host, backend.port), timeout=backend.timeout).close()
+    except OSError:
+        return False
+    return True
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return bool(condition)
+
+
+def run(backend, prefix):
+    results = []
+    key = prefix + "value"
+    counter = prefix + "counter"
+    expiring = prefix + "expiring"
+
+    results.append(check("get of a missing key is None", backend.get(key) is None))
+    backend.set(key, b"payload", 30)
+    results.append(check("set then get round-trips bytes", backend.get(key) == b"payload"))
+    backend.set(key, b"\x00\r\n binary", 30)
+    results.append(check("values with CR/LF and NUL survive", backend.get(key) == b"\x00\r\n binary"))
+
+    results.append(check("add claims a missing key", backend.add(prefix + "lock", b"1", 30) is True))
+    results.append(check("add leaves a held key alone", backend.add(prefix + "lock", b"2", 30) is False))
+    results.append(check("add did not overwrite", backend.get(prefix + "lock") == b"1"))
+
+    # The backend has no incr of its own; INCR checks the integer reply path
+    results.append(check("INCR returns integers", [backend._call("INCR", counter) for _ in range(3)] == [1, 2, 3]))
+
+    backend.set(expiring, b"soon gone", 0.2)
+    results.append(check("value is there before its TTL", backend.get(expiring) == b"soon gone"))
+    time.sleep(0.4)
+    results.append(check("value is gone after its TTL", backend.get(expiring) is None))
+
+    backend.delete(key)
+    results.append(check("delete removes the key", backend.get(key) is None))
+    backend.delete(key)
+    results.append(check("delete of a missing key is harmless", backend.get(key) is None))
+
+    # A dropped connection (server restart, idle timeout) is reopened once
+    backend.set(key, b"after reconnect", 30)
+    backend._local.sock.close()
+    results.append(check("reconnects after the connection drops", backend.get(key) == b"after reconnect"))
+
+    cache = shared_cache.SharedCache(backend, prefix=prefix)
+    calls = []
+    value = cache.get_or_compute("list", 30, lambda: calls.append(1) or {"rows": [1, 2]})
+    again = cache.get_or_compute("list", 30, lambda: calls.append(1) or {"rows": []})
+    results.append(check("SharedCache computes once and reuses the value",
+                         value == again == {"rows": [1, 2]} and len(calls) == 1))
+    before = cache.generation("list")
+    cache.invalidate("list")
+    results.append(check("invalidate drops the value and bumps the generation",
+                         cache.get("list") is None and cache.generation("list") != before))
+
+    for suffix in ("value", "counter", "expiring", "lock", "list", "list" + shared_cache.LOCK_SUFFIX,
+                   "list" + shared_cache.GENERATION_SUFFIX):
+        backend.delete(prefix + suffix)
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="redis://localhost:6379/0", help="Redis server to test against")
+    args = parser.parse_args()
+
+    backend = shared_cache.RedisBackend(args.url)
+    if not server_available(backend):
+        print(f"skipped: no Redis server at {backend.host}:{backend.port}")
+        return 0
+    prefix = f"portal-smoke:{os.urandom(4).hex()}:"
+    return 0 if run(backend, prefix) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Benchmark suite for the portal's hot paths.
+
+Generates synthetic workbooks/resumes (see synth.py) and times load_data
+(and the memory its rows retain), save_data, bitmap-indexed candidate
+filtering, /api/analytics, /api/resume-filter and the API<->portal record
+transforms (see also codec_bench.py), plus response compression (bytes on
+the wire and CPU time per encoding/level for the /api/data and
+/api/analytics payloads). Results are written as JSON so runs can be
+compared across commits.
+
+Usage (from my_app/):
+    python -m benchmarks.run_benchmarks --sizes 1000,10000 --resumes 500 --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --compare bench.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks import synth  # noqa: E402
+
+
+def time_call(func, repeat):
+    """Run func `repeat` times and return the wall-clock durations in seconds"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def traced_allocation(func):
+    """Call func and return (result, bytes still allocated by it afterwards)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, retained
+
+
+def summarize(name, size, runs, **extra):
+    result = {
+        "name": name,
+        "size": size,
+        "runs_s": [round(r, 6) for r in runs],
+        "median_s": round(statistics.median(runs), 6),
+        "min_s": round(min(runs), 6),
+    }
+    result.update(extra)
+    print(f"  {name:<28} n={size:<7} median={result['median_s'] * 1000:10.2f} ms  min={result['min_s'] * 1000:10.2f} ms")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Nothing listens here, so API-backed endpoints fall back to the scratch workbook
+OFFLINE_API_URL = "http://127.0.0.1:9"
+
+
+def load_app(workdir, api_url=OFFLINE_API_URL):
+    """
+    Import the Flask app with every file it writes (workbook, databases, caches)
+    under workdir, talking to `api_url` instead of the configured Guhatek API
+    """
+    os.environ.setdefault("APP_ENV", "development")
+    os.environ["GUHATEK_API_URL"] = api_url
+    os.environ["DEV_EXCEL_FILE"] = os.path.join(workdir, "data.xlsx")
+    os.environ["ANALYTICS_SNAPSHOT_DIR"] = os.path.join(workdir, "analytics")
+    os.environ["RESUME_INDEX_DB"] = os.path.join(workdir, "resume_index.db")
+    os.environ["STATUS_EVENTS_DB"] = os.path.join(workdir, "status_events.db")
+    os.environ["REPORT_SNAPSHOT_FILE"] = os.path.join(workdir, "report_snapshot.json")
+    os.environ["CACHE_BACKEND"] = "memory"
+    os.environ["API_DEBUG_LOG"] = os.path.join(workdir, "api_debug.log")
+    import app as portal
+
+    portal.app.config["UPLOAD_FOLDER"] = os.path.join(workdir, "resumes")
+    client = portal.app.test_client()
+    with client.session_transaction() as sess:
+        sess["logged_in"] = True
+        sess["username"] = "bench"
+        sess["is_admin"] = True
+    return portal, client
+
+
+def use_workbook(portal, path):
+    """Point app.py at `path` and apply the schema migration outside the timed region"""
+    portal.EXCEL_FILE = path
+    portal._schema_checked = False
+    portal.migrate_excel_schema()
+
+
+def run_size(portal, client, workdir, size, resumes, repeat, keyword):
+    results = []
+    rows = synth.generate_candidates(size)
+    resume_dir = portal.app.config["UPLOAD_FOLDER"]
+    resume_count = min(resumes, size)
+    if resume_count:
+        synth.write_resume_corpus(resume_dir, resume_count, candidates=rows)
+
+    path = os.path.join(workdir, f"data_{size}.xlsx")
+    synth.write_workbook(path, rows)
+    use_workbook(portal, path)
+
+    load_runs = time_call(portal.load_data, repeat)
+    loaded, memory_bytes = traced_allocation(portal.load_data)
+    results.append(summarize("load_data", size, load_runs, memory_bytes=memory_bytes))
+    print(f"  {'load_data memory':<28} n={size:<7} {memory_bytes / 1024 / 1024:10.2f} MiB retained")
+    results.append(summarize("save_data", size, time_call(lambda: portal.save_data(loaded), repeat)))
+
+    table = portal.candidate_table.CandidateTable(loaded)
+    results.append(summarize("candidate_table_build", size,
+                             time_call(lambda: portal.candidate_table.CandidateTable(loaded), repeat)))
+
+    def filter_candidates():
+        # status OR (position AND location), plus the facet counts of the selection
+        selection = table.match({"or": [{"status": ["On Hold", "Rejected"]},
+                                        {"and": [{"position": "DevOps Engineer"}, {"location": "Chennai"}]}]})
+        table.facets(selection)
+        return table.count(selection)
+
+    results.append(summarize("candidate_filter", size, time_call(filter_candidates, repeat)))
+
+    def export_candidates(export_format):
+        # Full export through the streamed endpoint, read to the end
+        response = client.get(f"/api/candidates/export?format={export_format}")
+        assert response.status_code == 200, response.data[:200]
+        return len(response.data)
+
+    results.append(summarize("export_csv", size, time_call(lambda: export_candidates("csv"), repeat)))
+    # openpyxl's writer is slow enough that one run per size is plenty
+    results.append(summarize("export_xlsx", size, time_call(lambda: export_candidates("xlsx"), 1)))
+
+    def analytics(query=""):
+        response = client.get(f"/api/analytics{query}")
+        assert response.status_code == 200, response.data[:200]
+
+    results.append(summarize("get_analytics_data", size, time_call(analytics, repeat)))
+    results.append(summarize("get_analytics_data_year", size, time_call(lambda: analytics("?year=2025"), repeat)))
+
+    def analytics_after_write():
+        # A changed workbook: reload, reuse closed-month snapshots, re-summarize the live month
+        os.utime(path)
+        analytics()
+
+    results.append(summarize("get_analytics_data_rebuild", size, time_call(analytics_after_write, repeat)))
+
+    if resume_count:
+        def resume_filter():
+            response = client.post("/api/resume-filter", json={"keyword": keyword})
+            assert response.status_code == 200, response.data[:200]
+
+        results.append(summarize("filter_resumes", size, time_call(resume_filter, repeat), resumes=resume_count))
+
+    applicants = synth.generate_api_applicants(size)
+
+    def api_to_portal():
+        return [portal.api_applicant_to_portal(a) for a in applicants if portal.has_required_api_fields(a)]
+
+    results.append(summarize("api_to_portal", size, time_call(api_to_portal, repeat)))
+
+    codec = portal.applicant_codec.APPLICANT
+
+    def portal_to_api():
+        return [codec.encode_update(r) for r in rows]
+
+    results.append(summarize("portal_to_api", size, time_call(portal_to_api, repeat)))
+    results.append(summarize("portal_to_api_create", size,
+                             time_call(lambda: [codec.encode_create(r) for r in rows], repeat)))
+    results.extend(compression_benchmarks(portal, client, size, repeat))
+    return results
+
+
+# (encoding, level) pairs measured by compression_benchmarks; brotli only if installed
+COMPRESSION_SETTINGS = (("gzip", 1), ("gzip", 6), ("gzip", 9), ("br", 4), ("br", 5), ("br", 11))
+
+
+def compression_benchmarks(portal, client, size, repeat):
+    """Compressed size and compression time of the /api/data and /api/analytics bodies"""
+    import compression
+
+    results = []
+    applicants = synth.generate_api_applicants(size)
+    with portal.app.app_context():
+        data_body = portal.app.json.dumps({
+            "status": "success",
+            "data": [portal.api_applicant_to_portal(a) for a in applicants if portal.has_required_api_fields(a)],
+            "is_admin": True,
+        }).encode("utf-8")
+    analytics_body = client.get("/api/analytics", headers={"Accept-Encoding": "identity"}).get_data()
+
+    for payload, body in (("api_data", data_body), ("api_analytics", analytics_body)):
+        for encoding, level in COMPRESSION_SETTINGS:
+            if encoding not in compression.available_encodings():
+                continue
+            compressed = compression.compress(body, encoding, level)
+            runs = time_call(lambda: compression.compress(body, encoding, level), repeat)
+            results.append(summarize(
+                f"compress_{payload}_{encoding}{level}", size, runs,
+                bytes_uncompressed=len(body), bytes_on_wire=len(compressed),
+                ratio=round(len(body) / len(compressed), 2),
+            ))
+            print(f"  {'':<28} {len(body):>12,} -> {len(compressed):>10,} bytes (x{len(body) / len(compressed):.1f})")
+    return results
+
+
+def compare(current, baseline_path):
+    """Print median ratios against a previous results file (>1.0 means slower now)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    print(f"\nComparison with {baseline_path} (commit {baseline.get('commit')}):")
+    for result in current["results"]:
+        old = previous.get((result["name"], result["size"]))
+        if not old or not old["median_s"]:
+            continue
+        ratio = result["median_s"] / old["median_s"]
+        flag = "  REGRESSION" if ratio > 1.2 else ""
+        print(f"  {result['name']:<28} n={result['size']:<7} {old['median_s'] * 1000:10.2f} -> "
+              f"{result['median_s'] * 1000:10.2f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark portal hot paths on synthetic data")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated candidate counts (e.g. 1000,10000,100000)")
+    parser.add_argument("--resumes", type=int, default=200, help="resume PDFs to generate per size (0 skips filter_resumes)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--keyword", default="kubernetes terraform python", help="resume filter query")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    parser.add_argument("--workdir", help="scratch directory (default: a temporary directory)")
+    parser.add_argument("--api-url", default=OFFLINE_API_URL,
+                        help="Guhatek API to use, e.g. the local stub (default: none, so the workbook is used)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    workdir = args.workdir or tempfile.mkdtemp(prefix="portal-bench-")
+    os.makedirs(os.path.join(workdir, "resumes"), exist_ok=True)
+
+    portal, client = load_app(workdir, args.api_url)
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for size in sizes:
+        print(f"Benchmarking {size} candidates (workdir {workdir})")
+        report["results"].extend(run_size(portal, client, workdir, size, args.resumes, args.repeat, args.keyword))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Local stand-in for the Guhatek applicant API.
+
+Implements the endpoints the portal calls (GET /api/token, GET/POST
+/api/applications, PATCH /api/applications/<id>) over an in-memory
+synthetic dataset, with configurable latency and error injection.
+
+Usage (from my_app/):
+    python -m benchmarks.stub_api --size 5000 --latency-ms 80 --jitter-ms 40 --error-rate 0.02 --port 5050
+
+Then start the portal against it:
+    GUHATEK_API_URL=http://127.0.0.1:5050 python app.py
+"""
+
+import argparse
+import json
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import Flask, jsonify, request
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks import synth  # noqa: E402
+
+# camelCase request fields -> snake_case record fields (as returned by the real API)
+API_FIELD_NAMES = {
+    "fullName": "full_name",
+    "email": "email",
+    "contactNumber": "contact_number",
+    "linkedinProfile": "linkedin_profile",
+    "interestedPosition": "interested_position",
+    "currentRole": "currentrole",
+    "currentOrganization": "current_organisation",
+    "totalExperience": "total_experience",
+    "currentLocation": "current_location",
+    "locationPreference": "location_preference",
+    "currentCTC": "current_ctc",
+    "expectedCTC": "expected_ctc",
+    "noticePeriod": "notice_period",
+    "currentlyInNotice": "currently_noticeperiod",
+    "immediateJoiner": "immediate_joiner",
+    "otherOffersInHand": "other_offer_in_hand",
+    "offeredCTC": "offered_ctc",
+    "certifications": "certifications",
+    "referredBy": "referred_by",
+    "additionalInfo": "additional_info",
+    "submittedAt": "submitted_at",
+    "initialScreening": "initial_screening",
+    "round1Dt": "round1_dt",
+    "round1Feedback": "round1_feedback",
+    "round2Dt": "round2_dt",
+    "round2Feedback": "round2_feedback",
+    "offeredPosition": "offered_position",
+    "joiningDate": "joining_date",
+    "rejectMailSent": "reject_mail_sent",
+    "screenedBy": "screened_by",
+    "interviewStatus": "interview_status",
+    "applicationStatus": "application_status",
+}
+
+
+def create_stub_app(size=1000, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=42, api_key=None):
+    """Build the stub Flask app; all knobs can also be changed at runtime via POST /_stub/config"""
+    app = Flask(__name__)
+    settings = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate}
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    records = {a["id"]: a for a in synth.generate_api_applicants(size, seed)}
+    records_lock = threading.Lock()
+    tokens = set()
+    stats = {"token": 0, "list": 0, "create": 0, "patch": 0, "errors": 0}
+
+    def _simulate():
+        """Sleep for the configured latency and decide whether to inject a failure"""
+        with rng_lock:
+            delay = settings["latency_ms"] + rng.uniform(0, settings["jitter_ms"])
+            fail = rng.random() < settings["error_rate"]
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if fail:
+            stats["errors"] += 1
+            return jsonify({"success": False, "message": "Injected upstream error"}), 503
+        return None
+
+    def _authorized():
+        header = request.headers.get("Authorization", "")
+        return header.startswith("Bearer ") and header[len("Bearer "):] in tokens
+
+    @app.route("/api/token", methods=["GET"])
+    def token():
+        stats["token"] += 1
+        if api_key and request.headers.get("x-api-key") != api_key:
+            return jsonify({"success": False, "message": "Invalid API key"}), 401
+        failure = _simulate()
+        if failure:
+            return failure
+        value = secrets.token_hex(16)
+        tokens.add(value)
+        return jsonify({"token": value})
+
+    @app.route("/api/applications", methods=["GET"])
+    def list_applications():
+        stats["list"] += 1
+        if not _authorized():
+            return jsonify({"success": False, "message": "Unauthorized"}), 401
+        failure = _simulate()
+        if failure:
+            return failure
+        with records_lock:
+            data = list(records.values())
+        return jsonify({"success": True, "data": data})
+
+    @app.route("/api/applications", methods=["POST"])
+    def create_application():
+        stats["create"] += 1
+        if not _authorized():
+            return jsonify({"success": False, "message": "Unauthorized"}), 401
+        failure = _simulate()
+        if failure:
+            return failure
+        try:
+            payload = json.loads(request.form.get("applicationData", "{}"))
+        except ValueError:
+            return jsonify({"success": False, "message": "applicationData must be JSON"}), 400
+        resume = request.files.get("file")
+        if resume is None:
+            return jsonify({"success": False, "message": "Resume file is required"}), 400
+        # Drain the upload so the client sees realistic transfer time
+        size = 0
+        for chunk in iter(lambda: resume.stream.read(64 * 1024), b""):
+            size += len(chunk)
+
+        record = {API_FIELD_NAMES.get(k, k): v for k, v in payload.items()}
+        record["id"] = str(uuid.uuid4())
+        record["resume_url"] = f"https://files.example.com/resumes/{record['id']}.pdf"
+        record.setdefault("submitted_at", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z"))
+        with records_lock:
+            records[record["id"]] = record
+        return jsonify({"success": True, "data": {"id": record["id"], "resume_bytes": size}}), 201
+
+    @app.route("/api/applications/<applicant_id>", methods=["PATCH"])
+    def patch_application(applicant_id):
+        stats["patch"] += 1
+        if not _authorized():
+            return jsonify({"success": False, "message": "Unauthorized"}), 401
+        failure = _simulate()
+        if failure:
+            return failure
+        changes = request.get_json(silent=True) or {}
+        with records_lock:
+            record = records.get(applicant_id)
+            if record is None:
+                return jsonify({"success": False, "message": "Applicant not found"}), 404
+            for key, value in changes.items():
+                record[API_FIELD_NAMES.get(key, key)] = value
+            updated = dict(record)
+        return jsonify({"success": True, "updated": updated})
+
+    @app.route("/_stub/config", methods=["GET", "POST"])
+    def stub_config():
+        """Inspect or change latency/error settings while a load test is running"""
+        if request.method == "POST":
+            for key, value in (request.get_json(silent=True) or {}).items():
+                if key in settings:
+                    settings[key] = float(value)
+        with records_lock:
+            count = len(records)
+        return jsonify({"settings": settings, "records": count, "requests": stats})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Guhatek API stand-in")
+    parser.add_argument("--size", type=int, default=1000, help="number of synthetic applicants")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="base latency added to every call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra uniform random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with 503")
+    parser.add_argument("--api-key", default=None, help="require this x-api-key on /api/token")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    args = parser.parse_args()
+
+    app = create_stub_app(args.size, args.latency_ms, args.jitter_ms, args.error_rate, args.seed, args.api_key)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
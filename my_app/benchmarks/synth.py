@@ -0,0 +1,266 @@
+"""
+Synthetic candidate and resume generators for benchmarks.
+
+Everything is seeded, so the same size and seed always produce the same
+corpus and results can be compared across commits.
+
+Usage (from my_app/):
+    python -m benchmarks.synth --rows 10000 --excel /tmp/data.xlsx
+    python -m benchmarks.synth --resumes 2000 --resume-dir /tmp/resumes
+"""
+
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Arjun", "Bhavna", "Chetan", "Deepa", "Dev", "Esha", "Farhan", "Gauri",
+    "Harish", "Isha", "Jai", "Kavya", "Lakshmi", "Manoj", "Nisha", "Omkar", "Priya", "Rahul",
+    "Sneha", "Tarun", "Uma", "Varun", "Yamini", "Zoya",
+]
+LAST_NAMES = [
+    "Iyer", "Sharma", "Reddy", "Nair", "Menon", "Gupta", "Patel", "Rao", "Das", "Khan",
+    "Singh", "Verma", "Pillai", "Joshi", "Kulkarni", "Bose",
+]
+POSITIONS = [
+    "Site Reliability Engineer", "Senior Site Reliability Engineer", "Lead Site Reliability Engineer",
+    "Application Site Reliability Engineer", "Security Operations Centre Engineer", "Performance Engineer",
+    "QA Automation Engineer (Playwright & Selenium)", "DevOps Engineer", "Lead SAP Engineer",
+    "AI/ML Engineer", "AI/ML Intern", "Internship", "Fresher",
+]
+ROLES = [
+    "Software Engineer", "Senior Software Engineer", "Lead Engineer", "Engineering Manager", "Architect",
+    "QA Engineer", "DevOps Engineer", "Data Engineer", "Data Scientist", "Product Manager", "UI/UX Designer",
+]
+LOCATIONS = ["Bangalore", "Chennai", "Coimbatore", "Others"]
+EXPERIENCE = ["0-1 years", "1-2 years", "2-3 years"]
+NOTICE_PERIODS = ["Immediate", "15 days", "30 days", "60 days", "90 days"]
+INTERVIEW_STATUSES = [
+    "Applied", "Profile Screening Comp", "Voice Screening Comp", "Tech Inter Sched", "Tech Inter Comp",
+    "Code Inter Sched", "Code Inter Comp", "HR Inter Sched", "HR Inter Comp", "Offer",
+    "Pending Final Noti", "References", "All Completed",
+]
+APPLICATION_STATUSES = [
+    "Proceed Further", "On Hold", "No Resp Call/Email", "Did Not Join", "Sent", "Recieved",
+    "In Notice", "Accepted", "Rejected", "Joined",
+]
+SCREENERS = ["", "", "", "recruiter1", "recruiter2", "recruiter3", "hr.lead"]
+SKILLS = [
+    "python", "java", "go", "golang", "kubernetes", "k8s", "docker", "terraform", "ansible", "aws",
+    "azure", "gcp", "linux", "prometheus", "grafana", "jenkins", "git", "sql", "postgresql", "kafka",
+    "react", "selenium", "playwright", "jmeter", "sap", "pytorch", "tensorflow", "splunk", "elk", "bash",
+]
+FILLER = [
+    "Designed and operated highly available services for a large customer base.",
+    "Improved deployment frequency by automating release pipelines.",
+    "Led incident response and wrote blameless postmortems.",
+    "Mentored junior engineers and ran internal knowledge sharing sessions.",
+    "Reduced infrastructure cost by right sizing compute and storage.",
+    "Built dashboards and alerting for latency, traffic, errors and saturation.",
+    "Collaborated with product teams to define service level objectives.",
+]
+
+
+def generate_candidates(count, seed=42, start_date=datetime(2024, 1, 1), end_date=datetime(2026, 1, 1)):
+    """
+    Return `count` candidate dicts keyed by the portal's Excel column names,
+    applied between start_date and end_date. The dates are fixed so that the
+    same seed gives the same rows on every run
+    """
+    rng = random.Random(seed)
+    span_days = max((end_date - start_date).days, 1)
+    rows = []
+    for i in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        applied = start_date + timedelta(days=rng.randrange(span_days), seconds=rng.randrange(86400))
+        status = rng.choice(APPLICATION_STATUSES)
+        screened_by = rng.choice(SCREENERS)
+        rows.append({
+            "Date": applied.strftime("%Y-%m-%d %H:%M:%S"),
+            "Name": f"{first} {last}",
+            "Email ID": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "Contact Number": f"9{rng.randrange(10**8, 10**9)}",
+            "LinkedIn Profile": f"https://linkedin.com/in/{first.lower()}{last.lower()}{i}",
+            "Resume": "",
+            "Interested Position": rng.choice(POSITIONS),
+            "Current Role": rng.choice(ROLES),
+            "Current Organization": f"Company {rng.randrange(500)}",
+            "Total Years of Experience": rng.choice(EXPERIENCE),
+            "Current Location": rng.choice(LOCATIONS),
+            "Location Preference": rng.choice(LOCATIONS),
+            "Current CTC per Annum": str(rng.randrange(300, 3000) * 1000),
+            "Expected CTC per Annum": str(rng.randrange(400, 4000) * 1000),
+            "Notice Period": rng.choice(NOTICE_PERIODS),
+            "In Notice": rng.choice(["Yes", "No"]),
+            "Immediate Joiner": rng.choice(["Yes", "No"]),
+            "Offers in Hand": rng.choice(["Yes", "No"]),
+            "Offered CTC": str(rng.randrange(500, 4000) * 1000) if status in ("Accepted", "Joined", "In Notice") else "",
+            "Certifications": rng.choice(["", "AWS Certified Developer", "CKA", "Terraform Associate"]),
+            "Referred By": rng.choice(["", "Employee Referral", "Job Portal", "Campus Recruitment"]),
+            "Interview Status": rng.choice(INTERVIEW_STATUSES),
+            "Application Status": status,
+            "Remarks": rng.choice(["", "Good communication skills", "Needs follow-up"]),
+            "Initial Screening": "Screened, proceed" if screened_by else "",
+            "Round 1 D and T": "",
+            "Round 1 Remarks": "",
+            "Round 2 D and T": "",
+            "Round 2 Remarks": "",
+            "Offered Position": "",
+            "Joining Date": "",
+            "Reject Mail Sent": "Yes" if status == "Rejected" else "No",
+            "Screened By": screened_by,
+        })
+    return rows
+
+
+def generate_api_applicants(count, seed=42):
+    """Return `count` records shaped like the Guhatek /api/applications response"""
+    rng = random.Random(seed)
+    applicants = []
+    for i, row in enumerate(generate_candidates(count, seed)):
+        applicants.append({
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "submitted_at": row["Date"].replace(" ", "T") + ".000Z",
+            "full_name": row["Name"],
+            "email": row["Email ID"],
+            "contact_number": row["Contact Number"],
+            "linkedin_profile": row["LinkedIn Profile"],
+            "resume_url": f"https://files.example.com/resumes/{i}.pdf",
+            "interested_position": row["Interested Position"],
+            "currentrole": row["Current Role"],
+            "current_organisation": row["Current Organization"],
+            "total_experience": rng.randrange(0, 15),
+            "current_location": row["Current Location"],
+            "location_preference": row["Location Preference"],
+            "current_ctc": int(row["Current CTC per Annum"]),
+            "expected_ctc": int(row["Expected CTC per Annum"]),
+            "notice_period": row["Notice Period"],
+            "currently_noticeperiod": row["In Notice"] == "Yes",
+            "immediate_joiner": row["Immediate Joiner"] == "Yes",
+            "other_offer_in_hand": row["Offers in Hand"] == "Yes",
+            "offered_ctc": int(row["Offered CTC"]) if row["Offered CTC"] else None,
+            "certifications": row["Certifications"] or None,
+            "referred_by": row["Referred By"] or None,
+            "interview_status": row["Interview Status"],
+            "application_status": row["Application Status"],
+            "initial_screening": row["Initial Screening"] or None,
+            "round1_dt": None,
+            "round1_feedback": None,
+            "round2_dt": None,
+            "round2_feedback": None,
+            "offered_position": None,
+            "joining_date": None,
+            "reject_mail_sent": row["Reject Mail Sent"] == "Yes",
+            "additional_info": row["Remarks"] or None,
+            "screened_by": row["Screened By"] or None,
+        })
+    return applicants
+
+
+def write_workbook(path, rows, sheet_name="Candidates", headers=None):
+    """Write candidate rows to an .xlsx file (write-only mode, so 100k rows stay cheap)"""
+    import openpyxl
+
+    if headers is None:
+        # generate_candidates() already yields keys in EXCEL_HEADERS order
+        headers = list(rows[0]) if rows else ["Date", "Name"]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet(sheet_name)
+    sheet.append(list(headers))
+    for row in rows:
+        sheet.append([row.get(h, "") for h in headers])
+    wb.save(path)
+    wb.close()
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, lines):
+    """Write a single-page PDF whose text layer contains `lines` (Helvetica, no extra dependency)"""
+    content = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+    for line in lines:
+        content.append(f"({_pdf_escape(line)}) Tj T*")
+    content.append("ET")
+    stream = "\n".join(content).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def resume_lines(rng, name, position):
+    skills = rng.sample(SKILLS, rng.randrange(4, 12))
+    lines = [name, position, "", "Skills: " + ", ".join(skills), "", "Experience"]
+    for _ in range(rng.randrange(8, 40)):
+        sentence = rng.choice(FILLER)
+        if rng.random() < 0.5:
+            sentence += f" Used {rng.choice(skills)} and {rng.choice(skills)} daily."
+        lines.append(sentence)
+    return lines
+
+
+def write_resume_corpus(directory, count, seed=42, candidates=None):
+    """
+    Write `count` text-bearing resume PDFs into `directory`.
+
+    When `candidates` is given, the first `count` rows get their 'Resume'
+    column pointed at the generated file.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for i in range(count):
+        if candidates and i < len(candidates):
+            name, position = candidates[i]["Name"], candidates[i]["Interested Position"]
+        else:
+            name, position = f"Candidate {i}", rng.choice(POSITIONS)
+        filename = f"synthetic_resume_{i}.pdf"
+        write_text_pdf(os.path.join(directory, filename), resume_lines(rng, name, position))
+        if candidates and i < len(candidates):
+            candidates[i]["Resume"] = filename
+        filenames.append(filename)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic candidate workbooks and resume PDFs")
+    parser.add_argument("--rows", type=int, default=1000, help="candidate rows to generate")
+    parser.add_argument("--excel", help="write the rows to this .xlsx path")
+    parser.add_argument("--resumes", type=int, default=0, help="resume PDFs to generate")
+    parser.add_argument("--resume-dir", default="synthetic_resumes", help="directory for resume PDFs")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = generate_candidates(args.rows, args.seed)
+    if args.resumes:
+        write_resume_corpus(args.resume_dir, args.resumes, args.seed, rows)
+        print(f"Wrote {args.resumes} resumes to {args.resume_dir}")
+    if args.excel:
+        write_workbook(args.excel, rows)
+        print(f"Wrote {len(rows)} rows to {args.excel}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Bulk candidate import.
+
+An import is a CSV or XLSX sheet of candidates (one row each, columns named
+like the workbook's) plus an optional ZIP of resumes referenced by file
+name from the 'Resume' column. The app validates every row before anything
+is written (read_rows, validate_rows), stores the resumes and appends all
+rows to the workbook in a single save. Only then does a background job
+create the applicants upstream through create_all(), so an interrupted
+import never leaves applicants upstream that the workbook does not have.
+
+create_all() runs the upstream calls on a bounded thread pool behind a
+token-bucket RateLimiter, so a campus drive of a few hundred candidates
+takes a few seconds of API time instead of one call after another, without
+bursting past what the API tolerates.
+"""
+
+import csv
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import candidates
+import duplicates
+
+REQUIRED_FIELDS = ('Name', 'Email ID', 'Contact Number')
+
+# Header spellings accepted besides the workbook's own (compared case- and space-insensitively)
+HEADER_ALIASES = {
+    'email': 'Email ID',
+    'phone': 'Contact Number',
+    'mobile': 'Contact Number',
+    'fullname': 'Name',
+    'linkedin': 'LinkedIn Profile',
+    'position': 'Interested Position',
+    'location': 'Current Location',
+    'experience': 'Total Years of Experience',
+}
+_HEADERS = {re.sub(r'\s+', '', field).lower(): field for field in candidates.FIELDS}
+_HEADERS.update(HEADER_ALIASES)
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+class ImportFileError(ValueError):
+    """The uploaded sheet or archive cannot be read at all"""
+
+
+def portal_field(header):
+    """Workbook field named by a sheet header, or None"""
+    return _HEADERS.get(re.sub(r'\s+', '', str(header or '')).lower())
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Phone numbers typed into Excel come back as 9876543210.0
+        value = int(value)
+    return str(value).strip()
+
+
+def read_rows(stream, filename, max_rows=None):
+    """
+    Rows of an uploaded sheet as portal-field dicts.
+
+    Args:
+        stream: binary file object with the upload
+        filename: client filename; its extension picks the format (.csv or .xlsx)
+        max_rows: reject sheets with more data rows than this
+
+    Returns:
+        (rows, ignored headers): rows are [(sheet row number, {field: value}), ...],
+        blank rows skipped
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        raw_rows = csv.reader(text)
+    elif extension == '.xlsx':
+        import openpyxl
+        try:
+            wb = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFileError(f"Could not read {filename}: {e}") from e
+        raw_rows = wb.worksheets[0].iter_rows(values_only=True)
+    else:
+        raise ImportFileError("The candidate sheet must be a .csv or .xlsx file")
+
+    try:
+        headers = next(raw_rows, None)
+        if not headers:
+            raise ImportFileError("The candidate sheet is empty")
+        fields = [portal_field(header) for header in headers]
+        ignored = [str(header) for header, field in zip(headers, fields) if header and field is None]
+        if not any(field in REQUIRED_FIELDS for field in fields):
+            raise ImportFileError("No Name, Email ID or Contact Number column found in the header row")
+
+        rows = []
+        for row_number, raw in enumerate(raw_rows, 2):
+            record = {}
+            for field, value in zip(fields, raw):
+                if field and field not in record:
+                    value = _cell(value)
+                    if value:
+                        record[field] = value
+            if not record:
+                continue
+            if max_rows and len(rows) >= max_rows:
+                raise ImportFileError(f"The candidate sheet has more than {max_rows} rows")
+            rows.append((row_number, record))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Could not read {filename}: {e}") from e
+    return rows, ignored
+
+
+class ResumeArchive:
+    """
+    Resumes in an uploaded ZIP, looked up by file name (case-insensitive,
+    directories ignored).
+
+    Args:
+        stream: seekable binary file object with the ZIP
+        max_bytes: largest accepted resume (uncompressed)
+    """
+
+    def __init__(self, stream, max_bytes=None):
+        try:
+            self.zip = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile as e:
+            raise ImportFileError(f"The resume archive is not a valid ZIP file: {e}") from e
+        self.max_bytes = max_bytes
+        self.members = {}
+        for info in self.zip.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name or name.startswith('.'):
+                continue
+            self.members.setdefault(name.lower(), info)
+
+    def find(self, name):
+        return self.members.get(os.path.basename(str(name or '')).lower())
+
+    def problem(self, name):
+        """Why the resume `name` cannot be imported, or None"""
+        info = self.find(name)
+        if info is None:
+            return f"Resume '{name}' is not in the archive"
+        if not info.filename.lower().endswith('.pdf'):
+            return f"Resume '{name}' is not a PDF"
+        if self.max_bytes and info.file_size > self.max_bytes:
+            return f"Resume '{name}' is larger than {self.max_bytes // (1024 * 1024)} MB"
+        return None
+
+    def open(self, name):
+        return self.zip.open(self.find(name))
+
+    def close(self):
+        self.zip.close()
+
+
+def validate_rows(rows, existing, archive=None, default_country_code="91"):
+    """
+    Check every row before anything is stored.
+
+    Args:
+        rows: [(row number, record), ...] from read_rows()
+        existing: DuplicateIndex of the workbook rows
+        archive: ResumeArchive, or None when no ZIP was uploaded
+
+    Returns:
+        {row number: {"errors": [...],
+                      "duplicates": {existing row index: [matched field, ...]},
+                      "duplicate_rows": [earlier sheet row number, ...]}}
+    """
+    within = duplicates.DuplicateIndex(default_country_code=default_country_code)
+    report = {}
+    for position, (row_number, record) in enumerate(rows):
+        errors = [f"{field} is required" for field in REQUIRED_FIELDS if not record.get(field)]
+        email = record.get('Email ID')
+        if email and not _EMAIL.match(email):
+            errors.append(f"Invalid email address: {email}")
+        if record.get('Contact Number') and not duplicates.normalize_phone(record['Contact Number'], default_country_code):
+            errors.append(f"Invalid contact number: {record['Contact Number']}")
+        resume = record.get('Resume')
+        if resume:
+            if archive is None:
+                errors.append(f"Resume '{resume}' given but no resume archive was uploaded")
+            else:
+                problem = archive.problem(resume)
+                if problem:
+                    errors.append(problem)
+        report[row_number] = {
+            "errors": errors,
+            "duplicates": existing.find(record),
+            "duplicate_rows": [rows[earlier][0] for earlier in within.find(record)],
+        }
+        within.add(position, record)
+    return report
+
+
+class RateLimiter:
+    """
+    Token bucket shared by worker threads: acquire() blocks until a call may
+    start. `rate` calls per second on average, bursts of up to `burst`.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def create_all(items, create, max_workers=4, rate=5.0, burst=None, on_result=None):
+    """
+    Call create(item) for every item on at most `max_workers` threads, no
+    faster than `rate` calls per second. on_result(position, result), if
+    given, is called on the worker thread as each call finishes.
+
+    Returns:
+        [create(item) result or the exception it raised, ...] in item order
+    """
+    limiter = RateLimiter(rate, burst or max_workers)
+
+    def run(position, item):
+        limiter.acquire()
+        try:
+            result = create(item)
+        except Exception as e:
+            result = e
+        if on_result is not None:
+            on_result(position, result)
+        return result
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))),
+                            thread_name_prefix="bulk-import") as pool:
+        return list(pool.map(run, range(len(items)), items))
@@ -0,0 +1,203 @@
+"""
+Columnar candidate table with bitmap indexes.
+
+For each filterable column the table keeps one code per row (an array of
+small ints into that column's distinct values) and, per distinct value, a
+bitmap of the rows holding it. Bitmaps are Python ints, bit i set for row
+i, so a filter such as
+
+    status in (On Hold, Rejected) AND position = DevOps Engineer
+
+is two ORs and one AND over machine words, and the size of any selection
+is a popcount. Facet counts are one AND + popcount per distinct value.
+None of this touches the candidate records themselves.
+"""
+
+from array import array
+
+# Short names accepted wherever a field is expected -> indexed field
+FILTER_PARAMS = {
+    'status': 'Application Status',
+    'interview_status': 'Interview Status',
+    'position': 'Interested Position',
+    'location': 'Current Location',
+    'notice_period': 'Notice Period',
+    'screened_by': 'Screened By',
+}
+INDEXED_FIELDS = tuple(FILTER_PARAMS.values())
+
+
+def _value(record, field):
+    return str(record.get(field, '') or '').strip()
+
+
+def _bitmap(rows, size):
+    """Bitmap with the bits of `rows` set; built through a bytearray to stay linear"""
+    bits = bytearray((size + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def iter_rows(bitmap, offset=0, limit=None):
+    """Row numbers set in `bitmap`, ascending, skipping `offset` and stopping after `limit`"""
+    if limit is not None and limit <= 0:
+        return
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    seen = 0
+    emitted = 0
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        base = byte_index << 3
+        while byte:
+            low = byte & -byte
+            if seen >= offset:
+                yield base + low.bit_length() - 1
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+            seen += 1
+            byte ^= low
+
+
+class CandidateTable:
+    """
+    Bitmap-indexed view over a list of candidate records.
+
+    Args:
+        records: candidate mappings (rows keep their list position as their index)
+        fields: columns to index
+    """
+
+    def __init__(self, records, fields=INDEXED_FIELDS):
+        self.rows = list(records)
+        self.fields = tuple(fields)
+        self.size = len(self.rows)
+        self.values = {}    # field -> [distinct value, ...] (code -> value)
+        self.columns = {}   # field -> array of codes, one per row
+        self.bitmaps = {}   # field -> {value: bitmap}
+        self._codes = {}    # field -> {value: code}
+        for field in self.fields:
+            codes = {}
+            column = array('I')
+            members = []
+            for row, record in enumerate(self.rows):
+                value = _value(record, field)
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(members)
+                    members.append([])
+                column.append(code)
+                members[code].append(row)
+            self._codes[field] = codes
+            self.values[field] = list(codes)
+            self.columns[field] = column
+            self.bitmaps[field] = {value: _bitmap(members[code], self.size) for value, code in codes.items()}
+
+    @property
+    def all(self):
+        return (1 << self.size) - 1
+
+    def _code(self, field, value):
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.values[field])
+            self.values[field].append(value)
+            self.bitmaps[field][value] = 0
+        return code
+
+    def append(self, record):
+        """Add a row at the end (the next list index)"""
+        row = self.size
+        self.rows.append(record)
+        self.size += 1
+        for field in self.fields:
+            value = _value(record, field)
+            self.columns[field].append(self._code(field, value))
+            self.bitmaps[field][value] |= 1 << row
+
+    def update_row(self, row, record):
+        """Re-index row `row` after its record changed"""
+        self.rows[row] = record
+        bit = 1 << row
+        for field in self.fields:
+            old = self.values[field][self.columns[field][row]]
+            new = _value(record, field)
+            if old == new:
+                continue
+            self.bitmaps[field][old] &= ~bit
+            self.columns[field][row] = self._code(field, new)
+            self.bitmaps[field][new] |= bit
+
+    def value(self, row, field):
+        return self.values[field][self.columns[field][row]]
+
+    def where(self, field, values):
+        """Rows whose `field` (or its FILTER_PARAMS name) is any of `values` ('' matches empty cells)"""
+        field = FILTER_PARAMS.get(field, field)
+        if field not in self.bitmaps:
+            raise ValueError(f"Unknown filter field: {field}")
+        bitmaps = self.bitmaps[field]
+        result = 0
+        for value in values:
+            result |= bitmaps.get(str(value or '').strip(), 0)
+        return result
+
+    def select(self, filters):
+        """AND across fields, OR within a field: {field: [value, ...]}"""
+        result = self.all
+        for field, values in filters.items():
+            result &= self.where(field, values)
+        return result
+
+    def match(self, expression):
+        """
+        Evaluate a nested filter expression:
+            {"and": [expr, ...]}, {"or": [expr, ...]}, {"not": expr},
+            or {field: [value, ...], ...} (same as select())
+        """
+        if not isinstance(expression, dict):
+            raise ValueError("Filter expressions must be objects")
+        if "and" in expression or "or" in expression or "not" in expression:
+            if len(expression) != 1:
+                raise ValueError("'and', 'or' and 'not' must be the only key of their object")
+            if "not" in expression:
+                return self.all & ~self.match(expression["not"])
+            operands = expression.get("and", expression.get("or"))
+            if not isinstance(operands, list):
+                raise ValueError("'and' and 'or' take a list of expressions")
+            if "and" in expression:
+                result = self.all
+                for operand in operands:
+                    result &= self.match(operand)
+            else:
+                result = 0
+                for operand in operands:
+                    result |= self.match(operand)
+            return result
+        filters = {}
+        for field, values in expression.items():
+            filters[field] = values if isinstance(values, list) else [values]
+        return self.select(filters)
+
+    @staticmethod
+    def count(bitmap):
+        return bitmap.bit_count()
+
+    def facets(self, bitmap, fields=None):
+        """{field: {value: rows in `bitmap` with that value}} for non-empty values with a count"""
+        result = {}
+        for field in fields or self.fields:
+            counts = {}
+            for value, value_bitmap in self.bitmaps[field].items():
+                if value:
+                    count = (value_bitmap & bitmap).bit_count()
+                    if count:
+                        counts[value] = count
+            result[field] = counts
+        return result
+
+    def indexes(self, bitmap, offset=0, limit=None):
+        return list(iter_rows(bitmap, offset, limit))
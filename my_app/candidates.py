@@ -0,0 +1,199 @@
+"""
+Compact in-memory candidate records.
+
+A candidate used to be a dict of ~35 string keys; at 10k rows the per-row
+hash tables and the thousands of separate copies of 'Rejected', 'Chennai'
+or 'Yes' dominate memory. Candidate keeps the values in a list aligned
+with FIELDS (a slotted object with no per-row dict), and values of the
+categorical columns are interned, so every row that says 'On Hold' points
+at the same string.
+
+Candidate implements the mutable mapping protocol, so code that does
+record.get('Name') or record['Resume'] = ... is unchanged. It is turned
+into a plain dict only when serialized: init_app() installs a JSON
+provider that does this for jsonify().
+"""
+
+from collections.abc import Mapping, MutableMapping
+
+from flask.json.provider import DefaultJSONProvider
+
+# Workbook columns in display order; '_api_id' is carried by records read from the API
+FIELDS = (
+    'Date',
+    'Name', 'Email ID', 'Contact Number', 'LinkedIn Profile', 'Resume',
+    'Interested Position', 'Current Role', 'Current Organization', 'Total Years of Experience',
+    'Current Location', 'Location Preference', 'Current CTC per Annum', 'Expected CTC per Annum',
+    'Notice Period', 'In Notice', 'Immediate Joiner', 'Offers in Hand', 'Offered CTC',
+    'Certifications', 'Referred By',
+    'Interview Status', 'Application Status', 'Remarks',
+    'Initial Screening', 'Round 1 D and T', 'Round 1 Remarks', 'Round 2 D and T', 'Round 2 Remarks',
+    'Offered Position', 'Joining Date', 'Reject Mail Sent', 'Screened By',
+)
+_LAYOUT = FIELDS + ('_api_id',)
+_POSITION = {field: position for position, field in enumerate(_LAYOUT)}
+
+# Columns whose values come from a small vocabulary (the form dropdowns plus
+# the recruiter names in 'Screened By'); their values are interned
+CATEGORICAL_FIELDS = frozenset({
+    'Interested Position', 'Current Role', 'Current Location', 'Location Preference',
+    'Total Years of Experience', 'Notice Period', 'In Notice', 'Immediate Joiner',
+    'Offers in Hand', 'Interview Status', 'Application Status', 'Reject Mail Sent',
+    'Screened By', 'Offered Position',
+})
+# Free-text values typed into categorical columns are interned too, up to this many
+MAX_INTERNED = 10000
+
+_MISSING = object()
+_interned = {}
+
+
+def intern_value(value):
+    """Shared copy of a categorical string value"""
+    if value.__class__ is not str:
+        return value
+    shared = _interned.get(value)
+    if shared is not None:
+        return shared
+    if len(_interned) < MAX_INTERNED:
+        _interned[value] = value
+    return value
+
+
+def intern_vocabulary(options):
+    """Seed the intern table with known values, e.g. {field: [option, ...]}"""
+    for values in options.values():
+        for value in values:
+            intern_value(value)
+
+
+class Candidate(MutableMapping):
+    """One candidate row; behaves like the dict it replaces"""
+
+    __slots__ = ('_values', '_extra')
+
+    def __init__(self, items=()):
+        self._values = [_MISSING] * len(_LAYOUT)
+        self._extra = None
+        if isinstance(items, Mapping):
+            items = items.items()
+        for key, value in items:
+            self[key] = value
+
+    def __getitem__(self, key):
+        position = _POSITION.get(key)
+        if position is None:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        value = self._values[position]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        position = _POSITION.get(key)
+        if position is None:
+            return self._extra.get(key, default) if self._extra is not None else default
+        value = self._values[position]
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        position = _POSITION.get(key)
+        if position is None:
+            return self._extra is not None and key in self._extra
+        return self._values[position] is not _MISSING
+
+    def __setitem__(self, key, value):
+        position = _POSITION.get(key)
+        if position is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        if key in CATEGORICAL_FIELDS:
+            value = intern_value(value)
+        self._values[position] = value
+
+    def __delitem__(self, key):
+        position = _POSITION.get(key)
+        if position is None:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+            return
+        if self._values[position] is _MISSING:
+            raise KeyError(key)
+        self._values[position] = _MISSING
+
+    def __iter__(self):
+        for key, value in zip(_LAYOUT, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        count = len(self._values) - self._values.count(_MISSING)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def to_dict(self):
+        result = {key: value for key, value in zip(_LAYOUT, self._values) if value is not _MISSING}
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def copy(self):
+        return Candidate(self.items())
+
+    def __repr__(self):
+        return f"Candidate({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self._values = [_MISSING] * len(_LAYOUT)
+        self._extra = None
+        for key, value in state.items():
+            self[key] = value
+
+
+def row_builder(headers):
+    """
+    Function turning one worksheet row (values parallel to `headers`) into a
+    Candidate; the header lookups are done once here rather than per row.
+    """
+    headers = list(headers)
+    positions = [_POSITION.get(header) for header in headers]
+    categorical = [header in CATEGORICAL_FIELDS for header in headers]
+    plan = [(i, positions[i], categorical[i]) for i in range(len(headers)) if positions[i] is not None]
+    extras = [(i, headers[i]) for i in range(len(headers)) if positions[i] is None]
+    width = len(_LAYOUT)
+    new = Candidate.__new__
+
+    def build(row):
+        values = [_MISSING] * width
+        for index, position, intern in plan:
+            if index < len(row):
+                values[position] = intern_value(row[index]) if intern else row[index]
+        candidate = new(Candidate)
+        candidate._values = values
+        candidate._extra = {header: row[index] for index, header in extras if index < len(row)} or None
+        return candidate
+
+    return build
+
+
+class CandidateJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes Candidate records as plain objects"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Candidate):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
+def init_app(app):
+    app.json = CandidateJSONProvider(app)
@@ -0,0 +1,84 @@
+"""
+Negotiated response compression for the large JSON endpoints.
+
+Responses from the endpoints in COMPRESS_ENDPOINTS are compressed with
+brotli (when the optional `brotli` package is installed) or gzip, whichever
+the client prefers in Accept-Encoding. Bodies smaller than
+COMPRESS_MIN_BYTES are sent as-is, since compression would not pay for its
+CPU cost there. Levels are set with COMPRESS_GZIP_LEVEL / COMPRESS_BROTLI_LEVEL.
+"""
+
+import gzip
+import time
+
+from flask import request
+
+import metrics
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+DEFAULT_ENDPOINTS = ("get_data", "get_bootstrap", "get_applicants_from_api", "get_analytics_data")
+
+
+def available_encodings():
+    """Encodings this process can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body, encoding, level):
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def choose_encoding(accept_encodings, encodings=None):
+    """Best encoding the client accepts (highest q, ties by our preference), or None"""
+    best, best_quality = None, 0
+    for encoding in encodings or available_encodings():
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def init_app(app):
+    """Register the compression hook; settings are read from app.config on each response"""
+
+    @app.after_request
+    def _compress_response(response):
+        endpoints = app.config.get("COMPRESS_ENDPOINTS", DEFAULT_ENDPOINTS)
+        if request.endpoint not in endpoints:
+            return response
+        response.vary.add("Accept-Encoding")
+        if (response.direct_passthrough or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or "Content-Encoding" in response.headers
+                or "no-transform" in (response.headers.get("Cache-Control") or "")):
+            return response
+
+        body = response.get_data()
+        if len(body) < app.config.get("COMPRESS_MIN_BYTES", 1024):
+            return response
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if encoding == "br":
+            level = app.config.get("COMPRESS_BROTLI_LEVEL", 5)
+        else:
+            level = app.config.get("COMPRESS_GZIP_LEVEL", 6)
+        start = time.perf_counter()
+        compressed = compress(body, encoding, level)
+        metrics.COMPRESSION_DURATION.observe(time.perf_counter() - start, encoding=encoding)
+        metrics.RESPONSE_BYTES.inc(len(body), endpoint=request.endpoint, stage="uncompressed")
+        metrics.RESPONSE_BYTES.inc(len(compressed), endpoint=request.endpoint, stage=encoding)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # A different byte representation needs its own validator
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
@@ -8,6 +8,13 @@ class BaseConfig:
     SHEET_NAME = os.getenv("SHEET_NAME", "Candidates")
     USER_DB = os.getenv("USER_DB", os.path.join("database", "users.db"))
     DATABASE = os.getenv("DATABASE", os.path.join("database", "candidates.db"))
+    RESUME_INDEX_DB = os.getenv("RESUME_INDEX_DB", os.path.join("database", "resume_index.db"))
+    # Append-only log of status/screening changes (status_events.py)
+    STATUS_EVENTS_DB = os.getenv("STATUS_EVENTS_DB", os.path.join("database", "status_events.db"))
+    # Report columns cached by the portal.py command-line reports
+    REPORT_SNAPSHOT_FILE = os.getenv("REPORT_SNAPSHOT_FILE", os.path.join("database", "report_snapshot.json"))
+    # Per-month analytics summaries for closed months (analytics_snapshots.py)
+    ANALYTICS_SNAPSHOT_DIR = os.getenv("ANALYTICS_SNAPSHOT_DIR", os.path.join("database", "analytics"))
     EMAIL_CONFIG = {
         "SMTP_SERVER": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
         "SMTP_PORT": int(os.getenv("SMTP_PORT", "587")),
@@ -21,7 +28,67 @@ class BaseConfig:
     API_CONFIG = {
         "BASE_URL": API_BASE_URL,
     }
+    # Guhatek applicant API (upstream source of candidate records)
+    GUHATEK_API_URL = os.getenv("GUHATEK_API_URL", "https://api-dev.guhatek.org")
+    GUHATEK_API_KEY = os.getenv("GUHATEK_API_KEY", "guhatek-job-applicant")
     API_ALLOWED_ORIGINS = os.getenv("API_ALLOWED_ORIGINS", "*")
+    # Resume file serving: browser cache lifetime and optional reverse-proxy offload
+    # ("x-accel-redirect" for nginx, "x-sendfile" for Apache/lighttpd)
+    UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", "86400"))
+    UPLOAD_OFFLOAD = os.getenv("UPLOAD_OFFLOAD", "")
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+    # Resume uploads are rejected (413) past this size; the request body may
+    # be slightly larger for the other form fields
+    MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+    MAX_CONTENT_LENGTH = MAX_RESUME_BYTES + 1024 * 1024
+    # Bulk import (/api/data/import): request size, rows per sheet, and the
+    # concurrency and calls per second used to create applicants upstream
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(200 * 1024 * 1024)))
+    IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "2000"))
+    IMPORT_API_WORKERS = int(os.getenv("IMPORT_API_WORKERS", "4"))
+    IMPORT_API_RATE = float(os.getenv("IMPORT_API_RATE", "5"))
+    # Country code assumed for 10-digit phone numbers when matching duplicates
+    DEFAULT_PHONE_COUNTRY_CODE = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "91")
+    # gzip/brotli for the large JSON endpoints (see compression.py)
+    COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_LEVEL = int(os.getenv("COMPRESS_BROTLI_LEVEL", "5"))
+    # Candidates included in /api/bootstrap (the first table page)
+    BOOTSTRAP_PAGE_SIZE = int(os.getenv("BOOTSTRAP_PAGE_SIZE", "50"))
+    # Rebuild static/dist (hashed, minified, precompressed assets) at startup when stale
+    ASSETS_AUTO_BUILD = os.getenv("ASSETS_AUTO_BUILD", "1").lower() in ("1", "true", "yes")
+    # Cache shared by all workers for the API token and applicant list (shared_cache.py):
+    # "sqlite" (CACHE_URL is the file), "redis" (CACHE_URL is redis://...) or "memory"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+    CACHE_URL = os.getenv("CACHE_URL", os.path.join("database", "cache.db"))
+    APPLICANT_CACHE_TTL = int(os.getenv("APPLICANT_CACHE_TTL", "60"))
+    # Guhatek API guards (upstream.py): consecutive failures that open an operation's
+    # circuit, seconds before an open circuit lets a probe through, total seconds a
+    # request may spend on upstream calls (0: no limit) and the connect timeout
+    UPSTREAM_FAILURE_THRESHOLD = int(os.getenv("UPSTREAM_FAILURE_THRESHOLD", "5"))
+    UPSTREAM_RESET_SECONDS = float(os.getenv("UPSTREAM_RESET_SECONDS", "30"))
+    UPSTREAM_REQUEST_BUDGET = float(os.getenv("UPSTREAM_REQUEST_BUDGET", "20"))
+    UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "3.05"))
+    # Logging (log_pipeline.py): records are queued and written by a background thread
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    # Console format: "text" or "json"
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+    # Records held for the writer; further records are dropped (and counted) rather than waited on
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Guhatek request/response trail as JSON lines ("" disables it)
+    API_DEBUG_LOG = os.getenv("API_DEBUG_LOG", "api_debug.log")
+    # Rotate at this size or age, keeping LOG_BACKUP_COUNT old files (api_debug.log.1, ...)
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_ROTATE_SECONDS = int(os.getenv("LOG_ROTATE_SECONDS", str(24 * 3600)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    # Payloads and response bodies longer than this are cut (0: no limit)
+    LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+    # Share of routine API records written; warnings and errors are always kept
+    API_LOG_SAMPLE_RATE = float(os.getenv("API_LOG_SAMPLE_RATE", "1.0"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+    PROFILE_SLOW_REQUEST_MS = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
     DEBUG = False
     PORT = int(os.getenv("PORT", "5000"))
 
@@ -0,0 +1,136 @@
+"""
+Duplicate candidate detection.
+
+Candidates are keyed by normalized 'Email ID' (trimmed, lower case) and
+'Contact Number' (digits only, with the country code made explicit), so
+"Foo@Example.com " and "foo@example.com", or "098765 43210" and
+"+91 98765-43210", are recognised as the same person. DuplicateIndex maps
+each key to the rows that carry it: checking a new candidate is a couple of
+dict lookups, and the bulk report groups rows connected by either key.
+"""
+
+import re
+from collections import defaultdict
+
+_NON_DIGITS = re.compile(r"\D")
+
+# Local (national) number length for the default country code
+NATIONAL_NUMBER_LENGTH = 10
+MIN_PHONE_DIGITS = 7
+
+
+def _field(record, name):
+    # The add form posts some fields without spaces ("EmailID")
+    value = record.get(name) or record.get(name.replace(" ", "")) or ""
+    return str(value).strip()
+
+
+def normalize_email(value):
+    value = str(value or "").strip().lower()
+    if value.startswith("mailto:"):
+        value = value[len("mailto:"):]
+    return value if "@" in value else None
+
+
+def normalize_phone(value, default_country_code="91"):
+    """
+    Digits-only phone number with a country code.
+
+    "+91 98765 43210", "0091-9876543210", "09876543210" and "9876543210"
+    all become "919876543210" with the default country code 91. Numbers
+    that already carry another country code are kept as dialled.
+    """
+    raw = str(value or "").strip()
+    if raw.endswith(".0"):
+        # Numbers stored as floats in older sheets
+        raw = raw[:-2]
+    digits = _NON_DIGITS.sub("", raw)
+    # "+<country code>..." is already international
+    if not raw.startswith("+"):
+        if digits.startswith("00"):
+            digits = digits[2:]
+        elif len(digits) == NATIONAL_NUMBER_LENGTH + 1 and digits.startswith("0"):
+            digits = default_country_code + digits[1:]
+        elif len(digits) == NATIONAL_NUMBER_LENGTH:
+            digits = default_country_code + digits
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def record_keys(record, default_country_code="91"):
+    """[(field, normalized value), ...] identifying a candidate record"""
+    keys = []
+    email = normalize_email(_field(record, "Email ID"))
+    if email:
+        keys.append(("email", email))
+    phone = normalize_phone(_field(record, "Contact Number"), default_country_code)
+    if phone:
+        keys.append(("phone", phone))
+    return keys
+
+
+class DuplicateIndex:
+    """Normalized email/phone -> row indexes for a list of candidate records"""
+
+    def __init__(self, records=(), default_country_code="91"):
+        self.default_country_code = default_country_code
+        self.size = 0  # number of rows covered
+        self._rows = defaultdict(list)
+        for index, record in enumerate(records):
+            self.add(index, record)
+
+    def add(self, index, record):
+        self.size = max(self.size, index + 1)
+        for key in record_keys(record, self.default_country_code):
+            self._rows[key].append(index)
+
+    def find(self, record, exclude=None):
+        """
+        Rows that share an email or phone with `record`.
+
+        Returns:
+            {row index: [matched field, ...]} in row order
+        """
+        matches = defaultdict(list)
+        for key in record_keys(record, self.default_country_code):
+            for index in self._rows.get(key, ()):
+                if index != exclude and key[0] not in matches[index]:
+                    matches[index].append(key[0])
+        return dict(sorted(matches.items()))
+
+    def groups(self):
+        """
+        Sets of rows that belong to the same person, joining rows that share
+        an email or a phone (transitively), largest groups first.
+
+        Returns:
+            list of {"rows": [index, ...], "keys": [(field, value), ...]}
+            where keys are the normalized values shared by the rows
+        """
+        parent = {}
+
+        def find(i):
+            while parent.setdefault(i, i) != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for rows in self._rows.values():
+            for other in rows[1:]:
+                a, b = find(rows[0]), find(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        members = defaultdict(set)
+        shared_keys = defaultdict(list)
+        for key, rows in self._rows.items():
+            for index in rows:
+                members[find(index)].add(index)
+            if len(rows) > 1:
+                shared_keys[find(rows[0])].append(key)
+
+        result = [
+            {"rows": sorted(rows), "keys": sorted(shared_keys[root])}
+            for root, rows in members.items() if len(rows) > 1
+        ]
+        result.sort(key=lambda g: (-len(g["rows"]), g["rows"][0]))
+        return result
@@ -0,0 +1,88 @@
+"""
+Streaming candidate exports (CSV and XLSX).
+
+Both writers take an iterable of candidate records and produce the file as
+a sequence of byte chunks, suitable for a streamed Flask Response:
+
+    iter_csv    rows are encoded and yielded in small batches as they are
+                read, so the first bytes go out immediately
+    iter_xlsx   rows are appended to an openpyxl write-only worksheet,
+                which spools them to a temporary file rather than keeping
+                cells in memory; the finished workbook is then sent in
+                chunks from a temporary file
+
+Memory stays flat in the number of rows for both formats.
+"""
+
+import csv
+import io
+import re
+import tempfile
+
+CSV_BATCH_ROWS = 500
+CHUNK_SIZE = 64 * 1024
+
+# Cells starting with these are treated as formulas by spreadsheet apps
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# ... unless the whole value is a number or a phone number such as +91 98765-43210
+_PLAIN_NUMBER = re.compile(r'^[+-]?[\d\s().-]*\d[\d\s().-]*$')
+
+
+def cell_text(value):
+    """Text of a value for an exported cell, with formula-like text neutralized"""
+    if value is None:
+        return ''
+    text = str(value)
+    if text.startswith(_FORMULA_PREFIXES) and not _PLAIN_NUMBER.match(text):
+        return "'" + text
+    return text
+
+
+def iter_csv(records, fields):
+    """UTF-8 CSV (with BOM, so Excel detects the encoding) as byte chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(fields)
+    pending = 0
+    for record in records:
+        writer.writerow([cell_text(record.get(field)) for field in fields])
+        pending += 1
+        if pending >= CSV_BATCH_ROWS:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+
+def iter_xlsx(records, fields, sheet_name='Candidates'):
+    """XLSX workbook built with openpyxl's write-only mode, as byte chunks"""
+    import openpyxl
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def cell(value):
+        # Empty cells are left out of the sheet; openpyxl rejects control characters XML cannot carry
+        text = cell_text(value)
+        return ILLEGAL_CHARACTERS_RE.sub('', text) if text else None
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_name)
+    ws.append(list(fields))
+    for record in records:
+        ws.append([cell(record.get(field)) for field in fields])
+
+    with tempfile.TemporaryFile() as f:
+        wb.save(f)
+        f.seek(0)
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+FORMATS = {
+    'csv': (iter_csv, 'text/csv'),
+    'xlsx': (iter_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
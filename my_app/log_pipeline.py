@@ -0,0 +1,258 @@
+"""
+Non-blocking logging.
+
+Loggers only put records on a bounded queue; the handlers that write to the
+console and to files run on one background thread (a QueueListener). A slow
+disk or terminal therefore never holds up a request. When the queue is full,
+a record is dropped and counted in portal_log_records_dropped_total. The
+logger does not wait.
+
+There are two destinations:
+
+- The console, as before: plain text, or JSON lines with LOG_FORMAT=json.
+- API_DEBUG_LOG: the Guhatek request/response trail written through the
+  "portal.api" logger (api_log in app.py). Each record is one JSON object
+  per line. Its `extra` fields (event, applicant_id, payload, response...)
+  become keys. Long values, such as full payloads and response bodies, are
+  cut to LOG_MAX_FIELD_CHARS. The file rotates when it reaches LOG_MAX_BYTES
+  or is LOG_ROTATE_SECONDS old, and LOG_BACKUP_COUNT old files are kept.
+  Every worker process appends to the same file; one of them rotates it
+  under a lock file and the others follow it to the new file.
+  Only API_LOG_SAMPLE_RATE of the routine (below WARNING) records are
+  written; warnings and errors always are.
+
+Messages and tracebacks are rendered when a record is queued. JSON encoding,
+truncation and the file writes happen on the writer thread.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single process writes the file
+    fcntl = None
+
+import metrics
+
+API_LOGGER = "portal.api"
+
+LOG_RECORDS_DROPPED = metrics.Counter(
+    "portal_log_records_dropped_total",
+    "Log records discarded because the log queue was full",
+)
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_TRACEBACKS = logging.Formatter()
+_listener = None
+
+
+def truncate(value, limit):
+    """`value` (JSON-like) with strings longer than `limit` characters cut short"""
+    if isinstance(value, str):
+        if limit and len(value) > limit:
+            return f"{value[:limit]}... [{len(value) - limit} more chars]"
+        return value
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): truncate(item, limit) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [truncate(item, limit) for item in value]
+    return truncate(str(value), limit)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, message, the `extra` fields and exc"""
+
+    def __init__(self, max_field_chars=0):
+        super().__init__()
+        self.max_field_chars = max_field_chars
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(truncate(entry, self.max_field_chars), ensure_ascii=False, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Keeps every WARNING-or-worse record and about `rate` (0..1) of the others"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on `path` across processes (no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RotatingLogFile(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that also rolls the file over every `max_age` seconds
+    (0: size only) and that several processes (gunicorn workers) can share.
+    Rollover happens under a lock file; a process whose file was already
+    rotated by another one reopens the new file instead of rotating again.
+    """
+
+    def __init__(self, filename, max_bytes, backup_count, max_age=0):
+        directory = os.path.dirname(os.path.abspath(filename))
+        os.makedirs(directory, exist_ok=True)
+        self._identity = None
+        super().__init__(filename, maxBytes=max_bytes, backupCount=max(1, backup_count),
+                         encoding="utf-8", delay=True)
+        self.lock_path = self.baseFilename + ".lock"
+        self.max_age = max_age
+        self.rollover_at = time.time() + max_age
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        return stream
+
+    def _rotated_elsewhere(self):
+        """True when the open file is no longer the one at baseFilename"""
+        if self.stream is None:
+            return False
+        try:
+            stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def _reopen(self):
+        # The next emit() opens the current file
+        self.stream.close()
+        self.stream = None
+        self.rollover_at = time.time() + self.max_age
+
+    def shouldRollover(self, record):
+        if self._rotated_elsewhere():
+            self._reopen()
+            return False
+        if self.max_age and time.time() >= self.rollover_at:
+            return True
+        # The file is opened for append, so this sees every process's writes
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        with _file_lock(self.lock_path):
+            if self._rotated_elsewhere():
+                self._reopen()
+                return
+            super().doRollover()
+        self.rollover_at = time.time() + self.max_age
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records without ever blocking; drops them when the queue is full"""
+
+    def prepare(self, record):
+        # Render the message and traceback now: the writer thread sees the record later.
+        # Unlike QueueHandler.prepare this leaves formatting (and `extra`) to the writer.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACKS.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _not_api(record):
+    return not (record.name == API_LOGGER or record.name.startswith(API_LOGGER + "."))
+
+
+def configure(config):
+    """
+    Route the root logger and the API logger through the queue and start the
+    writer thread. Replaces logging.basicConfig(); later calls do nothing.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    records = queue.Queue(config.LOG_QUEUE_SIZE)
+    handler = _QueueHandler(records)
+
+    console = logging.StreamHandler()
+    if config.LOG_FORMAT == "json":
+        console.setFormatter(JSONFormatter(config.LOG_MAX_FIELD_CHARS))
+    else:
+        console.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    handlers = [console]
+
+    api = logging.getLogger(API_LOGGER)
+    if config.API_DEBUG_LOG:
+        console.addFilter(_not_api)
+        api_file = RotatingLogFile(config.API_DEBUG_LOG, config.LOG_MAX_BYTES,
+                                   config.LOG_BACKUP_COUNT, config.LOG_ROTATE_SECONDS)
+        api_file.setFormatter(JSONFormatter(config.LOG_MAX_FIELD_CHARS))
+        api_file.addFilter(logging.Filter(API_LOGGER))
+        handlers.append(api_file)
+        api.propagate = False
+        api.setLevel(logging.INFO)
+        api.filters[:] = [SampleFilter(config.API_LOG_SAMPLE_RATE)]
+        api.handlers[:] = [handler]
+    else:
+        # No API log file: the request/response dumps are skipped, but API
+        # warnings and errors still reach the console through the root logger
+        api.setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop)
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(config.LOG_LEVEL)
+
+
+def stop():
+    """Write out the queued records and stop the writer thread"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except queue.Full:
+            # No room for the stop marker; the daemon writer thread dies with the process
+            pass
@@ -0,0 +1,239 @@
+"""
+Lightweight Prometheus metrics for the portal.
+
+Counters, gauges and histograms are kept in-process and rendered in the
+Prometheus text exposition format by render(). No client library is needed.
+Values are per process: with several workers, each /metrics scrape reports
+only the worker that answered it.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+
+# Latency buckets in seconds (upstream calls can take up to 30 s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_sample(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state["buckets"]):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+REGISTRY = []
+
+
+def render():
+    """Render every registered metric in Prometheus text format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================
+# Portal metrics
+# ============================================
+HTTP_REQUEST_DURATION = Histogram(
+    "portal_http_request_duration_seconds",
+    "Flask request latency by endpoint",
+    ("endpoint", "method", "status"),
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "portal_upstream_request_duration_seconds",
+    "Guhatek API call latency by operation (token, list, patch, create)",
+    ("operation",),
+)
+UPSTREAM_ERRORS = Counter(
+    "portal_upstream_errors_total",
+    "Failed Guhatek API calls by operation",
+    ("operation",),
+)
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "portal_upstream_circuit_state",
+    "Guhatek API circuit breaker state by operation (0 closed, 1 half-open, 2 open)",
+    ("operation",),
+)
+UPSTREAM_REJECTED = Counter(
+    "portal_upstream_rejected_total",
+    "Guhatek API calls not made because the circuit was open or the request budget was spent",
+    ("operation", "reason"),
+)
+EXCEL_DURATION = Histogram(
+    "portal_excel_duration_seconds",
+    "Time spent in load_data/save_data",
+    ("operation",),
+)
+EXCEL_ROWS = Gauge(
+    "portal_excel_rows",
+    "Rows handled by the last load_data/save_data call",
+    ("operation",),
+)
+PDF_EXTRACT_DURATION = Histogram(
+    "portal_pdf_extract_duration_seconds",
+    "Text extraction time per resume PDF",
+)
+SMTP_SEND_DURATION = Histogram(
+    "portal_smtp_send_duration_seconds",
+    "Time to send one email over SMTP",
+)
+SMTP_ERRORS = Counter(
+    "portal_smtp_errors_total",
+    "Failed SMTP sends",
+)
+COMPRESSION_DURATION = Histogram(
+    "portal_compression_duration_seconds",
+    "Time to compress one response body",
+    ("encoding",),
+)
+RESPONSE_BYTES = Counter(
+    "portal_compressed_response_bytes_total",
+    "Body bytes of compressed responses before (stage=uncompressed) and after compression",
+    ("endpoint", "stage"),
+)
+CACHE_REQUESTS = Counter(
+    "portal_cache_requests_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result"),
+)
+
+
+@contextmanager
+def track_upstream(operation):
+    """Time a Guhatek API call and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.inc(operation=operation)
+        raise
+    finally:
+        UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - start, operation=operation)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def init_app(app):
+    """Register request timing hooks on the Flask app"""
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = getattr(g, "_metrics_start", None)
+        if start is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or "unmatched",
+                method=request.method,
+                status=response.status_code,
+            )
+        return response
@@ -0,0 +1,288 @@
+"""
+Command-line reports on the candidate workbook.
+
+    python portal.py offers                 candidates with an offered CTC
+    python portal.py status [--field F]     counts per Application (or Interview) Status
+    python portal.py duplicates             rows sharing an email or phone number
+    python portal.py stale [--days N]       open candidates with no activity for N days
+
+Options for every report: --excel/--sheet to read another workbook, --json
+for machine-readable output, --no-cache to bypass the snapshot.
+
+The workbook is read with sheet_reader, which only extracts the report
+columns (REPORT_COLUMNS), and the result is kept in REPORT_SNAPSHOT_FILE
+keyed by the workbook's modification time and size. While the workbook is
+unchanged, later reports read the snapshot instead of the workbook.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+from config import DevelopmentConfig, ProductionConfig
+
+import duplicates
+import sheet_reader
+from analytics_snapshots import NO_OFFER_VALUES, parse_record_date
+from status_events import StatusEventLog, candidate_key
+
+SNAPSHOT_VERSION = 1
+
+# Every column any report reads; the snapshot holds all of them
+REPORT_COLUMNS = (
+    'Date', 'Name', 'Email ID', 'Contact Number', 'Interested Position',
+    'Offered CTC', 'Offered Position', 'Joining Date',
+    'Interview Status', 'Application Status', 'Screened By',
+)
+STATUS_FIELDS = {'application': 'Application Status', 'interview': 'Interview Status'}
+# Application statuses after which a candidate no longer needs follow-up
+CLOSED_STATUSES = frozenset({'Joined', 'Rejected', 'Did Not Join'})
+
+
+def _config():
+    if os.getenv("APP_ENV", "development").lower() == "production":
+        return ProductionConfig()
+    return DevelopmentConfig()
+
+
+# ============================================
+# Loading
+# ============================================
+class Sheet:
+    """Report columns of the workbook: row i is sheet row i + 2"""
+
+    def __init__(self, columns, size, source):
+        self.columns = columns
+        self.size = size
+        self.source = source    # 'snapshot' or 'workbook'
+
+    def column(self, name):
+        return self.columns.get(name) or [None] * self.size
+
+    def records(self, names):
+        """Row dicts with the given columns (missing values as '')"""
+        columns = [(name, self.column(name)) for name in names]
+        return [{name: values[i] or '' for name, values in columns} for i in range(self.size)]
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_sheet(path, sheet_name, snapshot_path=None):
+    """Sheet for `path`, from the snapshot when it matches the workbook, else read and snapshotted"""
+    stamp = _stamp(path)
+    source = os.path.abspath(path)
+    if snapshot_path:
+        try:
+            with open(snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if (snapshot.get('version') == SNAPSHOT_VERSION and snapshot.get('source') == source
+                    and snapshot.get('sheet') == sheet_name and snapshot.get('stamp') == stamp):
+                return Sheet(snapshot['columns'], snapshot['size'], 'snapshot')
+        except (OSError, ValueError):
+            pass
+
+    _, columns = sheet_reader.read_columns(path, sheet_name, REPORT_COLUMNS)
+    size = max((len(values) for values in columns.values()), default=0)
+    if snapshot_path:
+        try:
+            directory = os.path.dirname(os.path.abspath(snapshot_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': SNAPSHOT_VERSION, 'source': source, 'sheet': sheet_name,
+                           'stamp': stamp, 'size': size, 'columns': columns}, f)
+            os.replace(temp_path, snapshot_path)
+        except OSError as e:
+            print(f"warning: could not write report snapshot: {e}", file=sys.stderr)
+    return Sheet(columns, size, 'workbook')
+
+
+def record_date(value):
+    """Application/joining date of a cell: text as stored by the app, or an Excel date serial"""
+    parsed = parse_record_date(value)
+    if parsed is None and value:
+        parsed = sheet_reader.excel_serial_to_datetime(value)
+    return parsed.replace(tzinfo=None) if parsed else None
+
+
+# ============================================
+# Reports: each returns a JSON-ready dict
+# ============================================
+def report_offers(sheet, args):
+    rows = []
+    offers = sheet.column('Offered CTC')
+    names, joining, positions = sheet.column('Name'), sheet.column('Joining Date'), sheet.column('Offered Position')
+    for i, offer in enumerate(offers):
+        if offer and str(offer).strip().lower() not in NO_OFFER_VALUES:
+            rows.append({'row': i + 2, 'name': names[i] or '', 'offered_ctc': offer,
+                         'offered_position': positions[i] or '', 'joining_date': joining[i] or ''})
+    return {'total_records': sheet.size, 'with_offer': len(rows),
+            'offers': rows[:args.limit] if args.limit else rows}
+
+
+def report_status(sheet, args):
+    field = STATUS_FIELDS.get(args.field.lower(), args.field)
+    counts = Counter((value or '').strip() for value in sheet.column(field))
+    return {'field': field, 'total_records': sheet.size, 'counts': [
+        {'value': value or '(empty)', 'count': count}
+        for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    ]}
+
+
+def report_duplicates(sheet, args):
+    records = sheet.records(('Name', 'Email ID', 'Contact Number'))
+    index = duplicates.DuplicateIndex(records, args.country_code)
+    groups = [{
+        'rows': [{'row': i + 2, 'name': records[i]['Name'], 'email': records[i]['Email ID'],
+                  'contact': records[i]['Contact Number']} for i in group['rows']],
+        'shared': [f"{field}:{value}" for field, value in group['keys']],
+    } for group in index.groups()]
+    return {'total_records': sheet.size, 'groups': len(groups),
+            'duplicate_rows': sum(len(group['rows']) for group in groups), 'duplicates': groups}
+
+
+def report_stale(sheet, args, now=None):
+    """Open candidates whose last activity (application date or logged status change) is older than --days"""
+    now = now or datetime.now()
+    activity = {}
+    if args.events_db and os.path.exists(args.events_db):
+        activity = StatusEventLog(args.events_db).last_activity()
+    records = sheet.records(('Name', 'Email ID', 'Date', 'Application Status', 'Interview Status', 'Screened By'))
+    rows = []
+    for i, record in enumerate(records):
+        status = record['Application Status'].strip()
+        if status in CLOSED_STATUSES:
+            continue
+        applied = record_date(record['Date'])
+        last = applied
+        logged = activity.get(candidate_key(record, index=i))
+        if logged:
+            changed = datetime.fromtimestamp(logged)
+            last = max(last, changed) if last else changed
+        if last is None:
+            continue
+        idle_days = (now - last).days
+        if idle_days >= args.days:
+            rows.append({'row': i + 2, 'name': record['Name'], 'application_status': status or '(empty)',
+                         'interview_status': record['Interview Status'], 'screened_by': record['Screened By'],
+                         'last_activity': last.strftime('%Y-%m-%d'), 'idle_days': idle_days})
+    rows.sort(key=lambda row: -row['idle_days'])
+    return {'days': args.days, 'stale': len(rows), 'candidates': rows[:args.limit] if args.limit else rows}
+
+
+# ============================================
+# Text output
+# ============================================
+def print_offers(result):
+    print(f"Total records: {result['total_records']}")
+    print(f"Records with offer: {result['with_offer']}")
+    for offer in result['offers']:
+        details = ', '.join(filter(None, [offer['offered_position'],
+                                          offer['joining_date'] and f"joining {offer['joining_date']}"]))
+        print(f"Row {offer['row']}: {offer['name']} - {offer['offered_ctc']}" + (f" ({details})" if details else ''))
+
+
+def print_status(result):
+    total = result['total_records'] or 1
+    print(f"{result['field']} ({result['total_records']} records)")
+    width = max((len(item['value']) for item in result['counts']), default=0)
+    for item in result['counts']:
+        print(f"  {item['value']:<{width}}  {item['count']:>6}  {100 * item['count'] / total:5.1f}%")
+
+
+def print_duplicates(result):
+    print(f"{result['groups']} groups, {result['duplicate_rows']} rows")
+    for group in result['duplicates']:
+        print(f"- shared {', '.join(group['shared'])}")
+        for row in group['rows']:
+            print(f"    Row {row['row']}: {row['name']} <{row['email']}> {row['contact']}")
+
+
+def print_stale(result):
+    print(f"{result['stale']} open candidates with no activity for {result['days']}+ days")
+    for row in result['candidates']:
+        print(f"Row {row['row']}: {row['name']} - {row['application_status']}"
+              f" / {row['interview_status'] or '-'}, last activity {row['last_activity']}"
+              f" ({row['idle_days']} days){', screened by ' + row['screened_by'] if row['screened_by'] else ''}")
+
+
+REPORTS = {
+    'offers': (report_offers, print_offers),
+    'status': (report_status, print_status),
+    'duplicates': (report_duplicates, print_duplicates),
+    'stale': (report_stale, print_stale),
+}
+
+
+def status_field(value):
+    """--field: 'application', 'interview' or a report column"""
+    field = STATUS_FIELDS.get(value.lower(), value)
+    if field not in REPORT_COLUMNS:
+        raise argparse.ArgumentTypeError(
+            f"unknown field {value!r}; use application, interview or one of: {', '.join(REPORT_COLUMNS)}")
+    return field
+
+
+def build_parser(config):
+    parser = argparse.ArgumentParser(prog='portal', description="Reports on the candidate workbook")
+    parser.add_argument('--excel', default=config.EXCEL_FILE, help="workbook to read (default: EXCEL_FILE)")
+    parser.add_argument('--sheet', default=config.SHEET_NAME, help="worksheet name (default: SHEET_NAME)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--no-cache', action='store_true', help="read the workbook even if the snapshot is current")
+    parser.add_argument('--timing', action='store_true', help="print load and report times to stderr")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    offers = commands.add_parser('offers', help="candidates with an offered CTC")
+    offers.add_argument('--limit', type=int, default=0, help="list at most this many (0: all)")
+
+    status = commands.add_parser('status', help="candidate counts per status value")
+    status.add_argument('--field', default='application', type=status_field,
+                        help="'application', 'interview' or any report column (default: application)")
+
+    dupes = commands.add_parser('duplicates', help="rows that share an email or phone number")
+    dupes.add_argument('--country-code', default=config.DEFAULT_PHONE_COUNTRY_CODE,
+                       help="country code assumed for 10-digit numbers")
+
+    stale = commands.add_parser('stale', help="open candidates with no recent activity")
+    stale.add_argument('--days', type=int, default=14, help="idle days before a candidate is stale (default: 14)")
+    stale.add_argument('--limit', type=int, default=0, help="list at most this many (0: all)")
+    stale.add_argument('--events-db', default=config.STATUS_EVENTS_DB, help="status change log (default: STATUS_EVENTS_DB)")
+    return parser
+
+
+def main(argv=None):
+    config = _config()
+    args = build_parser(config).parse_args(argv)
+    if not os.path.exists(args.excel):
+        print(f"Workbook not found: {args.excel}", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        sheet = load_sheet(args.excel, args.sheet, None if args.no_cache else config.REPORT_SNAPSHOT_FILE)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Could not read {args.excel}: {e}", file=sys.stderr)
+        return 1
+    loaded = time.perf_counter()
+
+    report, printer = REPORTS[args.command]
+    result = report(sheet, args)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        printer(result)
+    if args.timing:
+        print(f"loaded {sheet.size} rows from {sheet.source} in {(loaded - start) * 1000:.0f} ms, "
+              f"report in {(time.perf_counter() - loaded) * 1000:.0f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+On-demand and slow-request profiling.
+
+Admins can profile a single request by sending ``X-Profile: 1`` or adding
+``?profile=1``. The request runs under cProfile (saved as ``.prof``, readable
+with pstats/snakeviz/flameprof) and a stack sampler (saved as ``.folded``
+collapsed stacks for flamegraph.pl or speedscope).
+
+When PROFILE_SLOW_REQUEST_MS is set, every request is sampled and the folded
+stacks of any request slower than the threshold are written automatically.
+Sampling only walks the threads that are currently serving a request.
+"""
+
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Background thread that periodically records the stacks of tracked threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def track(self, thread_id):
+        with self._lock:
+            self._samples[thread_id] = Counter()
+            self._ensure_started()
+
+    def untrack(self, thread_id):
+        """Stop sampling a thread and return its collected stacks"""
+        with self._lock:
+            return self._samples.pop(thread_id, Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                tracked = list(self._samples)
+            if not tracked:
+                continue
+            frames = sys._current_frames()
+            for thread_id in tracked:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = _collapse(frame)
+                with self._lock:
+                    samples = self._samples.get(thread_id)
+                    if samples is not None:
+                        samples[stack] += 1
+
+
+def _collapse(frame):
+    """Render a frame chain as a root-first ';'-joined stack"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def write_folded(samples, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def init_app(app, is_admin):
+    """
+    Register profiling hooks.
+
+    Args:
+        app: Flask app (reads PROFILE_DIR, PROFILE_SLOW_REQUEST_MS, PROFILE_SAMPLE_INTERVAL_MS)
+        is_admin: callable returning True when the current session is an admin
+    """
+    profile_dir = app.config.get("PROFILE_DIR") or os.path.join(app.root_path, "profiles")
+    slow_ms = float(app.config.get("PROFILE_SLOW_REQUEST_MS") or 0)
+    sampler = StackSampler(float(app.config.get("PROFILE_SAMPLE_INTERVAL_MS") or 5) / 1000.0)
+
+    def _profile_requested():
+        flag = request.headers.get("X-Profile") or request.args.get("profile")
+        return flag in ("1", "true", "yes") and is_admin()
+
+    def _output_path(reason, elapsed_ms, suffix):
+        os.makedirs(profile_dir, exist_ok=True)
+        endpoint = (request.endpoint or "unmatched").replace(".", "_")
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{endpoint}_{int(elapsed_ms)}ms_{reason}{suffix}"
+        return os.path.join(profile_dir, name)
+
+    @app.before_request
+    def _start_profiling():
+        g._profile_start = time.perf_counter()
+        g._profile_on_demand = _profile_requested()
+        g._profile_sampled = g._profile_on_demand or slow_ms > 0
+        if g._profile_sampled:
+            sampler.track(threading.get_ident())
+        if g._profile_on_demand:
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+
+    @app.after_request
+    def _finish_profiling(response):
+        if not getattr(g, "_profile_sampled", False):
+            return response
+        elapsed_ms = (time.perf_counter() - g._profile_start) * 1000
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+        samples = sampler.untrack(threading.get_ident())
+        g._profile_sampled = False
+
+        try:
+            if profiler is not None:
+                prof_path = _output_path("on-demand", elapsed_ms, ".prof")
+                profiler.dump_stats(prof_path)
+                write_folded(samples, prof_path[:-len(".prof")] + ".folded")
+                response.headers["X-Profile-File"] = os.path.basename(prof_path)
+                logger.info(f"Profile saved for {request.path}: {prof_path}")
+            elif slow_ms and elapsed_ms >= slow_ms:
+                folded_path = _output_path("slow", elapsed_ms, ".folded")
+                write_folded(samples, folded_path)
+                logger.warning(f"Slow request {request.method} {request.path} took {elapsed_ms:.0f} ms, profile: {folded_path}")
+        except OSError as e:
+            logger.error(f"Error writing profile: {e}")
+        return response
+
+    @app.teardown_request
+    def _cleanup_profiling(exc):
+        # after_request is skipped when the view raises; make sure nothing leaks
+        profiler = g.pop("_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+        if getattr(g, "_profile_sampled", False):
+            sampler.untrack(threading.get_ident())
@@ -0,0 +1,506 @@
+"""
+Resume search index.
+
+Resume text is extracted from each PDF once and kept in a SQLite token store
+(RESUME_INDEX_DB). The in-memory positional inverted index is built from that
+store and answers BM25-ranked queries with AND / OR / NOT, parentheses and
+quoted phrases, plus highlighted snippets. An optional tagger (see skills.py)
+runs once per document at ingest and its tags are stored next to the tokens.
+
+Query syntax:
+    kubernetes terraform         either term (ranked by BM25, as before)
+    kubernetes AND terraform     both terms
+    python NOT django            python without django (also: python -django)
+    "site reliability"           exact phrase
+    (aws OR gcp) AND terraform   grouping
+"""
+
+import html
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Letters/digits plus '+' and '#' inside a token (c++, c#). Punctuation such as
+# '.', '/', '-' splits tokens; a query word that splits ("node.js", "ci/cd")
+# is matched as a phrase, so both sides tokenize the same way.
+TOKEN_RE = re.compile(r"[^\W_](?:[^\W_]|[+#])*")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_RADIUS = 80
+MAX_SNIPPETS = 2
+
+
+def tokenize(text):
+    return [m.group().lower() for m in TOKEN_RE.finditer(text or "")]
+
+
+# ============================================
+# Query parsing
+# ============================================
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"?|(\()|(\))|(,)|(&&|\|\|)|([^\s(),"]+)')
+
+
+class QueryNode:
+    """Parsed query node: kind is 'term', 'phrase', 'and', 'or' or 'not'"""
+
+    __slots__ = ("kind", "value", "children")
+
+    def __init__(self, kind, value=None, children=()):
+        self.kind = kind
+        self.value = value
+        self.children = list(children)
+
+    def positive_leaves(self, negated=False):
+        """Yield the term/phrase nodes that count towards the score (not under NOT)"""
+        if self.kind in ("term", "phrase"):
+            if not negated:
+                yield self
+        elif self.kind == "not":
+            yield from self.children[0].positive_leaves(not negated)
+        else:
+            for child in self.children:
+                yield from child.positive_leaves(negated)
+
+    @property
+    def label(self):
+        return " ".join(self.value) if self.kind == "phrase" else self.value
+
+
+def _leaf(text):
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    if len(tokens) == 1:
+        return QueryNode("term", tokens[0])
+    return QueryNode("phrase", tokens)
+
+
+def parse_query(query):
+    """
+    Parse a search string into a QueryNode tree.
+
+    Adjacent terms and commas mean OR; AND binds tighter than OR and NOT
+    applies to the preceding term (a NOT b == a AND NOT b). Operators must
+    be upper case so ordinary words like "and" stay searchable.
+
+    Raises:
+        ValueError: if the query has no searchable terms
+    """
+    lexemes = []
+    for m in _QUERY_TOKEN_RE.finditer(query or ""):
+        phrase, lparen, rparen, comma, symbol, word = m.groups()
+        if phrase is not None:
+            lexemes.append(("leaf", phrase))
+        elif lparen:
+            lexemes.append(("(", None))
+        elif rparen:
+            lexemes.append((")", None))
+        elif comma:
+            lexemes.append(("OR", None))
+        elif symbol:
+            lexemes.append(("AND" if symbol == "&&" else "OR", None))
+        elif word in ("AND", "OR", "NOT"):
+            lexemes.append((word, None))
+        elif word.startswith("-") and len(word) > 1:
+            lexemes.append(("NOT", None))
+            lexemes.append(("leaf", word[1:]))
+        else:
+            lexemes.append(("leaf", word))
+
+    pos = 0
+
+    def peek():
+        return lexemes[pos][0] if pos < len(lexemes) else None
+
+    def parse_or():
+        nonlocal pos
+        children = [parse_and()]
+        while peek() in ("OR", "leaf", "("):
+            if peek() == "OR":
+                pos += 1
+            children.append(parse_and())
+        children = [c for c in children if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else QueryNode("or", children=children)
+
+    def parse_and():
+        nonlocal pos
+        children = [parse_not()]
+        # "python NOT java" / "python -java" means python AND NOT java
+        while peek() in ("AND", "NOT"):
+            if peek() == "AND":
+                pos += 1
+            children.append(parse_not())
+        children = [c for c in children if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else QueryNode("and", children=children)
+
+    def parse_not():
+        nonlocal pos
+        if peek() == "NOT":
+            pos += 1
+            child = parse_not()
+            return QueryNode("not", children=[child]) if child is not None else None
+        return parse_primary()
+
+    def parse_primary():
+        nonlocal pos
+        kind = peek()
+        if kind == "(":
+            pos += 1
+            node = parse_or()
+            if peek() == ")":
+                pos += 1
+            return node
+        if kind == "leaf":
+            value = lexemes[pos][1]
+            pos += 1
+            return _leaf(value)
+        # Stray operator or ')': skip it
+        if kind is not None:
+            pos += 1
+        return None
+
+    root = None
+    while pos < len(lexemes):
+        node = parse_or()
+        if node is not None:
+            root = node if root is None else QueryNode("or", children=[root, node])
+        elif peek() is not None:
+            pos += 1
+    if root is None or not list(root.positive_leaves()):
+        raise ValueError("Query has no searchable terms")
+    return root
+
+
+# ============================================
+# Index
+# ============================================
+class ResumeIndex:
+    """Positional inverted index over extracted resume text, backed by a SQLite token store"""
+
+    def __init__(self, db_path, tagger=None, tagger_version=0):
+        self.db_path = db_path
+        self.tagger = tagger
+        self.tagger_version = tagger_version
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._doc_ids = {}        # doc_key -> doc id
+        self._doc_keys = []       # doc id -> doc_key (None once forgotten)
+        self._doc_len = []        # doc id -> token count
+        self._doc_terms = []      # doc id -> set of terms (for re-indexing)
+        self._doc_stamp = {}      # doc_key -> (mtime_ns, size)
+        self._doc_tags = {}       # doc_key -> frozenset of tags
+        self._postings = defaultdict(dict)  # term -> {doc id: [positions]}
+        self._total_len = 0
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS resume_text (
+                doc_key TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                tokens TEXT NOT NULL,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(resume_text)')}
+        if 'tags' not in columns:
+            conn.execute("ALTER TABLE resume_text ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+            conn.execute('ALTER TABLE resume_text ADD COLUMN tag_version INTEGER NOT NULL DEFAULT -1')
+        return conn
+
+    def _tag(self, tokens):
+        return frozenset(self.tagger(tokens)) if self.tagger else frozenset()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            conn = self._connect()
+            retagged = []
+            try:
+                for doc_key, mtime_ns, size, tokens, tags, tag_version in conn.execute(
+                        'SELECT doc_key, mtime_ns, size, tokens, tags, tag_version FROM resume_text'):
+                    tokens = tokens.split()
+                    self._index_document(doc_key, tokens, (mtime_ns, size))
+                    if tag_version == self.tagger_version:
+                        self._doc_tags[doc_key] = frozenset(t for t in tags.split(",") if t)
+                    else:
+                        # Taxonomy changed since this row was stored: re-tag from saved tokens
+                        self._doc_tags[doc_key] = self._tag(tokens)
+                        retagged.append((",".join(sorted(self._doc_tags[doc_key])), self.tagger_version, doc_key))
+                if retagged:
+                    conn.executemany('UPDATE resume_text SET tags = ?, tag_version = ? WHERE doc_key = ?', retagged)
+                    conn.commit()
+            finally:
+                conn.close()
+            self._loaded = True
+            logger.info(f"Resume index loaded: {len(self._doc_stamp)} documents ({len(retagged)} re-tagged)")
+
+    def _index_document(self, doc_key, tokens, stamp):
+        doc_id = self._doc_ids.get(doc_key)
+        if doc_id is None:
+            doc_id = len(self._doc_keys)
+            self._doc_ids[doc_key] = doc_id
+            self._doc_keys.append(doc_key)
+            self._doc_len.append(0)
+            self._doc_terms.append(set())
+        else:
+            for term in self._doc_terms[doc_id]:
+                self._postings[term].pop(doc_id, None)
+            self._total_len -= self._doc_len[doc_id]
+
+        positions = defaultdict(list)
+        for i, term in enumerate(tokens):
+            positions[term].append(i)
+        for term, term_positions in positions.items():
+            self._postings[term][doc_id] = term_positions
+        self._doc_terms[doc_id] = set(positions)
+        self._doc_len[doc_id] = len(tokens)
+        self._total_len += len(tokens)
+        self._doc_stamp[doc_key] = stamp
+
+    def sync(self, files):
+        """
+        Make sure every (doc_key, path) pair is indexed, extracting text only
+        for files that are new or changed since they were last indexed.
+        """
+        self._ensure_loaded()
+        stale = []
+        with self._lock:
+            for doc_key, path in files:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if self._doc_stamp.get(doc_key) == stamp:
+                    metrics.record_cache("resume_text", hit=True)
+                else:
+                    metrics.record_cache("resume_text", hit=False)
+                    stale.append((doc_key, path, stamp))
+
+        if not stale:
+            return
+        extracted = [(doc_key, extract_pdf_text(path), stamp) for doc_key, path, stamp in stale]
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                for doc_key, text, stamp in extracted:
+                    tokens = tokenize(text)
+                    tags = self._tag(tokens)
+                    conn.execute(
+                        'INSERT OR REPLACE INTO resume_text (doc_key, mtime_ns, size, text, tokens, tags, tag_version) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (doc_key, stamp[0], stamp[1], text, " ".join(tokens), ",".join(sorted(tags)), self.tagger_version)
+                    )
+                    self._index_document(doc_key, tokens, stamp)
+                    self._doc_tags[doc_key] = tags
+                conn.commit()
+            finally:
+                conn.close()
+        logger.info(f"Indexed {len(extracted)} new or changed resumes")
+
+    def forget(self, doc_keys):
+        """Drop documents from the index and the token store (e.g. after their files were renamed)"""
+        self._ensure_loaded()
+        doc_keys = [k for k in doc_keys if k in self._doc_ids]
+        if not doc_keys:
+            return
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.executemany('DELETE FROM resume_text WHERE doc_key = ?', [(k,) for k in doc_keys])
+                conn.commit()
+            finally:
+                conn.close()
+            for doc_key in doc_keys:
+                doc_id = self._doc_ids.pop(doc_key)
+                for term in self._doc_terms[doc_id]:
+                    self._postings[term].pop(doc_id, None)
+                self._doc_terms[doc_id] = set()
+                self._total_len -= self._doc_len[doc_id]
+                self._doc_len[doc_id] = 0
+                self._doc_keys[doc_id] = None
+                self._doc_stamp.pop(doc_key, None)
+                self._doc_tags.pop(doc_key, None)
+
+    def tags(self, doc_key):
+        """Tags stored for a document at ingest (empty if it is not indexed)"""
+        self._ensure_loaded()
+        return self._doc_tags.get(doc_key, frozenset())
+
+    # ---- evaluation ----
+    def _phrase_positions(self, terms, doc_id):
+        """Start positions where `terms` occur consecutively in a document"""
+        first = self._postings.get(terms[0], {}).get(doc_id)
+        if not first:
+            return []
+        following = []
+        for term in terms[1:]:
+            term_positions = self._postings.get(term, {}).get(doc_id)
+            if not term_positions:
+                return []
+            following.append(set(term_positions))
+        return [p for p in first if all((p + i + 1) in s for i, s in enumerate(following))]
+
+    def _leaf_frequencies(self, node):
+        """{doc id: frequency} for a term or phrase node"""
+        if node.kind == "term":
+            return {doc_id: len(p) for doc_id, p in self._postings.get(node.value, {}).items()}
+        candidates = None
+        for term in node.value:
+            docs = set(self._postings.get(term, {}))
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return {}
+        freqs = {}
+        for doc_id in candidates:
+            count = len(self._phrase_positions(node.value, doc_id))
+            if count:
+                freqs[doc_id] = count
+        return freqs
+
+    def _evaluate(self, node, universe, leaf_freqs):
+        if node.kind in ("term", "phrase"):
+            return set(leaf_freqs[id(node)]) & universe
+        if node.kind == "not":
+            return universe - self._evaluate(node.children[0], universe, leaf_freqs)
+        results = [self._evaluate(child, universe, leaf_freqs) for child in node.children]
+        if node.kind == "and":
+            return set.intersection(*results)
+        return set.union(*results)
+
+    def search(self, query, doc_keys=None):
+        """
+        Run a parsed query (QueryNode) and return hits sorted by BM25 score.
+
+        Args:
+            query: QueryNode from parse_query()
+            doc_keys: restrict matches to these documents (default: all)
+
+        Returns:
+            list of dicts: {doc_key, score, term_matches}
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if doc_keys is None:
+                universe = set(self._doc_ids.values())
+            else:
+                universe = {self._doc_ids[k] for k in doc_keys if k in self._doc_ids}
+            if not universe:
+                return []
+
+            leaves = []
+            stack = [query]
+            while stack:
+                node = stack.pop()
+                if node.kind in ("term", "phrase"):
+                    leaves.append(node)
+                stack.extend(node.children)
+            leaf_freqs = {id(leaf): self._leaf_frequencies(leaf) for leaf in leaves}
+            matched = self._evaluate(query, universe, leaf_freqs)
+
+            n_docs = len(self._doc_ids)
+            avgdl = (self._total_len / n_docs) if n_docs else 0.0
+            scoring = []
+            for leaf in query.positive_leaves():
+                freqs = leaf_freqs[id(leaf)]
+                df = len(freqs)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                scoring.append((leaf.label, freqs, idf))
+
+            hits = []
+            for doc_id in matched:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * (self._doc_len[doc_id] / avgdl if avgdl else 0))
+                score = 0.0
+                term_matches = {}
+                for label, freqs, idf in scoring:
+                    tf = freqs.get(doc_id)
+                    if tf:
+                        score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        term_matches[label] = tf
+                hits.append({"doc_key": self._doc_keys[doc_id], "score": score, "term_matches": term_matches})
+
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits
+
+    def snippets(self, doc_keys, query):
+        """{doc_key: [html snippet, ...]} with matched terms wrapped in <mark>"""
+        if not doc_keys:
+            return {}
+        highlight = set()
+        for leaf in query.positive_leaves():
+            highlight.update(leaf.value if leaf.kind == "phrase" else [leaf.value])
+
+        texts = {}
+        conn = self._connect()
+        try:
+            keys = list(doc_keys)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for doc_key, text in conn.execute(
+                        f'SELECT doc_key, text FROM resume_text WHERE doc_key IN ({placeholders})', chunk):
+                    texts[doc_key] = text
+        finally:
+            conn.close()
+        return {doc_key: make_snippets(text, highlight) for doc_key, text in texts.items()}
+
+
+def make_snippets(text, highlight, radius=SNIPPET_RADIUS, limit=MAX_SNIPPETS):
+    """Cut up to `limit` windows of text around highlighted tokens, HTML-escaped"""
+    matches = [m for m in TOKEN_RE.finditer(text) if m.group().lower() in highlight]
+    snippets = []
+    window_end = -1
+    for m in matches:
+        if m.start() < window_end:
+            continue
+        start = max(0, m.start() - radius)
+        end = min(len(text), m.end() + radius)
+        parts = []
+        cursor = start
+        for inner in matches:
+            if inner.start() < start or inner.end() > end:
+                continue
+            parts.append(html.escape(text[cursor:inner.start()]))
+            parts.append(f"<mark>{html.escape(inner.group())}</mark>")
+            cursor = inner.end()
+        parts.append(html.escape(text[cursor:end]))
+        snippet = " ".join("".join(parts).split())
+        snippets.append(("…" if start > 0 else "") + snippet + ("…" if end < len(text) else ""))
+        window_end = end
+        if len(snippets) >= limit:
+            break
+    return snippets
+
+
+def extract_pdf_text(path):
+    """Extract the text layer of a PDF ('' if it cannot be read)"""
+    from pypdf import PdfReader
+
+    try:
+        with metrics.PDF_EXTRACT_DURATION.time():
+            reader = PdfReader(path)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except Exception as e:
+        logger.warning(f"Error reading PDF {os.path.basename(path)}: {e}")
+        return ""
@@ -0,0 +1,184 @@
+"""
+Content-addressed resume storage.
+
+Uploads are streamed to a temporary file in the upload folder while being
+hashed and size-checked (UploadSpool is installed as the request's file
+stream, so werkzeug writes multipart parts straight into it), then kept
+once under "<sha256><ext>". A candidate's 'Resume' column holds that blob
+name, so every candidate who uploads the same PDF points at the same file,
+the same extracted text and the same search hit.
+
+Older uploads named "<timestamp>_<original name>" are folded into blobs by
+adopt_file() (see migrate_resume_uploads() in app.py, run with
+`flask --app app migrate-resumes`).
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+BLOB_NAME_RE = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]{1,8})?$")
+_EXTENSION_RE = re.compile(r"^\.[a-z0-9]{1,8}$")
+
+
+def blob_digest(filename):
+    """SHA-256 hex digest encoded in a blob name, or None for other filenames"""
+    match = BLOB_NAME_RE.match(os.path.basename(filename or ""))
+    return match.group(1) if match else None
+
+
+def blob_name(digest, original_filename):
+    extension = os.path.splitext(original_filename or "")[1].lower()
+    if not _EXTENSION_RE.match(extension):
+        extension = ".pdf"
+    return digest + extension
+
+
+def _commit(temp_path, folder, name):
+    """Move a fully written temp file to its blob name; drop it if the blob already exists"""
+    target = os.path.join(folder, name)
+    if os.path.exists(target):
+        os.remove(temp_path)
+        metrics.record_cache("resume_blob", hit=True)
+        return False
+    os.replace(temp_path, target)
+    metrics.record_cache("resume_blob", hit=False)
+    return True
+
+
+class UploadTooLarge(RequestEntityTooLarge):
+    description = "Resume file is too large."
+
+
+class UploadSpool:
+    """
+    Writable temp file that hashes and counts bytes as they are written.
+
+    Used as werkzeug's upload stream: each multipart chunk goes straight to
+    disk, so memory per upload stays constant. save_upload() renames the
+    spool into the blob store without copying; an unclaimed spool deletes
+    itself when the request closes its files.
+    """
+
+    def __init__(self, folder, max_bytes=None):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix=".upload-", suffix=".part", dir=folder)
+        self._file = os.fdopen(fd, "w+b")
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._claimed = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            # werkzeug drops a part that fails mid-parse without closing it
+            self.close()
+            raise UploadTooLarge()
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+    def claim(self, original_filename):
+        """Move the spooled file into the blob store; returns (blob name, created)"""
+        self._file.close()
+        self._claimed = True
+        name = blob_name(self.hexdigest(), original_filename)
+        return name, _commit(self.path, self.folder, name)
+
+    def close(self):
+        self._file.close()
+        if not self._claimed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __del__(self):
+        # Last resort for spools abandoned by an aborted request
+        if "_file" in self.__dict__:
+            self.close()
+
+    def __getattr__(self, name):
+        # read/readline/seek/tell/... come from the underlying file
+        return getattr(self._file, name)
+
+
+def save_upload(stream, original_filename, folder):
+    """
+    Store an uploaded file by content.
+
+    Args:
+        stream: readable binary file object (e.g. FileStorage.stream); an
+            UploadSpool in `folder` is renamed into place without a copy
+        original_filename: client filename, only used for the extension
+        folder: upload folder
+
+    Returns:
+        (blob name, created): created is False when an identical file was already stored
+    """
+    if isinstance(stream, UploadSpool) and os.path.samefile(stream.folder, folder):
+        name, created = stream.claim(original_filename)
+        if created:
+            logger.info(f"Stored resume blob {name} ({original_filename})")
+        return name, created
+
+    os.makedirs(folder, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(prefix=".upload-", suffix=".part", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        name = blob_name(digest.hexdigest(), original_filename)
+        created = _commit(temp_path, folder, name)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if created:
+        logger.info(f"Stored resume blob {name} ({original_filename})")
+    return name, created
+
+
+def adopt_file(filename, folder):
+    """
+    Copy an existing non-addressed upload into the blob store.
+
+    The content is copied and the original left in place, so nothing is lost
+    if the caller fails before it has saved the references to the blob; the
+    caller removes the original afterwards.
+
+    Returns:
+        the blob name the file's content now lives under
+    """
+    if blob_digest(filename):
+        return filename
+    path = os.path.join(folder, filename)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    name = blob_name(digest.hexdigest(), filename)
+    if not os.path.exists(os.path.join(folder, name)):
+        fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".adopt-")
+        os.close(fd)
+        try:
+            shutil.copyfile(path, temp_path)
+            _commit(temp_path, folder, name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return name
@@ -0,0 +1,355 @@
+"""
+Cache shared by every worker process.
+
+Each gunicorn worker used to keep its own Guhatek token and would keep its
+own copy of the applicant list, so N workers meant N token fetches and N
+full downloads. The backends here are visible to all workers:
+
+    sqlite  a SQLite file in WAL mode (default; all workers on one node)
+    redis   any server speaking the Redis protocol (all nodes), through
+            the small RESP client below, so no client package is needed
+    memory  a per-process dict (tests, single-process runs)
+
+SharedCache.get_or_compute() adds single-flight loading: when a key is
+missing, one worker takes a short lock entry and computes the value while
+the others wait for it, so a cold key is fetched once per cache rather
+than once per worker. invalidate() drops a key and bumps its generation;
+a computation that started before the bump does not store its result, so
+a list fetched just before a write cannot be cached after it. Backend
+errors are logged and treated as misses.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import unquote, urlparse
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+LOCK_SUFFIX = ":lock"
+GENERATION_SUFFIX = ":gen"
+# Seconds a generation marker is kept; it only has to outlive a computation
+GENERATION_TTL = 86400
+
+
+# ============================================
+# Backends: bytes in, bytes out, TTL in seconds
+# ============================================
+class MemoryBackend:
+    """Per-process dict; nothing is shared"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+
+    def add(self, key, value, ttl):
+        """Set only if absent; True when this call stored the value"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                return False
+            self._entries[key] = (value, time.time() + ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """
+    Entries in a SQLite file shared by the processes on one node. WAL mode
+    lets readers proceed while a worker writes.
+    """
+
+    PURGE_EVERY = 100  # sets between deletions of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires REAL NOT NULL
+            )
+        ''')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            'SELECT value FROM cache WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._conn()
+        now = time.time()
+        conn.execute('INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)', (key, value, now + ttl))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            conn.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+
+    def add(self, key, value, ttl):
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM cache WHERE key = ? AND expires <= ?', (key, now))
+            added = conn.execute(
+                'INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)', (key, value, now + ttl)
+            ).rowcount
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return bool(added)
+
+    def delete(self, key):
+        self._conn().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBackend:
+    """
+    Minimal Redis protocol (RESP2) client: GET, SET with PX/NX and DEL.
+    URL form: redis://[:password@]host[:port][/db]. One connection per thread.
+    """
+
+    def __init__(self, url, timeout=2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._local.sock = sock
+        self._local.reader = sock.makefile('rb')
+        try:
+            if self.password:
+                self._command('AUTH', self.password)
+            if self.db:
+                self._command('SELECT', str(self.db))
+        except BaseException:
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                self._local.reader.close()
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _read_reply(self):
+        line = self._local.reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Connection closed by Redis server')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._local.reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f'Unexpected reply type {kind!r}')
+
+    def _command(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self._local.sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _call(self, *args):
+        if getattr(self._local, 'sock', None) is None:
+            self._connect()
+        try:
+            return self._command(*args)
+        except (OSError, ConnectionError):
+            # Stale connection (server restart, idle timeout): reconnect once
+            self._disconnect()
+            self._connect()
+            return self._command(*args)
+
+    def get(self, key):
+        return self._call('GET', key)
+
+    def set(self, key, value, ttl):
+        self._call('SET', key, value, 'PX', str(max(1, int(ttl * 1000))))
+
+    def add(self, key, value, ttl):
+        return self._call('SET', key, value, 'PX', str(max(1, int(ttl * 1000))), 'NX') == 'OK'
+
+    def delete(self, key):
+        self._call('DEL', key)
+
+
+def create_backend(backend, url=None):
+    """Backend from config: 'sqlite' (url = file path), 'redis' (url = redis://...) or 'memory'"""
+    backend = (backend or 'sqlite').lower()
+    if backend == 'memory':
+        return MemoryBackend()
+    if backend == 'sqlite':
+        return SQLiteBackend(url or os.path.join('database', 'cache.db'))
+    if backend == 'redis':
+        return RedisBackend(url or 'redis://localhost:6379/0')
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+# ============================================
+# Cache front end
+# ============================================
+class SharedCache:
+    """
+    JSON values over a shared backend.
+
+    Args:
+        backend: MemoryBackend / SQLiteBackend / RedisBackend
+        prefix: namespace for every key (several apps can share one server)
+    """
+
+    def __init__(self, backend, prefix='portal:'):
+        self.backend = backend
+        self.prefix = prefix
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def get(self, key):
+        try:
+            raw = self.backend.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache get {key} failed: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        try:
+            self.backend.set(self._key(key), json.dumps(value).encode('utf-8'), ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache set {key} failed: {e}")
+
+    def delete(self, key):
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache delete {key} failed: {e}")
+
+    def generation(self, key):
+        """Opaque marker that changes each time `key` is invalidated (None before the first time)"""
+        try:
+            return self.backend.get(self._key(key + GENERATION_SUFFIX))
+        except Exception as e:
+            logger.warning(f"Shared cache generation {key} failed: {e}")
+            return None
+
+    def invalidate(self, key):
+        """Delete `key` and keep results computed before this call from being stored"""
+        try:
+            self.backend.set(self._key(key + GENERATION_SUFFIX), os.urandom(8).hex().encode('ascii'),
+                             GENERATION_TTL)
+        except Exception as e:
+            logger.warning(f"Shared cache generation bump {key} failed: {e}")
+        self.delete(key)
+
+    def get_or_compute(self, key, ttl, compute, lock_timeout=30, poll_interval=0.05):
+        """
+        Cached value of `key`, or compute() stored for `ttl` seconds.
+
+        Only one caller at a time computes a missing key; the others wait up
+        to `lock_timeout` seconds for its result before computing themselves.
+        The result is returned but not stored if the key was invalidated
+        while it was computed.
+        """
+        value = self.get(key)
+        if value is not None:
+            metrics.record_cache(f"shared_{key}", hit=True)
+            return value
+        metrics.record_cache(f"shared_{key}", hit=False)
+
+        lock_key = self._key(key + LOCK_SUFFIX)
+        try:
+            owner = self.backend.add(lock_key, b'1', lock_timeout)
+        except Exception as e:
+            logger.warning(f"Shared cache lock {key} failed: {e}")
+            owner = True
+        if not owner:
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(poll_interval)
+                value = self.get(key)
+                if value is not None:
+                    return value
+                try:
+                    if self.backend.get(lock_key) is None:
+                        break  # the loader gave up; compute here
+                except Exception:
+                    break
+        try:
+            generation = self.generation(key)
+            value = compute()
+            if value is not None:
+                if self.generation(key) == generation:
+                    self.set(key, value, ttl)
+                else:
+                    logger.info(f"Shared cache {key} was invalidated while it was computed; not storing it")
+            return value
+        finally:
+            if owner:
+                try:
+                    self.backend.delete(lock_key)
+                except Exception as e:
+                    logger.warning(f"Shared cache unlock {key} failed: {e}")
@@ -0,0 +1,229 @@
+"""
+Streaming, column-projected reader for the candidate workbook.
+
+openpyxl builds a Python object for every cell of every row, even in
+read-only mode, which is most of the cost of load_data(). Reports that need
+a handful of columns read the worksheet XML directly instead: the sheet is
+decompressed in blocks cut at row boundaries, and a pattern compiled for
+the requested columns picks out only their cells, so the other columns
+never reach Python code. Shared strings are resolved afterwards, keeping
+only the ones those cells use.
+
+Values come back as text, the way save_data() writes them: shared and
+inline strings as stored, numbers as their literal ("9876543210"), booleans
+as "TRUE"/"FALSE". Styles are not read, so a cell Excel stores as a date
+comes back as its serial number (see excel_serial_to_datetime()). Cells
+must carry their reference (r="B12"), as Excel and openpyxl always write.
+"""
+
+import html
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from xml.etree import ElementTree
+
+BLOCK_SIZE = 1024 * 1024
+
+_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Element names may carry a namespace prefix (<x:c>) in files from other writers;
+# it is read from the root element so the patterns below can be literal
+_ROOT_PREFIX = re.compile(rb'<(\w+:)?(?:worksheet|sst)\b')
+_TYPE = re.compile(rb'\st="(\w+)"')
+
+
+class _Patterns:
+    """Compiled patterns for one namespace prefix (b'' or e.g. b'x:')"""
+
+    _cache = {}
+
+    def __new__(cls, prefix):
+        patterns = cls._cache.get(prefix)
+        if patterns is None:
+            patterns = cls._cache[prefix] = super().__new__(cls)
+            p = re.escape(prefix)
+            patterns.prefix = prefix
+            patterns.row_start = re.compile(rb'<' + p + rb'row r="(\d+)"')
+            patterns.value = re.compile(rb'<' + p + rb'v>(.*?)</' + p + rb'v>', re.S)
+            patterns.text = re.compile(rb'<' + p + rb't(?:\s[^>]*)?>(.*?)</' + p + rb't>', re.S)
+            patterns.phonetic = re.compile(rb'<' + p + rb'rPh\b.*?</' + p + rb'rPh>', re.S)
+            patterns.shared_string = re.compile(rb'<' + p + rb'si(?:\s*/>|>(.*?)</' + p + rb'si>)', re.S)
+        return patterns
+
+    def cells(self, columns=None):
+        """Cells (with content) in the given column letters: groups column, row, attributes, content"""
+        letters = b'|'.join(column.encode('ascii') for column in columns) if columns else rb'[A-Z]+'
+        p = re.escape(self.prefix)
+        return re.compile(rb'<' + p + rb'c r="(' + letters + rb')(\d+)"([^>/]*)>(.*?)</' + p + rb'c>', re.S)
+
+
+def excel_serial_to_datetime(value):
+    """datetime of an Excel date serial ('45650' or '45650.5'), or None"""
+    try:
+        serial = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not 1 <= serial < 2958466:
+        return None
+    return _EXCEL_EPOCH + timedelta(days=serial)
+
+
+def _text(raw):
+    text = raw.decode('utf-8')
+    return html.unescape(text) if '&' in text else text
+
+
+def _sheet_path(zf, sheet_name):
+    """Path inside the package of the worksheet called `sheet_name` (the first sheet if absent)"""
+    workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+    target_id = None
+    for sheet in workbook.find(_MAIN + 'sheets'):
+        if target_id is None or sheet.get('name') == sheet_name:
+            target_id = sheet.get(_REL + 'id')
+            if sheet.get('name') == sheet_name:
+                break
+    rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(_PKG_REL + 'Relationship'):
+        if rel.get('Id') == target_id:
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    raise KeyError(f"Worksheet {sheet_name!r} not found")
+
+
+def _blocks(source, end_tag):
+    """
+    Decompressed XML in blocks that end right after an `end_tag` (the last block
+    excepted), with the _Patterns for the document's namespace prefix.
+    """
+    pending = source.read(BLOCK_SIZE)
+    root = _ROOT_PREFIX.search(pending)
+    patterns = _Patterns(root.group(1) or b'' if root else b'')
+    end_tag = b'</' + patterns.prefix + end_tag + b'>'
+    while pending:
+        chunk = source.read(BLOCK_SIZE)
+        if not chunk:
+            yield patterns, pending
+            return
+        pending += chunk
+        cut = pending.rfind(end_tag)
+        if cut >= 0:
+            cut += len(end_tag)
+            yield patterns, pending[:cut]
+            pending = pending[cut:]
+
+
+def _shared_strings(zf, wanted):
+    """{index: text} of the shared strings whose index is in `wanted`"""
+    strings = {}
+    if not wanted:
+        return strings
+    try:
+        source = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return strings
+    last_wanted = max(wanted)
+    index = 0
+    with source:
+        for patterns, block in _blocks(source, b'si'):
+            for match in patterns.shared_string.finditer(block):
+                if index in wanted:
+                    content = match.group(1) or b''
+                    if content.startswith(b'<t') and content.endswith(b'</t>') and content.count(b'<t') == 1:
+                        # Plain <t>text</t>, by far the most common form
+                        strings[index] = _text(content[content.index(b'>') + 1:-4])
+                        index += 1
+                        continue
+                    if b'rPh' in content:
+                        content = patterns.phonetic.sub(b'', content)
+                    strings[index] = _text(b''.join(patterns.text.findall(content)))
+                index += 1
+            if index > last_wanted:
+                break
+    return strings
+
+
+def _cell_value(patterns, attributes, content):
+    """Cell value from its attributes and inner XML; shared strings as their int index"""
+    if attributes.endswith(b' t="s"') and content.startswith(b'<v>'):
+        return int(content[3:-4])
+    kind = _TYPE.search(attributes)
+    kind = kind.group(1) if kind else b'n'
+    if kind == b'inlineStr':
+        if content.startswith(b'<is><t>') and content.endswith(b'</t></is>') and content.count(b'<t') == 1:
+            return _text(content[7:-9])
+        return _text(b''.join(patterns.text.findall(content)))
+    value = patterns.value.search(content)
+    if value is None:
+        return None
+    value = value.group(1)
+    if kind == b's':
+        return int(value)
+    if kind == b'b':
+        return 'TRUE' if value == b'1' else 'FALSE'
+    return _text(value)
+
+
+def read_columns(path, sheet_name=None, columns=None):
+    """
+    Read selected columns of a worksheet.
+
+    Args:
+        path: .xlsx file
+        sheet_name: worksheet to read (default: the first one)
+        columns: header names to keep (default: all columns)
+
+    Returns:
+        (headers, {header: [value or None per data row]}); requested columns
+        missing from the sheet are left out. Row i of each list is sheet row i + 2.
+    """
+    with zipfile.ZipFile(path) as zf:
+        with zf.open(_sheet_path(zf, sheet_name)) as source:
+            header_cells = {}
+            cells = []          # (column letters, row number, value)
+            last_row = 1
+            pattern = None
+            for patterns, block in _blocks(source, b'row'):
+                if pattern is None:
+                    # Header row first: its names decide which columns are scanned
+                    for match in patterns.cells().finditer(block):
+                        if match.group(2) != b'1':
+                            break
+                        header_cells[match.group(1).decode('ascii')] = _cell_value(patterns, match.group(3), match.group(4))
+                    names = _shared_strings(zf, {v for v in header_cells.values() if v.__class__ is int})
+                    header_cells = {
+                        letters: str(names.get(value, '') if value.__class__ is int else value or '').strip()
+                        for letters, value in header_cells.items()
+                    }
+                    keep = {}
+                    for letters, name in sorted(header_cells.items(), key=lambda item: (len(item[0]), item[0])):
+                        # A repeated header: the first column is used
+                        if name and (columns is None or name in columns) and name not in keep.values():
+                            keep[letters] = name
+                    if not keep:
+                        break
+                    pattern = patterns.cells(keep)
+                rows = patterns.row_start.findall(block)
+                if rows:
+                    last_row = max(last_row, int(rows[-1]))
+                for match in pattern.finditer(block):
+                    row = int(match.group(2))
+                    if row > 1:
+                        value = _cell_value(patterns, match.group(3), match.group(4))
+                        if value is not None and value != '':
+                            cells.append((match.group(1), row, value))
+        strings = _shared_strings(zf, {value for _, _, value in cells if value.__class__ is int})
+
+    ordered = sorted(header_cells, key=lambda letters: (len(letters), letters))
+    headers = [header_cells[letters] for letters in ordered if header_cells[letters]]
+    if pattern is None:
+        return headers, {}
+    size = last_row - 1
+    result = {name: [None] * size for name in keep.values()}
+    by_letters = {letters.encode('ascii'): result[name] for letters, name in keep.items()}
+    for letters, row, value in cells:
+        by_letters[letters][row - 2] = strings.get(value) if value.__class__ is int else value
+    return headers, result
@@ -0,0 +1,93 @@
+"""
+Skill taxonomy for resume facets.
+
+Each canonical skill lists the spellings that map to it (the canonical name
+only matches resume text when it is listed, so "go" the verb is not a
+skill but "golang" is). Spellings are
+tokenized with the resume index tokenizer, so multi-word forms ("google
+cloud", "ci/cd") match consecutive tokens. Bump SKILL_TAXONOMY_VERSION when
+the taxonomy changes; stored resumes are then re-tagged from their saved
+tokens without re-reading the PDFs.
+"""
+
+from resume_index import tokenize
+
+SKILL_TAXONOMY_VERSION = 1
+
+SKILL_TAXONOMY = {
+    "kubernetes": ["kubernetes", "k8s", "kube", "kubectl", "openshift"],
+    "docker": ["docker", "containerd", "podman"],
+    "helm": ["helm"],
+    "terraform": ["terraform", "tf", "opentofu"],
+    "ansible": ["ansible"],
+    "aws": ["aws", "amazon web services", "ec2", "eks", "cloudformation"],
+    "azure": ["azure", "aks"],
+    "gcp": ["gcp", "google cloud", "gke"],
+    "linux": ["linux", "rhel", "ubuntu", "centos"],
+    "bash": ["bash", "shell scripting", "shell script"],
+    "python": ["python", "python3", "django", "flask", "fastapi"],
+    "java": ["java", "spring boot", "springboot"],
+    "go": ["golang", "go lang"],
+    "javascript": ["javascript", "js", "typescript", "node js", "nodejs"],
+    "react": ["react", "reactjs", "react js"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp", "dotnet", "net core"],
+    "sql": ["sql", "mysql", "postgresql", "postgres", "oracle db", "t sql"],
+    "kafka": ["kafka"],
+    "ci/cd": ["ci cd", "cicd", "continuous integration", "continuous delivery"],
+    "jenkins": ["jenkins"],
+    "github actions": ["github actions"],
+    "gitlab ci": ["gitlab ci", "gitlab"],
+    "git": ["git"],
+    "prometheus": ["prometheus"],
+    "grafana": ["grafana"],
+    "elk": ["elk", "elasticsearch", "logstash", "kibana", "opensearch"],
+    "splunk": ["splunk"],
+    "datadog": ["datadog"],
+    "selenium": ["selenium"],
+    "playwright": ["playwright"],
+    "jmeter": ["jmeter"],
+    "performance testing": ["performance testing", "load testing", "gatling", "locust", "k6"],
+    "sap": ["sap", "abap", "s 4hana", "s4hana"],
+    "machine learning": ["machine learning", "ml", "scikit learn", "sklearn"],
+    "deep learning": ["deep learning", "neural networks"],
+    "pytorch": ["pytorch", "torch"],
+    "tensorflow": ["tensorflow", "keras"],
+    "siem": ["siem", "soc", "security operations"],
+    "sre": ["sre", "site reliability", "site reliability engineering"],
+}
+
+MAX_PHRASE_TOKENS = 3
+
+
+def _build_lookup():
+    lookup = {}
+    for canonical, spellings in SKILL_TAXONOMY.items():
+        for spelling in spellings:
+            key = tuple(tokenize(spelling))
+            if key and len(key) <= MAX_PHRASE_TOKENS:
+                lookup[key] = canonical
+    return lookup
+
+
+_SKILL_LOOKUP = _build_lookup()
+
+
+def extract_skills(tokens):
+    """Return the set of canonical skills mentioned in a token list"""
+    found = set()
+    for i in range(len(tokens)):
+        for n in range(MAX_PHRASE_TOKENS, 0, -1):
+            canonical = _SKILL_LOOKUP.get(tuple(tokens[i:i + n]))
+            if canonical:
+                found.add(canonical)
+                break
+    return found
+
+
+def canonical_skill(name):
+    """Map a user-typed skill ("k8s", "Google Cloud") to its canonical name, or None"""
+    name = (name or "").strip().lower()
+    if name in SKILL_TAXONOMY:
+        return name
+    return _SKILL_LOOKUP.get(tuple(tokenize(name)))
@@ -176,13 +176,9 @@ document.addEventListener('DOMContentLoaded', function () {
     if (window.location.pathname === '/analytics') {
         fetchAnalyticsData();
     }
-    // Load dropdown options first
-    fetchDropdownOptions().then(() => {
-        populateStatusFilterOptions();
-        // Then load data
-        fetchData().then(() => {
-            populateYearFilter(); // Populate year filter after data is fetched
-        });
+    // Dropdowns, role and the first page of candidates in one request
+    loadBootstrap().then(() => {
+        populateYearFilter(); // Populate year filter after data is fetched
     });
 
     // Log that DOM is loaded and check for elements
@@ -916,11 +912,86 @@ function populateStatusFilterOptions() {
     }
 }
 
+// Load the page with a single /api/bootstrap request; the rest of the
+// candidates (if any) follow from /api/data once the first page is shown
+async function loadBootstrap() {
+    try {
+        const response = await fetch(API_BASE_URL + '/api/bootstrap');
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const bootstrap = await response.json();
+
+        // Merge server options with predefined options
+        dropdownOptions = { ...bootstrap.dropdowns, ...PREDEFINED_DROPDOWNS };
+        populateStatusFilterOptions();
+        showCandidates(bootstrap.data, bootstrap.is_admin);
+
+        if (bootstrap.total > bootstrap.data.length) {
+            return fetchRemainingData(bootstrap.data, bootstrap.version);
+        }
+        openHighlightedCandidate();
+    } catch (error) {
+        console.error('Error loading bootstrap data:', error);
+        // Fall back to the separate requests
+        await fetchDropdownOptions();
+        populateStatusFilterOptions();
+        return fetchData();
+    }
+}
+
+// Show a freshly loaded candidate list, keeping the current filters
+function showCandidates(data, is_admin) {
+    // Store original data when fetched from API
+    originalTableData = JSON.parse(JSON.stringify(data)); // Deep copy
+
+    currentIsAdmin = is_admin;
+    updateAdminControls(is_admin);
+    // Apply current filter if any
+    const positionFilterElement = document.getElementById('positionFilter');
+    const statusFilterElement = document.getElementById('statusFilter');
+    const hasPositionFilter = positionFilterElement && positionFilterElement.value;
+    const hasStatusFilter = statusFilterElement && statusFilterElement.value;
+    if (hasPositionFilter || hasStatusFilter) {
+        applyTableFilters();
+    } else {
+        populateTable(data, is_admin);
+    }
+}
+
+// Open the candidate selected on the Resume Filter page, if any
+function openHighlightedCandidate() {
+    const highlightInfo = sessionStorage.getItem('highlightCandidate');
+    if (highlightInfo) {
+        try {
+            const { index, name } = JSON.parse(highlightInfo);
+            // Clear the highlight info so it doesn't open again on refresh
+            sessionStorage.removeItem('highlightCandidate');
+
+            // Find candidate in originalTableData
+            let candidate = originalTableData[index];
+
+            // Verify candidate name matches (as index might change if data was deleted)
+            if (!candidate || candidate['Name'] !== name) {
+                candidate = originalTableData.find(c => c['Name'] === name);
+            }
+
+            if (candidate) {
+                // Small delay to ensure table is populated and modal can open correctly
+                setTimeout(() => {
+                    showCandidateDetails(candidate);
+                }, 500);
+            }
+        } catch (e) {
+            console.error('Error handling highlightCandidate:', e);
+        }
+    }
+}
+
 // Fetch data from the API
 function fetchData() {
-    // Add cache-busting parameter to prevent browser caching
-    const cacheBuster = `?_t=${new Date().getTime()}`;
-    return fetch(API_BASE_URL + '/api/data' + cacheBuster)
+    // /api/data is sent with Cache-Control: no-cache, so no cache buster is needed
+    return fetch(API_BASE_URL + '/api/data')
         .then(response => {
 
             if (!response.ok) {
@@ -930,50 +1001,30 @@ function fetchData() {
         })
         .then(responseData => {
             const { data, is_admin } = responseData;
+            showCandidates(data, is_admin);
+            openHighlightedCandidate();
+        })
+        .catch(error => {
+            console.error('Error fetching data:', error);
+            showNotification('Failed to load data. Please try again later.', 'error');
+        });
+}
 
-
-            // Store original data when fetched from API
-            originalTableData = JSON.parse(JSON.stringify(data)); // Deep copy
-
-            currentIsAdmin = is_admin;
-            updateAdminControls(is_admin);
-            // Apply current filter if any
-            const positionFilterElement = document.getElementById('positionFilter');
-            const statusFilterElement = document.getElementById('statusFilter');
-            const hasPositionFilter = positionFilterElement && positionFilterElement.value;
-            const hasStatusFilter = statusFilterElement && statusFilterElement.value;
-            if (hasPositionFilter || hasStatusFilter) {
-                applyTableFilters();
-            } else {
-                populateTable(data, is_admin);
-            }
-
-            // Check for highlight candidate from Resume Filter
-            const highlightInfo = sessionStorage.getItem('highlightCandidate');
-            if (highlightInfo) {
-                try {
-                    const { index, name } = JSON.parse(highlightInfo);
-                    // Clear the highlight info so it doesn't open again on refresh
-                    sessionStorage.removeItem('highlightCandidate');
-
-                    // Find candidate in originalTableData
-                    let candidate = originalTableData[index];
-
-                    // Verify candidate name matches (as index might change if data was deleted)
-                    if (!candidate || candidate['Name'] !== name) {
-                        candidate = originalTableData.find(c => c['Name'] === name);
-                    }
-
-                    if (candidate) {
-                        // Small delay to ensure table is populated and modal can open correctly
-                        setTimeout(() => {
-                            showCandidateDetails(candidate);
-                        }, 500);
-                    }
-                } catch (e) {
-                    console.error('Error handling highlightCandidate:', e);
-                }
+// Fetch the candidates after the first page from /api/data. The server sends the
+// whole list instead (offset 0) when it changed since the first page was loaded.
+function fetchRemainingData(firstPage, version) {
+    const params = new URLSearchParams({ offset: firstPage.length, version: version });
+    return fetch(API_BASE_URL + '/api/data?' + params)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
             }
+            return response.json();
+        })
+        .then(responseData => {
+            const { data, offset, is_admin } = responseData;
+            showCandidates(offset ? firstPage.concat(data) : data, is_admin);
+            openHighlightedCandidate();
         })
         .catch(error => {
             console.error('Error fetching data:', error);
@@ -2416,6 +2467,10 @@ function saveNewRecord() {
             if (data.status === 'success') {
                 const syncMsg = data.api_synced ? ' (synced to API)' : ' (saved locally)';
                 showNotification('Candidate added successfully!' + syncMsg, 'success');
+                if (data.duplicates && data.duplicates.length > 0) {
+                    const names = data.duplicates.map(d => `${d.name} (${d.matched_on.join(' & ')})`).join(', ');
+                    showNotification('Possible duplicate of: ' + names, 'warning');
+                }
                 // Log API sync status
                 console.log('Add candidate result:', data);
                 // Close modal first
@@ -2504,12 +2559,16 @@ function showNotification(message, type) {
     if (!notificationContainer) return;
 
     const notification = document.createElement('div');
-    notification.className = `alert alert-${type === 'success' ? 'success' : 'danger'} alert-dismissible fade show`;
+    const alertType = type === 'success' || type === 'warning' ? type : 'danger';
+    notification.className = `alert alert-${alertType} alert-dismissible fade show`;
     notification.role = 'alert';
-    notification.innerHTML = `
-        ${message}
-        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
-    `;
+    // The message may carry candidate data (names from the API), so it is set as text, never markup
+    notification.appendChild(document.createTextNode(message));
+    const closeButton = document.createElement('button');
+    closeButton.type = 'button';
+    closeButton.className = 'btn-close';
+    closeButton.setAttribute('data-bs-dismiss', 'alert');
+    notification.appendChild(closeButton);
 
     notificationContainer.appendChild(notification);
 
@@ -3728,16 +3787,10 @@ function updateMonthlyTrendsChart(data) {
     });
 }
 
-document.addEventListener('DOMContentLoaded', () => {
-    refreshData();
-});
-
 // Update the existing refreshData function to include analytics updates
 async function refreshData() {
     try {
-        // Add cache-busting parameter to prevent browser caching
-        const cacheBuster = `?_t=${new Date().getTime()}`;
-        const response = await fetch(API_BASE_URL + '/api/data' + cacheBuster);
+        const response = await fetch(API_BASE_URL + '/api/data');
         const data = await response.json();
 
 
@@ -0,0 +1,423 @@
+"""
+Append-only log of candidate status changes.
+
+update_data() overwrites 'Interview Status' and 'Application Status' in the
+workbook, so the sheet only ever holds the current stage. Every change is
+also appended here as (candidate, field, old -> new, user, time), which
+keeps the full history without snapshotting the sheet.
+
+Storage is a SQLite file. Candidate keys, field names, stage values and
+usernames are stored once in a `strings` table and referenced by integer
+id, so an event row is six integers. The aggregates behind the funnel and
+time-in-stage metrics (current stage per candidate, stages each candidate
+reached, time spent per stage, transition counts) are updated in the same
+transaction as each append, so reading the metrics never rescans the log.
+
+Screening fields are logged as "changed by <user>" events without their
+text, which stays in the sheet.
+
+A candidate's history is keyed by normalized email, which both the workbook
+and the Guhatek records carry. The workbook has no API id column, and most
+edits send only the API id. So link() keeps an API id -> key table, and
+resolve() turns an id back into the email key.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from duplicates import normalize_email
+
+logger = logging.getLogger(__name__)
+
+STATUS_FIELDS = ('Interview Status', 'Application Status')
+SCREENING_FIELDS = ('Initial Screening', 'Round 1 Remarks', 'Round 2 Remarks', 'Remarks')
+TRACKED_FIELDS = STATUS_FIELDS + SCREENING_FIELDS
+
+
+def email_key(record):
+    """History key of a record with an email address, or None"""
+    email = normalize_email((record or {}).get('Email ID') or (record or {}).get('EmailID'))
+    return f"email:{email}" if email else None
+
+
+def candidate_key(record=None, api_id=None, index=None):
+    """
+    Stable identity for a candidate's history: the normalized email when
+    known, else the Guhatek API id, else the sheet row.
+    """
+    key = email_key(record)
+    if key:
+        return key
+    api_id = api_id or (record or {}).get('_api_id')
+    if api_id:
+        return f"api:{api_id}"
+    return f"row:{index}" if index is not None else None
+
+
+def status_changes(before, after):
+    """(field, old, new) for the tracked fields that differ between two records"""
+    changes = []
+    for field in TRACKED_FIELDS:
+        if field not in after:
+            continue
+        old = str((before or {}).get(field) or '').strip()
+        new = str(after.get(field) or '').strip()
+        if old != new:
+            if field in SCREENING_FIELDS:
+                old, new = None, None
+            changes.append((field, old or None, new or None))
+    return changes
+
+
+class StatusEventLog:
+    """
+    Args:
+        db_path: SQLite file holding the events and their aggregates
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        if self._ready:
+            return conn
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS strings (
+                id INTEGER PRIMARY KEY,
+                value TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                candidate INTEGER NOT NULL,
+                field INTEGER NOT NULL,
+                old INTEGER,
+                new INTEGER,
+                user INTEGER,
+                ts INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_candidate ON events (candidate, ts);
+            CREATE INDEX IF NOT EXISTS events_field ON events (field, ts);
+
+            -- Aggregates maintained on append
+            CREATE TABLE IF NOT EXISTS current_stage (
+                candidate INTEGER NOT NULL,
+                field INTEGER NOT NULL,
+                value INTEGER,
+                since INTEGER NOT NULL,
+                PRIMARY KEY (candidate, field)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS reached (
+                candidate INTEGER NOT NULL,
+                field INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (field, value, candidate)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS stage_stats (
+                field INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                reached INTEGER NOT NULL DEFAULT 0,
+                exits INTEGER NOT NULL DEFAULT 0,
+                seconds INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (field, value)
+            ) WITHOUT ROWID;
+            -- Guhatek API id -> candidate key (see link())
+            CREATE TABLE IF NOT EXISTS api_ids (
+                api_id TEXT PRIMARY KEY,
+                candidate INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS transitions (
+                field INTEGER NOT NULL,
+                old INTEGER NOT NULL,
+                new INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (field, old, new)
+            ) WITHOUT ROWID;
+        ''')
+        self._ready = True
+        return conn
+
+    @staticmethod
+    def _string_id(conn, value):
+        if value is None:
+            return None
+        row = conn.execute('SELECT id FROM strings WHERE value = ?', (value,)).fetchone()
+        if row:
+            return row[0]
+        return conn.execute('INSERT INTO strings (value) VALUES (?)', (value,)).lastrowid
+
+    @staticmethod
+    def _lookup_id(conn, value):
+        row = conn.execute('SELECT id FROM strings WHERE value = ?', (value,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, candidate, changes, user=None, ts=None):
+        """
+        Append events for one candidate.
+
+        Args:
+            candidate: candidate key (see candidate_key())
+            changes: [(field, old value or None, new value or None), ...]
+            user: username making the change
+            ts: unix time (default now)
+
+        Returns:
+            number of events written
+        """
+        if not candidate or not changes:
+            return 0
+        ts = int(ts if ts is not None else time.time())
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    candidate_id = self._string_id(conn, candidate)
+                    user_id = self._string_id(conn, user)
+                    for field, old, new in changes:
+                        field_id = self._string_id(conn, field)
+                        old_id = self._string_id(conn, old)
+                        new_id = self._string_id(conn, new)
+                        conn.execute(
+                            'INSERT INTO events (candidate, field, old, new, user, ts) VALUES (?, ?, ?, ?, ?, ?)',
+                            (candidate_id, field_id, old_id, new_id, user_id, ts)
+                        )
+                        if field in STATUS_FIELDS:
+                            self._update_aggregates(conn, candidate_id, field_id, old_id, new_id, ts)
+            finally:
+                conn.close()
+        return len(changes)
+
+    @staticmethod
+    def _update_aggregates(conn, candidate_id, field_id, old_id, new_id, ts):
+        current = conn.execute(
+            'SELECT value, since FROM current_stage WHERE candidate = ? AND field = ?', (candidate_id, field_id)
+        ).fetchone()
+        # Time spent in the stage being left (unknown when the log starts mid-stage)
+        if current and current[0] is not None:
+            conn.execute('INSERT OR IGNORE INTO stage_stats (field, value) VALUES (?, ?)', (field_id, current[0]))
+            conn.execute(
+                'UPDATE stage_stats SET exits = exits + 1, seconds = seconds + ? WHERE field = ? AND value = ?',
+                (max(0, ts - current[1]), field_id, current[0])
+            )
+        source_id = current[0] if current else old_id
+        if source_id is not None and new_id is not None:
+            conn.execute(
+                'INSERT INTO transitions (field, old, new, count) VALUES (?, ?, ?, 1) '
+                'ON CONFLICT (field, old, new) DO UPDATE SET count = count + 1',
+                (field_id, source_id, new_id)
+            )
+        conn.execute(
+            'INSERT OR REPLACE INTO current_stage (candidate, field, value, since) VALUES (?, ?, ?, ?)',
+            (candidate_id, field_id, new_id, ts)
+        )
+        if new_id is not None:
+            added = conn.execute(
+                'INSERT OR IGNORE INTO reached (candidate, field, value) VALUES (?, ?, ?)',
+                (candidate_id, field_id, new_id)
+            ).rowcount
+            if added:
+                conn.execute(
+                    'INSERT INTO stage_stats (field, value, reached) VALUES (?, ?, 1) '
+                    'ON CONFLICT (field, value) DO UPDATE SET reached = reached + 1',
+                    (field_id, new_id)
+                )
+
+    def resolve(self, api_id):
+        """Candidate key linked to a Guhatek API id, or None"""
+        if not api_id:
+            return None
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    'SELECT s.value FROM api_ids a JOIN strings s ON s.id = a.candidate WHERE a.api_id = ?',
+                    (str(api_id),)
+                ).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+
+    def link(self, api_id, candidate):
+        """
+        Record that `api_id` belongs to `candidate`. Events logged earlier under
+        the bare "api:<id>" key (the email was not known then) move to `candidate`.
+        """
+        if not api_id or not candidate or self.resolve(api_id) == candidate:
+            return
+        stray = f"api:{api_id}"
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    candidate_id = self._string_id(conn, candidate)
+                    conn.execute('INSERT OR REPLACE INTO api_ids (api_id, candidate) VALUES (?, ?)',
+                                 (str(api_id), candidate_id))
+                    stray_id = self._lookup_id(conn, stray) if stray != candidate else None
+                    if stray_id is not None:
+                        conn.execute('UPDATE events SET candidate = ? WHERE candidate = ?', (candidate_id, stray_id))
+                        for table in ('current_stage', 'reached'):
+                            # The email key's own rows win where both have one
+                            conn.execute(f'UPDATE OR IGNORE {table} SET candidate = ? WHERE candidate = ?',
+                                         (candidate_id, stray_id))
+                            conn.execute(f'DELETE FROM {table} WHERE candidate = ?', (stray_id,))
+            finally:
+                conn.close()
+
+    def stray_api_ids(self):
+        """API ids that still have events under a bare "api:<id>" key (not yet linked)"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute('''
+                    SELECT substr(s.value, 5) FROM strings s
+                    WHERE s.value LIKE 'api:%' AND EXISTS (SELECT 1 FROM events e WHERE e.candidate = s.id)
+                ''').fetchall()
+            finally:
+                conn.close()
+        return {row[0] for row in rows}
+
+    def events(self, candidate=None, field=None, user=None, since=None, until=None, after_id=0, limit=100):
+        """
+        Events in log order, filtered on any combination of candidate key,
+        field, user and [since, until) unix times. Page with after_id=<last id>.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                clauses, params = ['e.id > ?'], [int(after_id or 0)]
+                for column, value in (('candidate', candidate), ('field', field), ('user', user)):
+                    if value is not None:
+                        value_id = self._lookup_id(conn, value)
+                        if value_id is None:
+                            return []
+                        clauses.append(f'e.{column} = ?')
+                        params.append(value_id)
+                if since is not None:
+                    clauses.append('e.ts >= ?')
+                    params.append(int(since))
+                if until is not None:
+                    clauses.append('e.ts < ?')
+                    params.append(int(until))
+                params.append(int(limit))
+                rows = conn.execute(f'''
+                    SELECT e.id, c.value, f.value, o.value, n.value, u.value, e.ts
+                    FROM events e
+                    JOIN strings c ON c.id = e.candidate
+                    JOIN strings f ON f.id = e.field
+                    LEFT JOIN strings o ON o.id = e.old
+                    LEFT JOIN strings n ON n.id = e.new
+                    LEFT JOIN strings u ON u.id = e.user
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY e.id
+                    LIMIT ?
+                ''', params).fetchall()
+            finally:
+                conn.close()
+        return [{
+            'id': row[0], 'candidate': row[1], 'field': row[2], 'old': row[3],
+            'new': row[4], 'user': row[5], 'timestamp': row[6]
+        } for row in rows]
+
+    def last_value(self, candidate, field):
+        """Most recent logged value of `field` for `candidate`, or None"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                candidate_id = self._lookup_id(conn, candidate)
+                field_id = self._lookup_id(conn, field)
+                if candidate_id is None or field_id is None:
+                    return None
+                row = conn.execute('''
+                    SELECT s.value FROM current_stage c LEFT JOIN strings s ON s.id = c.value
+                    WHERE c.candidate = ? AND c.field = ?
+                ''', (candidate_id, field_id)).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+
+    def last_activity(self):
+        """{candidate key: unix time of its latest logged change}"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute('''
+                    SELECT s.value, MAX(e.ts) FROM events e JOIN strings s ON s.id = e.candidate
+                    GROUP BY e.candidate
+                ''').fetchall()
+            finally:
+                conn.close()
+        return dict(rows)
+
+    def stage_metrics(self, field, stages=(), now=None):
+        """
+        Funnel and time-in-stage metrics for one status field, read from the
+        incrementally maintained aggregates.
+
+        Args:
+            field: 'Interview Status' or 'Application Status'
+            stages: pipeline order for the funnel; other logged values follow
+            now: unix time used for the age of current stages
+
+        Returns:
+            {"funnel": [...], "transitions": [...]}
+        """
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            conn = self._connect()
+            try:
+                field_id = self._lookup_id(conn, field)
+                if field_id is None:
+                    stats, current, transitions = [], [], []
+                else:
+                    stats = conn.execute('''
+                        SELECT s.value, t.reached, t.exits, t.seconds
+                        FROM stage_stats t JOIN strings s ON s.id = t.value WHERE t.field = ?
+                    ''', (field_id,)).fetchall()
+                    current = conn.execute('''
+                        SELECT s.value, COUNT(*), SUM(? - c.since)
+                        FROM current_stage c JOIN strings s ON s.id = c.value
+                        WHERE c.field = ? GROUP BY c.value
+                    ''', (now, field_id)).fetchall()
+                    transitions = conn.execute('''
+                        SELECT o.value, n.value, t.count FROM transitions t
+                        JOIN strings o ON o.id = t.old JOIN strings n ON n.id = t.new
+                        WHERE t.field = ? ORDER BY t.count DESC
+                    ''', (field_id,)).fetchall()
+            finally:
+                conn.close()
+
+        by_stage = {value: {'reached': reached, 'exits': exits, 'seconds': seconds}
+                    for value, reached, exits, seconds in stats}
+        in_stage = {value: (count, age) for value, count, age in current}
+        order = [s for s in stages if s in by_stage or s in in_stage]
+        order += sorted(v for v in set(by_stage) | set(in_stage) if v not in order)
+
+        funnel = []
+        previous = None
+        for stage in order:
+            stat = by_stage.get(stage, {'reached': 0, 'exits': 0, 'seconds': 0})
+            count, age = in_stage.get(stage, (0, 0))
+            funnel.append({
+                'stage': stage,
+                'reached': stat['reached'],
+                'conversion_from_previous': (
+                    round(stat['reached'] / previous, 4) if previous else None
+                ),
+                'in_stage': count,
+                'completed_stays': stat['exits'],
+                'avg_days_in_stage': (
+                    round(stat['seconds'] / stat['exits'] / 86400, 2) if stat['exits'] else None
+                ),
+                'avg_days_current': round(age / count / 86400, 2) if count else None,
+            })
+            previous = stat['reached'] or previous
+        return {
+            'funnel': funnel,
+            'transitions': [{'from': old, 'to': new, 'count': count} for old, new, count in transitions],
+        }
@@ -0,0 +1,186 @@
+"""
+Fail-fast guards for Guhatek API calls.
+
+When Guhatek is down or hanging, every call used to wait out its full
+`requests` timeout (10-30 s) before the caller fell back to Excel or
+reported an error. Two guards bound that cost:
+
+- CircuitBreaker, one per upstream operation (token, list, patch, create).
+  After `failure_threshold` consecutive failures (timeouts, connection
+  errors, 5xx answers) the circuit opens and calls raise CircuitOpenError
+  at once, so callers take their fallback in microseconds. After
+  `reset_timeout` seconds the circuit is half-open: one call is let through
+  as a probe. If it succeeds the circuit closes; otherwise it opens again
+  for another `reset_timeout`. Any answer from the server, even a 4xx,
+  counts as success. Each worker process keeps its own breakers.
+
+- A per-request deadline. init_app() gives every Flask request a budget of
+  UPSTREAM_REQUEST_BUDGET seconds for all of its upstream calls together,
+  and timeout() cuts each call's timeout to what is left of it. When the
+  budget is spent, timeout() raises DeadlineExceeded instead of starting
+  another call. Creates keep their full timeout (see timeout()). Calls made outside a request (bulk import workers, scripts)
+  keep their own timeouts.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# A call with less than this left of the request budget is not started
+MIN_CALL_SECONDS = 0.05
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class UpstreamUnavailable(Exception):
+    """The upstream call was not made"""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    def __init__(self, operation, retry_after):
+        super().__init__(f"Guhatek API '{operation}' calls are suspended after repeated failures; "
+                         f"retrying in {retry_after:.0f} s")
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(UpstreamUnavailable):
+    def __init__(self, operation):
+        super().__init__(f"No time left in the request budget for the Guhatek API '{operation}' call")
+        self.operation = operation
+
+
+class Attempt:
+    """Handle yielded by CircuitBreaker.guard(); fail() marks a call that returned an error response"""
+
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream operation.
+
+    Args:
+        operation: name used in errors, logs and metrics
+        failure_threshold: consecutive failures that open the circuit
+        reset_timeout: seconds an open circuit waits before a probe
+        is_failure: exception -> bool, whether it counts as an upstream failure
+            (default: every exception)
+    """
+
+    def __init__(self, operation, failure_threshold=5, reset_timeout=30.0, is_failure=None):
+        self.operation = operation
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        metrics.UPSTREAM_CIRCUIT_STATE.set(0, operation=operation)
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return self._state
+
+    def _set_state(self, state):
+        if state != self._state:
+            log = logger.info if state == "closed" else logger.warning
+            log(f"Guhatek '{self.operation}' circuit {self._state} -> {state}")
+            self._state = state
+            metrics.UPSTREAM_CIRCUIT_STATE.set(_STATE_VALUES[state], operation=self.operation)
+
+    def _admit(self):
+        """True for a probe, False for a normal call; raises CircuitOpenError if the call may not start"""
+        with self._lock:
+            if self._state == "closed":
+                return False
+            if self._state == "open":
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_timeout:
+                    metrics.UPSTREAM_REJECTED.inc(operation=self.operation, reason="open")
+                    raise CircuitOpenError(self.operation, self.reset_timeout - waited)
+                self._set_state("half_open")
+            if self._probing:
+                # One probe at a time; everyone else keeps failing fast until it reports back
+                metrics.UPSTREAM_REJECTED.inc(operation=self.operation, reason="open")
+                raise CircuitOpenError(self.operation, 0)
+            self._probing = True
+            return True
+
+    def _record(self, probe, failed):
+        with self._lock:
+            if probe:
+                self._probing = False
+            if failed:
+                self._failures += 1
+                if probe or (self._state == "closed" and self._failures >= self.failure_threshold):
+                    self._opened_at = time.monotonic()
+                    self._set_state("open")
+            elif probe or self._state == "closed":
+                # A late success from a call started before the circuit opened does not close it
+                self._failures = 0
+                self._set_state("closed")
+
+    @contextmanager
+    def guard(self):
+        """Run one upstream call: raises CircuitOpenError up front, records the outcome afterwards"""
+        probe = self._admit()
+        attempt = Attempt()
+        try:
+            yield attempt
+        except Exception as e:
+            self._record(probe, self.is_failure(e))
+            raise
+        self._record(probe, attempt.failed)
+
+
+def timeout(operation, read, connect=None, shorten=True):
+    """
+    `requests` timeout for one call: (connect, read) seconds, each cut to what
+    is left of the current request's budget. Raises DeadlineExceeded when
+    the budget is spent. (The read timeout applies per socket read, so a
+    slowly trickling response can still run somewhat past the budget.)
+
+    With shorten=False the call keeps its full timeout even if that runs past
+    the budget; it is only refused when the budget is already spent. Use it
+    for calls that are not safe to retry (creates): giving up on one that the
+    server is still processing would make the user's retry a duplicate.
+    """
+    connect = read if connect is None else min(connect, read)
+    deadline = g.get("_upstream_deadline") if has_request_context() else None
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_CALL_SECONDS:
+            metrics.UPSTREAM_REJECTED.inc(operation=operation, reason="deadline")
+            raise DeadlineExceeded(operation)
+        if shorten:
+            read, connect = min(read, remaining), min(connect, remaining)
+    return (connect, read)
+
+
+def init_app(app):
+    """Start each request's upstream budget (UPSTREAM_REQUEST_BUDGET seconds; 0 disables it)"""
+    budget = app.config.get("UPSTREAM_REQUEST_BUDGET", 0)
+
+    @app.before_request
+    def _start_upstream_budget():
+        if budget > 0:
+            g._upstream_deadline = time.monotonic() + budget